@@ -0,0 +1,25 @@
+"""Module used to load the config file of the application once, shared by every module"""
+import functools
+import json
+
+CONFIG_FILE = 'config.json'
+
+
+@functools.lru_cache(maxsize=None)
+def load_config(filename:str=CONFIG_FILE) -> dict:
+    """
+    Description:
+
+        Function which reads and parses the config file the first time it is called, every later call returns
+        the same dictionary, so the modules share one config
+
+    Arguments:
+
+        filename {str} : the name of the config file
+
+    Returns:
+
+        config {dict} : dictionary containing the keys of the config file
+    """
+    with open(filename, encoding='utf8') as json_data_file:
+        return json.load(json_data_file)
@@ -0,0 +1,290 @@
+"""Module containing the store used for the global news articles"""
+import hashlib
+from shared_map import SharedMap, SharedOrderedMap
+
+# rough number of bytes used by an article dictionary on top of the length of its strings
+ENTRY_OVERHEAD = 200
+
+
+class ArticleStore:
+    """
+    A list of article dictionaries (each with the 'seen' and 'articles' keys) which keeps an index of the articles
+    by url and by title, so checking if an article is already held or marking it as seen doesn't scan the whole list.
+
+    The store can be bounded by a maximum number of articles and a byte budget. When it is over either of them the
+    oldest seen articles are evicted first, then the oldest unseen articles. Seen (dismissed) articles only keep their
+    title and url, and the urls of dismissed and evicted articles are kept as 8 byte hashes after the article is evicted,
+    so an article which has been dismissed or evicted is never added again.
+
+    Articles are keyed by their url, or by their title if they have no url (see article_key).
+
+    A copy shares everything which hasn't changed with the store it was copied from (see shared_map), so copying the
+    store and adding or dismissing a few articles doesn't take longer as more articles are held.
+
+    It can be iterated, indexed and compared with a list like the list it replaces.
+    """
+    def __init__(self, entries:list=None, max_count:int=None, max_bytes:int=None):
+        self.max_count = max_count
+        self.max_bytes = max_bytes
+        self.byte_size = 0
+        self.evicted = 0
+        # article dictionaries keyed by article_key, oldest first
+        self._entries = SharedOrderedMap()
+        # keys of the seen articles, oldest first
+        self._seen = SharedOrderedMap()
+        self._sizes = SharedMap()
+        # tuples of the keys of the articles with each title
+        self._titles = SharedMap()
+        # hashes of the keys of dismissed and evicted articles
+        self._dismissed = SharedMap()
+        if entries is not None:
+            for entry in entries:
+                self.append(entry)
+
+    def append(self, entry:dict) -> None:
+        """
+        Description:
+
+            Function which adds an article dictionary to the end of the store and to the url and title indexes,
+            then evicts articles if the store is over its maximum number of articles or byte budget
+
+        Arguments:
+
+            entry {dict} : dictionary with the 'seen' and 'articles' keys
+
+        Returns:
+
+            None
+        """
+        article = article_of(entry)
+        # entries which aren't articles can't be found by url, so they are given a key of their own
+        key = object() if article is None else article_key(article)
+        if key in self._entries:
+            self._remove(key)
+
+        self._entries[key] = entry
+        self._sizes[key] = entry_size(entry)
+        self.byte_size = self.byte_size + self._sizes[key]
+        if article is not None:
+            self._titles[article.get('title')] = self._titles.get(article.get('title'), ()) + (key,)
+            if entry.get('seen'):
+                self._dismiss(key)
+        self._evict()
+
+    def find_url(self, url:str) -> bool:
+        """
+        Description:
+
+            Function to see if an article with the url is in the store, or has been dismissed or evicted
+
+        Arguments:
+
+            url {str} : string containing the url of an article, or the key from article_key for an article without a url
+
+        Returns:
+
+            {bool} : True if the article is in the store or has been dismissed or evicted
+        """
+        return url in self._entries or url_hash(url) in self._dismissed
+
+    def mark_seen(self, title:str) -> int:
+        """
+        Description:
+
+            Function which sets the 'seen' key to 1 for every article with the title, dropping everything but
+            their title and url as they aren't shown again. The article dictionaries are replaced, not changed
+
+        Arguments:
+
+            title {str} : string containing the title of the article
+
+        Returns:
+
+            {int} : the number of articles marked as seen
+        """
+        keys = self._titles.get(title, ())
+        for key in keys:
+            self._dismiss(key)
+        return len(keys)
+
+    def stats(self) -> dict:
+        """
+        Description:
+
+            Function which gets the size of the store
+
+        Arguments:
+
+            None
+
+        Returns:
+
+            {dict} : dictionary containing the number of articles, seen articles, dismissed and evicted urls, evicted articles and the byte size
+        """
+        return {
+                'articles' : len(self._entries),
+                'seen' : len(self._seen),
+                'dismissed' : len(self._dismissed),
+                'evicted' : self.evicted,
+                'bytes' : self.byte_size
+                }
+
+    def copy(self) -> 'ArticleStore':
+        """
+        Description:
+
+            Function which makes a copy of the store which can be changed without changing this store.
+            The copy shares the articles and indexes with this store, and only copies the parts it changes.
+            The article dictionaries are never copied, as the store replaces an article dictionary instead of changing it
+
+        Arguments:
+
+            None
+
+        Returns:
+
+            {ArticleStore} : the copy
+        """
+        store = ArticleStore(max_count=self.max_count, max_bytes=self.max_bytes)
+        store.byte_size = self.byte_size
+        store.evicted = self.evicted
+        store._entries = self._entries.copy()
+        store._seen = self._seen.copy()
+        store._sizes = self._sizes.copy()
+        store._titles = self._titles.copy()
+        store._dismissed = self._dismissed.copy()
+        return store
+
+    def _dismiss(self, key:str) -> None:
+        """Remembers the url of a seen article and replaces it with a seen article holding just its title and url."""
+        article = self._entries[key]['articles']
+        self._dismissed[url_hash(key)] = None
+        entry = {'seen' : 1, 'articles' : {'title' : article.get('title'), 'url' : article.get('url')}}
+        self._entries[key] = entry
+        self.byte_size = self.byte_size - self._sizes[key]
+        self._sizes[key] = entry_size(entry)
+        self.byte_size = self.byte_size + self._sizes[key]
+        self._seen[key] = None
+
+    def _evict(self) -> None:
+        """Evicts the oldest seen articles, then the oldest articles, until the store is within its limits, remembering their urls."""
+        while len(self._entries) > 0 and (
+                (self.max_count is not None and len(self._entries) > self.max_count)
+                or (self.max_bytes is not None and self.byte_size > self.max_bytes)):
+            if len(self._seen) > 0:
+                key = self._seen.first()
+            else:
+                key = self._entries.first()
+            # an evicted article is still in the news api response, so its url is remembered to stop it being added back
+            if article_of(self._entries[key]) is not None:
+                self._dismissed[url_hash(key)] = None
+            self._remove(key)
+            self.evicted = self.evicted + 1
+
+    def _remove(self, key:any) -> None:
+        """Removes an article from the store and its indexes."""
+        entry = self._entries.pop(key)
+        self.byte_size = self.byte_size - self._sizes.pop(key)
+        self._seen.pop(key, None)
+        article = article_of(entry)
+        if article is not None:
+            # the tuple of keys may be shared with a copy, so a new tuple without the key replaces it
+            title_keys = list(self._titles[article.get('title')])
+            title_keys.remove(key)
+            if len(title_keys) == 0:
+                self._titles.pop(article.get('title'))
+            else:
+                self._titles[article.get('title')] = tuple(title_keys)
+
+    def __iter__(self):
+        return iter(self._entries.values())
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __getitem__(self, index):
+        return list(self._entries.values())[index]
+
+    def __eq__(self, other):
+        if isinstance(other, ArticleStore):
+            return list(self._entries.values()) == list(other._entries.values())
+        return list(self._entries.values()) == other
+
+    def __repr__(self):
+        return 'ArticleStore('+repr(list(self._entries.values()))+')'
+
+
+def article_of(entry:any) -> dict:
+    """
+    Description:
+
+        Function which gets the news api article from an article dictionary
+
+    Arguments:
+
+        entry {any} : dictionary with the 'seen' and 'articles' keys
+
+    Returns:
+
+        {dict} : the 'articles' dictionary, None if the entry isn't an article dictionary
+    """
+    if isinstance(entry, dict) and isinstance(entry.get('articles'), dict):
+        return entry['articles']
+    return None
+
+
+def article_key(article:dict) -> any:
+    """
+    Description:
+
+        Function which gets the key an article is held by in the store: its url, or its title if it has no url,
+        so articles without a url don't replace each other
+
+    Arguments:
+
+        article {dict} : dictionary of a news api article
+
+    Returns:
+
+        {any} : the url of the article, or a ('title', title) tuple if the url is None
+    """
+    if article.get('url') is None:
+        return ('title', article.get('title'))
+    return article['url']
+
+
+def entry_size(entry:any) -> int:
+    """
+    Description:
+
+        Function which estimates the number of bytes an article dictionary uses from the length of its strings
+
+    Arguments:
+
+        entry {any} : dictionary with the 'seen' and 'articles' keys
+
+    Returns:
+
+        {int} : the estimated size in bytes
+    """
+    article = article_of(entry)
+    if article is None:
+        return ENTRY_OVERHEAD
+    return ENTRY_OVERHEAD + sum(len(value) for value in article.values() if isinstance(value, str))
+
+
+def url_hash(url:str) -> int:
+    """
+    Description:
+
+        Function which hashes a url into an 8 byte integer, used to remember dismissed urls without keeping the url
+
+    Arguments:
+
+        url {str} : string containing the url of an article
+
+    Returns:
+
+        {int} : the hash of the url
+    """
+    return int.from_bytes(hashlib.blake2b(str(url).encode('utf8'), digest_size=8).digest(), 'little')
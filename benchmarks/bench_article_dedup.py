@@ -0,0 +1,70 @@
+"""
+Benchmark of merging a news refresh into the held articles, comparing the url indexed ArticleStore
+with the linear scan of the articles list it replaced.
+
+Run from the root folder of the project:
+    python3 benchmarks/bench_article_dedup.py
+"""
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import global_vars
+from article_store import ArticleStore
+from covid_news_handling import merge_news_articles
+
+HELD_SIZES = (1_000, 10_000, 100_000)
+REFRESH_SIZE = 100
+REPEATS = 5
+
+
+def make_entry(number:int) -> dict:
+    """Makes an article dictionary like the ones held in the global articles."""
+    return {'seen' : 0, 'articles' : {'title' : 'title '+str(number), 'url' : 'https://example.com/'+str(number)}}
+
+
+def linear_merge(articles:list, news_list:list) -> list:
+    """The merge before the url index: every incoming article scans all held articles."""
+    for article_dict in news_list:
+        found = False
+        for held in articles:
+            if held['articles']['url'] == article_dict['url']:
+                found = True
+                break
+        if not found:
+            articles.append({'seen' : 0, 'articles' : article_dict})
+    return articles
+
+
+def median_ms(function, make_arguments) -> float:
+    """Returns the median time taken by the function in milliseconds."""
+    timings = []
+    for i in range(REPEATS):
+        arguments = make_arguments()
+        start = time.perf_counter()
+        function(*arguments)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+if __name__ == '__main__':
+    print(f'merging {REFRESH_SIZE} articles (half already held) into the held articles')
+    for held_size in HELD_SIZES:
+        held_entries = [make_entry(number) for number in range(held_size)]
+        # half of the refresh is already held, half is new
+        news_list = [make_entry(number)['articles'] for number in range(held_size - REFRESH_SIZE // 2, held_size + REFRESH_SIZE // 2)]
+
+        def indexed_arguments():
+            store = ArticleStore([dict(entry) for entry in held_entries])
+            global_vars.update_articles(store)
+            return store, news_list
+
+        def linear_arguments():
+            return [dict(entry) for entry in held_entries], news_list
+
+        indexed = median_ms(merge_news_articles, indexed_arguments)
+        linear = median_ms(linear_merge, linear_arguments)
+        print(f'{held_size:>8,} held: indexed {indexed:8.3f} ms, linear scan {linear:9.3f} ms')
@@ -0,0 +1,38 @@
+"""
+Benchmark comparing the full history covid api request with the recent window request, run against the local
+stand-in for the covid api in stub_apis.py. Like the live api, the stand-in serves the whole history of the area
+on the first page, so both requests download the same bytes.
+
+Run from the root folder of the project:
+    python3 benchmarks/bench_covid_fetch.py
+"""
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from covid_data_handler import config
+from covid_data_handler import covid_API_request
+from stub_apis import StubAPIs
+
+REPEATS = 5
+
+
+def bench(recent_days:int) -> tuple[float, int, int]:
+    """Returns the median latency, payload bytes and number of rows of a request for England."""
+    latencies = []
+    for i in range(REPEATS):
+        start = time.perf_counter()
+        data = covid_API_request('England', 'nation', recent_days)
+        latencies.append(time.perf_counter() - start)
+    return statistics.median(latencies), data['payloadBytes'], data['length']
+
+
+if __name__ == '__main__':
+    stubs = StubAPIs().start()
+    for name, recent_days in (('full history', None), ('recent window', config['covid_recent_days'])):
+        latency, payload_bytes, rows = bench(recent_days)
+        print(f'{name:>14}: {latency * 1000:9.1f} ms median, {payload_bytes:>10,} bytes, {rows:>6,} rows')
+    stubs.stop()
@@ -0,0 +1,57 @@
+"""
+Benchmark of the time taken to import the modules of the application in a new python process, measured with
+python -X importtime, along with the heaviest imports and whether the api client libraries were imported.
+
+Run from the root folder of the project:
+    python3 benchmarks/bench_import_time.py
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = ('scheduler', 'covid_news_handling', 'covid_data_handler', 'flask_application')
+# libraries which are only needed once data is requested
+HEAVY = ('requests', 'uk_covid19', 'numpy', 'flask')
+REPEATS = 7
+HEAVIEST = 8
+
+
+def import_times(module:str) -> tuple[int, dict, set]:
+    """
+    Imports the module in a new process and returns the cumulative microseconds of the import, those of each
+    module it imports directly, and the names of every module imported along the way.
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import '+module],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    children = {}
+    imported = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        # each level of nesting is indented by two more spaces, children are listed before their parent
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        name = name.strip()
+        if depth == 0:
+            if name == module:
+                return int(cumulative), children, imported
+            children = {}
+        else:
+            imported.add(name.split('.')[0])
+            if depth == 1:
+                children[name] = int(cumulative)
+    raise ValueError(module+' was not imported')
+
+
+if __name__ == '__main__':
+    for module in MODULES:
+        runs = [import_times(module) for i in range(REPEATS)]
+        total = statistics.median(run[0] for run in runs) / 1000
+        loaded = [name for name in HEAVY if name in runs[0][2]]
+        print(f'{module:>20}: {total:7.1f} ms median, imports {", ".join(loaded) if loaded else "none of "+", ".join(HEAVY)}')
+        heaviest = sorted(((statistics.median(run[1].get(name, 0) for run in runs), name) for name in runs[0][1]), reverse=True)
+        for microseconds, name in heaviest[:HEAVIEST]:
+            print(f'{"":>22}{microseconds / 1000:7.1f} ms  {name}')
@@ -0,0 +1,92 @@
+"""
+Benchmark of the page's request latency while scheduler threads log heavily, comparing records written to the log
+file by the thread logging them (logging.basicConfig, as every module did before) with records put on a queue and
+written by the logging thread (log_handling.setup_logging).
+
+The log file is written through a handler which stalls for STALL seconds every STALL_EVERY records, standing in for
+a busy disk. Requests are made through the flask test client, so no server is needed.
+
+Run from the root folder of the project:
+    python3 benchmarks/bench_logging.py
+"""
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import global_vars
+import log_handling
+from flask_application import app
+
+REQUESTS = 500
+LOGGING_THREADS = 4
+STALL = 0.02
+STALL_EVERY = 200
+
+
+class StallingFileHandler(logging.FileHandler):
+    """A file handler which stalls like a busy disk every STALL_EVERY records."""
+    def __init__(self, filename:str):
+        super().__init__(filename, encoding='utf8')
+        self.records = 0
+
+    def emit(self, record):
+        self.records = self.records + 1
+        if self.records % STALL_EVERY == 0:
+            time.sleep(STALL)
+        super().emit(record)
+
+
+def scheduler_logging(stop:threading.Event) -> None:
+    """Logs like a busy scheduled update until stop is set."""
+    number = 0
+    while not stop.is_set():
+        number = number + 1
+        logging.info('NEWS UPDATE SCHED INSTANCE, %s, RUNNING FOR %s SECONDS UNTIL %s', 'update '+str(number), 60, '10:00')
+
+
+def request_latency() -> tuple[float, float]:
+    """Makes REQUESTS page requests while LOGGING_THREADS threads log, and returns the median and p99 latency in ms."""
+    client = app.test_client()
+    client.get('/index')
+    stop = threading.Event()
+    threads = [threading.Thread(target=scheduler_logging, args=(stop,)) for i in range(LOGGING_THREADS)]
+    for thread in threads:
+        thread.start()
+
+    latencies = []
+    for i in range(REQUESTS):
+        start = time.perf_counter()
+        client.get('/index')
+        latencies.append(time.perf_counter() - start)
+
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return statistics.median(latencies) * 1000, statistics.quantiles(latencies, n=100)[98] * 1000
+
+
+if __name__ == '__main__':
+    global_vars.update_covid_data_list(['Exeter', 'England', 650, 40412, 'Hospital Cases: 7019', 'Total Deaths: 141544'])
+    root = logging.getLogger()
+    with tempfile.TemporaryDirectory() as folder:
+        log_handling.stop_logging()
+        direct_handler = StallingFileHandler(os.path.join(folder, 'direct.log'))
+        direct_handler.setFormatter(logging.Formatter(log_handling.FORMAT))
+        root.addHandler(direct_handler)
+        direct = request_latency()
+        root.removeHandler(direct_handler)
+        direct_handler.close()
+
+        log_handling.setup_logging(StallingFileHandler(os.path.join(folder, 'queued.log')))
+        queued = request_latency()
+        log_handling.stop_logging()
+
+    print(f'{REQUESTS} requests, {LOGGING_THREADS} threads logging, {STALL * 1000:.0f} ms disk stall every {STALL_EVERY} records')
+    print(f'written by the logging thread: {direct[0]:7.2f} ms median, {direct[1]:7.2f} ms p99')
+    print(f'queued, one writer thread:     {queued[0]:7.2f} ms median, {queued[1]:7.2f} ms p99')
@@ -0,0 +1,83 @@
+"""
+Benchmark comparing news api requests which set up a new connection each time (requests.get, as news_API_request
+did before) with requests made through the pooled keep-alive session (NEWS_SESSION).
+
+Requests are made to a local stub server returning a news api sized response, for several sets of search terms
+from several threads at once, like a scheduled news update. The stub server serves plain HTTP, so the saving
+measured here doesn't include the TLS handshake, which is saved as well against newsapi.org.
+
+Run from the root folder of the project:
+    python3 benchmarks/bench_news_session.py
+"""
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+from http_session import make_session
+
+REQUESTS = 400
+THREADS = 4
+SEARCH_TERMS = ('Covid', 'COVID-19', 'coronavirus', 'vaccine')
+
+# a response the size of a page of news api articles
+BODY = json.dumps({'status' : 'ok', 'articles' : [{
+                    'title' : 'title '+str(number),
+                    'url' : 'https://example.com/'+str(number),
+                    'content' : 'content '*25
+                    } for number in range(100)]}).encode()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers every request with BODY, keeping the connection open."""
+    protocol_version = 'HTTP/1.1'
+    # headers and body are written separately, which Nagle's algorithm would delay on a kept-alive connection
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+def latency_ms(get) -> tuple[float, float]:
+    """Makes REQUESTS requests from THREADS threads and returns the median and 99th percentile latency in ms."""
+    def make_requests(count:int) -> list:
+        latencies = []
+        for i in range(count):
+            start = time.perf_counter()
+            response = get(SEARCH_TERMS[i % len(SEARCH_TERMS)])
+            response.json()
+            latencies.append(time.perf_counter() - start)
+        return latencies
+
+    make_requests(10)
+    with ThreadPoolExecutor(THREADS) as executor:
+        latencies = sum(executor.map(make_requests, [REQUESTS // THREADS] * THREADS), [])
+    return statistics.median(latencies) * 1000, statistics.quantiles(latencies, n=100)[98] * 1000
+
+
+if __name__ == '__main__':
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = 'http://127.0.0.1:'+str(server.server_address[1])+'/v2/everything'
+    session = make_session(pool_size=THREADS, timeout=10)
+
+    print(f'{REQUESTS} requests from {THREADS} threads, {len(BODY):,} byte responses')
+    for name, get in (('new connection', lambda terms: requests.get(url, params={'q' : terms}, timeout=10)),
+                      ('pooled session', lambda terms: session.get(url, params={'q' : terms}))):
+        p50, p99 = latency_ms(get)
+        print(f'{name:>15}: {p50:7.2f} ms median, {p99:7.2f} ms p99')
+    server.shutdown()
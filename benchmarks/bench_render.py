@@ -0,0 +1,84 @@
+"""
+Load test of the HTML page, comparing the page assembled from the fragment cache (/index) with rendering the
+whole page from the templates for every request, as the page was before the fragment cache.
+
+Requests are made through the flask test client from several threads at once, so no server is needed.
+
+Run from the root folder of the project:
+    python3 benchmarks/bench_render.py
+"""
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from markupsafe import Markup
+
+import global_vars
+import flask_application
+from flask_application import app
+
+ARTICLES = 100
+UPDATES = 20
+REQUESTS = 2000
+THREADS = 8
+
+
+def uncached_index() -> str:
+    """The page rendered from the templates for every request."""
+    flask_application.news_delete_request()
+    flask_application.update_delete_request()
+    return flask_application.render_template('index.html',
+                            title='COVID-19 Tracker',
+                            covid_stats=Markup(flask_application.render_covid_stats()),
+                            news=Markup(flask_application.render_news()),
+                            updates=Markup(flask_application.render_updates()),
+                            favicon='/static/images/shark.gif',
+                            image='shark.gif'
+                        )
+
+
+def fill_global_vars() -> None:
+    """Fills the global variables with the data of a busy dashboard."""
+    global_vars.init()
+    global_vars.update_covid_data_list(['Exeter', 'England', 650, 40412, 'Hospital Cases: 7019', 'Total Deaths: 141544'])
+    global_vars.update_articles([{'seen' : 0, 'articles' : {
+                                    'title' : 'title '+str(number),
+                                    'url' : 'https://example.com/'+str(number),
+                                    'content' : 'content '*30+Markup("<a href='https://example.com/'>Read More</a>")
+                                    }} for number in range(ARTICLES)])
+    global_vars.update_updates([{
+                                'title' : 'update '+str(number),
+                                'content' : 'Updates covid stats and news articles at 10:00.',
+                                'update_time' : '10:00',
+                                'update_type' : 'cn',
+                                'repeat' : True
+                                } for number in range(UPDATES)])
+
+
+def requests_per_second(path:str, headers:dict=None) -> float:
+    """Makes REQUESTS requests to the path from THREADS threads and returns the number of requests per second."""
+    def make_requests(count:int) -> None:
+        client = app.test_client()
+        for i in range(count):
+            response = client.get(path, headers=headers)
+            assert response.status_code == 200
+
+    make_requests(10)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(THREADS) as executor:
+        list(executor.map(make_requests, [REQUESTS // THREADS] * THREADS))
+    return REQUESTS / (time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    app.add_url_rule('/uncached', 'uncached', uncached_index)
+    fill_global_vars()
+    print(f'{REQUESTS} requests from {THREADS} threads, {ARTICLES} articles and {UPDATES} updates held')
+    print(f'rendered every request:  {requests_per_second("/uncached"):8.0f} requests/s')
+    print(f'fragment cache:          {requests_per_second("/index"):8.0f} requests/s')
+    print(f'fragment cache, gzip:    {requests_per_second("/index", {"Accept-Encoding" : "gzip"}):8.0f} requests/s')
+    if 'br' in flask_application.ENCODINGS:
+        print(f'fragment cache, brotli:  {requests_per_second("/index", {"Accept-Encoding" : "br"}):8.0f} requests/s')
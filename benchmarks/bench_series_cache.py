@@ -0,0 +1,74 @@
+"""
+Benchmark comparing a cold start from api json or csv text with a warm start from the binary series cache,
+for a full England history.
+
+Run from the root folder of the project:
+    python3 benchmarks/bench_series_cache.py
+"""
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from covid_data_handler import parse_csv_data
+from covid_data_handler import process_covid_csv_data
+from covid_series_cache import series_from_dictionary
+from covid_series_cache import save_series
+from covid_series_cache import load_series
+from covid_series_cache import dictionary_from_series
+
+REPEATS = 50
+HISTORY_DAYS = 1000
+
+
+def england_history_json() -> str:
+    """Makes a json response in the form returned by the covid api for every day since the start of the pandemic."""
+    data = []
+    for day in range(HISTORY_DAYS):
+        data.append({
+            'areaCode' : 'E92000001',
+            'areaName' : 'England',
+            'areaType' : 'nation',
+            'date' : str(date(2022, 10, 28) - timedelta(days=day)),
+            'cumDeaths28DaysByDeathDate' : 150_000 - day * 100,
+            'hospitalCases' : 7000 - day,
+            'newCasesByPublishDate' : 30_000 + day
+        })
+    return json.dumps({'data' : data, 'lastUpdate' : None, 'length' : len(data), 'totalPages' : 1})
+
+
+def median_ms(function) -> float:
+    """Returns the median time taken by the function in milliseconds."""
+    timings = []
+    for i in range(REPEATS):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+if __name__ == '__main__':
+    history_json = england_history_json()
+    with tempfile.TemporaryDirectory() as cache_dir:
+        filename = os.path.join(cache_dir, 'nation_England.cvds')
+        save_series(filename, series_from_dictionary(json.loads(history_json)), {'areaName' : 'England'})
+
+        def warm_start():
+            series, meta = load_series(filename)
+            return dictionary_from_series(series, meta, 28)
+
+        results = {
+            f'cold json parse ({HISTORY_DAYS} days)' : median_ms(lambda: json.loads(history_json)),
+            'cold csv parse (nation_2021-10-28.csv)' : median_ms(lambda: process_covid_csv_data(parse_csv_data('nation_2021-10-28.csv'))),
+            f'binary series load ({HISTORY_DAYS} days)' : median_ms(lambda: load_series(filename)),
+            'binary series load + newest 28 rows' : median_ms(warm_start)
+        }
+        print(f'binary series file: {os.path.getsize(filename):,} bytes, json: {len(history_json):,} bytes')
+
+    for name, milliseconds in results.items():
+        print(f'{name:>42}: {milliseconds:8.3f} ms median')
@@ -0,0 +1,73 @@
+"""
+Benchmark of publishing changes to the global articles and updates, which changes a copy of the published store or
+registry. The copies share everything which hasn't changed (see shared_map), so the time taken shouldn't grow with
+the number of articles or updates held.
+
+Run from the root folder of the project:
+    python3 benchmarks/bench_shared_map.py
+"""
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import global_vars
+from article_store import ArticleStore
+from covid_news_handling import article_seen, merge_news_articles
+from update_registry import UpdateRegistry
+
+HELD_SIZES = (1_000, 10_000, 100_000)
+REFRESH_SIZE = 100
+REPEATS = 50
+
+
+def make_entry(number:int) -> dict:
+    """Makes an article dictionary like the ones held in the global articles."""
+    return {'seen' : 0, 'articles' : {'title' : 'title '+str(number), 'url' : 'https://example.com/'+str(number)}}
+
+
+def make_update(name:str) -> dict:
+    """Makes an update dictionary like the ones held in the global updates."""
+    return {'title' : name, 'content' : '', 'update_time' : '00:00', 'update_type' : 'c', 'repeat' : False}
+
+
+def median_ms(function) -> float:
+    """Returns the median time taken by the function in milliseconds."""
+    timings = []
+    for i in range(REPEATS):
+        start = time.perf_counter()
+        function(i)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def refresh(held_size:int):
+    """Merges REFRESH_SIZE new articles into the published articles and publishes them."""
+    news_lists = [[make_entry(number)['articles'] for number in range(first, first + REFRESH_SIZE)]
+                  for first in range(held_size, held_size + REPEATS * REFRESH_SIZE, REFRESH_SIZE)]
+
+    def run(i:int):
+        global_vars.change_articles(lambda articles: merge_news_articles(articles, news_lists[i]))
+    return run
+
+
+def add_and_remove_update(i:int) -> None:
+    """Adds an update with a sched to the published updates and removes it again, publishing each change."""
+    global_vars.change_updates(lambda updates: updates.append(make_update('bench')))
+    global_vars.change_updates(lambda updates: updates.add_sched('bench', {'sched_type' : 'covid'}))
+    global_vars.change_updates(lambda updates: updates.remove('bench'))
+
+
+if __name__ == '__main__':
+    print(f'publishing changes to the global articles and updates ({REFRESH_SIZE} articles in each refresh)')
+    for held_size in HELD_SIZES:
+        global_vars.update_articles(ArticleStore([make_entry(number) for number in range(held_size)]))
+        global_vars.update_updates(UpdateRegistry([make_update(str(number)) for number in range(held_size)]))
+
+        refreshed = median_ms(refresh(held_size))
+        dismissed = median_ms(lambda i: article_seen('title '+str(i)))
+        updated = median_ms(add_and_remove_update) / 3
+        print(f'{held_size:>8,} held: news refresh {refreshed:7.3f} ms, dismiss an article {dismissed:7.3f} ms, '
+              f'add or remove an update {updated:7.3f} ms')
@@ -0,0 +1,114 @@
+"""
+Benchmark of an update job run in a thread with and without the trace hook the old KThread class installed
+(sys.settrace with a local trace function called on every line) so the thread could be killed.
+
+The job parses covid api and news api responses from json and turns them into the data shown on the page,
+the same work update_covid and update_news_articles do once the responses have arrived.
+
+Run from the root folder of the project:
+    python3 benchmarks/bench_trace_hook.py
+"""
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import global_vars
+from covid_data_handler import covid_data_from_dictionaries
+from covid_news_handling import add_link, merge_news_articles, news_dictionary_maker
+
+COVID_ROWS = 700
+NEWS_ARTICLES = 100
+REPEATS = 7
+
+
+def covid_response(area_name:str, area_type:str) -> str:
+    """Makes a covid api json response with a row for each day, newest first."""
+    today = date(2021, 12, 1)
+    data = []
+    for day in range(COVID_ROWS):
+        data.append({
+                    'areaCode' : 'E0000000'+str(day % 10),
+                    'areaName' : area_name,
+                    'areaType' : area_type,
+                    'date' : (today - timedelta(days=day)).isoformat(),
+                    'hospitalCases' : None if day < 3 else 7000 + day,
+                    'newCasesByPublishDate' : 40000 + day,
+                    'cumDeaths28DaysByDeathDate' : None if day < 2 else 140000 - day
+                    })
+    return json.dumps({'data' : data, 'lastUpdate' : today.isoformat(), 'length' : len(data), 'totalPages' : 1})
+
+
+def news_response() -> str:
+    """Makes a news api json response."""
+    articles = [{
+                'title' : 'title '+str(number),
+                'url' : 'https://example.com/'+str(number),
+                'description' : 'description '*20,
+                'content' : 'content '*40
+                } for number in range(NEWS_ARTICLES)]
+    return json.dumps({'status' : 'ok', 'totalResults' : len(articles), 'articles' : articles})
+
+
+LOCAL_RESPONSE = covid_response('Exeter', 'ltla')
+NATIONAL_RESPONSE = covid_response('England', 'nation')
+NEWS_RESPONSE = news_response()
+
+
+def update_job() -> None:
+    """Handles the responses of a covid and news update."""
+    covid_data_from_dictionaries(json.loads(LOCAL_RESPONSE), json.loads(NATIONAL_RESPONSE))
+    global_vars.update_articles(global_vars.new_article_store())
+    articles = merge_news_articles(global_vars.retrieve_articles(), add_link(json.loads(NEWS_RESPONSE)['articles']))
+    news_dictionary_maker(articles)
+
+
+class TracedThread(threading.Thread):
+    """A thread which installs the same trace functions as the old KThread class before running."""
+    killed = False
+
+    def run(self):
+        sys.settrace(self.globaltrace)
+        threading.Thread.run(self)
+
+    def globaltrace(self, frame, why, arg):
+        if why == 'call':
+            return self.localtrace
+        return None
+
+    def localtrace(self, frame, why, arg):
+        if self.killed:
+            if why == 'line':
+                raise SystemExit()
+        return self.localtrace
+
+
+def median_ms(thread_class) -> float:
+    """Returns the median time taken by the update job in a thread of the class in milliseconds."""
+    timings = []
+    for i in range(REPEATS):
+        result = {}
+
+        def timed_job():
+            start = time.perf_counter()
+            update_job()
+            result['time'] = time.perf_counter() - start
+
+        thread = thread_class(target=timed_job)
+        thread.start()
+        thread.join()
+        timings.append(result['time'])
+    return statistics.median(timings) * 1000
+
+
+if __name__ == '__main__':
+    print(f'update job: {COVID_ROWS} covid rows for 2 areas and {NEWS_ARTICLES} news articles')
+    plain = median_ms(threading.Thread)
+    traced = median_ms(TracedThread)
+    print(f'without trace hook {plain:8.3f} ms')
+    print(f'with trace hook    {traced:8.3f} ms ({traced / plain:.1f}x)')
@@ -0,0 +1,183 @@
+"""
+Offline benchmark suite, run against the local stand-ins for the covid and news apis in stub_apis.py, so the results
+can be compared between runs and machines without the live apis.
+
+Each case is run at each size (the number of covid rows or news articles) and reports the operations per second,
+the median (p50) and 99th percentile (p99) latency and the peak memory allocated by one operation (from tracemalloc,
+measured in a separate run so the timings don't include its overhead).
+
+Run from the root folder of the project:
+    python3 benchmarks/run_suite.py
+    python3 benchmarks/run_suite.py --sizes 1000 1000000 --cases parse_csv_data process_covid_csv_data
+    python3 benchmarks/run_suite.py --json results.json
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import covid_data_handler
+import covid_news_handling
+import global_vars
+import scheduler
+from article_store import ArticleStore
+from covid_data_handler import covid_data_collector, parse_csv_data, process_covid_csv_data
+from covid_news_handling import update_news, merge_news_articles, news_articles_list
+from schedule_store import ScheduleStore
+from stub_apis import StubAPIs, make_csv_file
+
+SIZES = (1_000, 10_000, 100_000)
+REPEATS = 20
+# the most seconds spent timing one case at one size, large sizes are run fewer times (but at least MIN_REPEATS)
+MAX_SECONDS = 10
+MIN_REPEATS = 3
+
+
+def case_parse_csv_data(size:int, stubs:StubAPIs, folder:str):
+    """Reads a covid csv file of size rows into a list of lines."""
+    filename = os.path.join(folder, 'covid_'+str(size)+'.csv')
+    make_csv_file(filename, size)
+    return lambda: parse_csv_data(filename)
+
+
+def case_process_covid_csv_data(size:int, stubs:StubAPIs, folder:str):
+    """Gets the summary values from size lines of a covid csv file."""
+    filename = os.path.join(folder, 'covid_'+str(size)+'.csv')
+    make_csv_file(filename, size)
+    covid_csv_data = parse_csv_data(filename)
+    return lambda: process_covid_csv_data(covid_csv_data)
+
+
+def case_covid_data_collector(size:int, stubs:StubAPIs, folder:str):
+    """Requests size rows for the local and national areas and saves them, as a full covid update does."""
+    stubs.covid_row_count = size
+    covid_data_handler.config['covid_recent_days'] = size
+    return covid_data_collector
+
+
+def case_update_news(size:int, stubs:StubAPIs, folder:str):
+    """Requests size news articles and merges them into an empty articles store."""
+    stubs.news_article_count = size
+    global_vars.set_articles()
+    return lambda: update_news(ArticleStore(max_count=size), 'Covid')
+
+
+def case_scheduler_updates(size:int, stubs:StubAPIs, folder:str):
+    """Runs the covid and news updates the scheduler runs, holding size rows and articles, after the first update."""
+    stubs.covid_row_count = size
+    stubs.news_article_count = size
+    covid_data_handler.config['covid_recent_days'] = size
+    covid_data_handler.COVID_SERIES.clear()
+    global_vars.update_articles(ArticleStore(max_count=size))
+
+    def run_updates():
+        scheduler.update_covid()
+        scheduler.update_news_articles()
+    return run_updates
+
+
+def case_index(size:int, stubs:StubAPIs, folder:str):
+    """Loads the page (index) with size articles held."""
+    client = held_page_client(size, stubs)
+    return lambda: client.get('/')
+
+
+def case_index2(size:int, stubs:StubAPIs, folder:str):
+    """Schedules an update from the page's form (index2) and removes it again, with size articles held."""
+    client = held_page_client(size, stubs)
+    scheduler.SCHEDULE_STORE = ScheduleStore(os.path.join(folder, 'schedules.db'))
+    # an update due in nearly a day, so it doesn't run while it is held
+    update_time = time.strftime('%H:%M', time.localtime(time.time() - 60))
+
+    def schedule_and_remove():
+        client.get('/index', query_string={'two' : 'bench', 'update' : update_time, 'covid-data' : 'covid-data', 'repeat' : 'repeat'})
+        client.get('/index', query_string={'update_item' : 'bench'})
+    return schedule_and_remove
+
+
+def held_page_client(size:int, stubs:StubAPIs):
+    """Fills the global variables with size articles and the covid data, and returns a flask test client."""
+    from flask_application import app
+    # the news snapshot is requested again, so it has size articles
+    covid_news_handling.NEWS_SNAPSHOTS.clear()
+    stubs.covid_row_count = 28
+    stubs.news_article_count = size
+    covid_data_handler.config['covid_recent_days'] = 28
+    global_vars.set_global_vars()
+    global_vars.update_articles(merge_news_articles(ArticleStore(max_count=size), news_articles_list()))
+    global_vars.update_covid_data_list(covid_data_collector())
+    return app.test_client()
+
+
+CASES = {
+        'parse_csv_data' : case_parse_csv_data,
+        'process_covid_csv_data' : case_process_covid_csv_data,
+        'covid_data_collector' : case_covid_data_collector,
+        'update_news' : case_update_news,
+        'scheduler_updates' : case_scheduler_updates,
+        'index' : case_index,
+        'index2' : case_index2
+        }
+
+
+def measure(operation, repeats:int) -> dict:
+    """Times the operation up to repeats times (after one warm up run) and measures its peak memory in one more run."""
+    operation()
+    latencies = []
+    started = time.perf_counter()
+    while len(latencies) < repeats and (len(latencies) < MIN_REPEATS or time.perf_counter() - started < MAX_SECONDS):
+        start = time.perf_counter()
+        operation()
+        latencies.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    operation()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    percentiles = statistics.quantiles(latencies, n=100, method='inclusive')
+    return {
+            'runs' : len(latencies),
+            'ops_per_second' : len(latencies) / sum(latencies),
+            'p50_ms' : statistics.median(latencies) * 1000,
+            'p99_ms' : percentiles[98] * 1000,
+            'peak_mb' : peak / 1e6
+            }
+
+
+def run_suite(cases:list, sizes:list, repeats:int) -> list:
+    """Runs each case at each size against the stub apis and prints a line for each result."""
+    results = []
+    stubs = StubAPIs().start()
+    with tempfile.TemporaryDirectory() as folder:
+        covid_data_handler.config['covid_cache_dir'] = os.path.join(folder, 'covid_cache')
+        print(f'{"case":>24} {"size":>9} {"runs":>5} {"ops/s":>10} {"p50 ms":>10} {"p99 ms":>10} {"peak MB":>9}')
+        for name in cases:
+            for size in sizes:
+                result = measure(CASES[name](size, stubs, folder), repeats)
+                result.update({'case' : name, 'size' : size})
+                results.append(result)
+                print(f'{name:>24} {size:>9,} {result["runs"]:>5} {result["ops_per_second"]:>10.2f} '
+                      f'{result["p50_ms"]:>10.2f} {result["p99_ms"]:>10.2f} {result["peak_mb"]:>9.1f}', flush=True)
+    stubs.stop()
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Offline benchmark suite of the covid dashboard')
+    parser.add_argument('--cases', nargs='+', choices=list(CASES), default=list(CASES), help='the cases to run, all by default')
+    parser.add_argument('--sizes', nargs='+', type=int, default=list(SIZES), help='the numbers of rows or articles to run each case with')
+    parser.add_argument('--repeats', type=int, default=REPEATS, help='the most times each case is timed at each size')
+    parser.add_argument('--json', help='file to save the results in, to compare with later runs')
+    args = parser.parse_args()
+
+    suite_results = run_suite(args.cases, args.sizes, args.repeats)
+    if args.json:
+        with open(args.json, 'w', encoding='utf8') as json_file:
+            json.dump(suite_results, json_file, indent=4)
@@ -0,0 +1,185 @@
+"""
+Local stand-ins for the covid api (Cov19API.endpoint) and the news api (newsapi.org), used by the offline benchmark suite.
+
+The responses are made from recorded fixtures, repeated up to the number of rows or articles being benchmarked:
+the covid rows from the recorded nation_2021-10-28.csv file and the articles from fixtures/news_everything.json
+(a response in the shape of the news api's 'everything' endpoint).
+"""
+import json
+import os
+import threading
+import zlib
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from uk_covid19 import Cov19API
+
+import covid_news_handling
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COVID_CSV = os.path.join(ROOT, 'nation_2021-10-28.csv')
+NEWS_FIXTURE = os.path.join(ROOT, 'benchmarks', 'fixtures', 'news_everything.json')
+
+# the number of rows in each page of a covid api response
+PAGE_ROWS = 1000
+
+
+def recorded_covid_values() -> list:
+    """Returns the (new cases, hospital cases, cumulative deaths) of each recorded day, newest first, empty values filled from the day before."""
+    with open(COVID_CSV, encoding='utf8') as csv_file:
+        lines = csv_file.read().splitlines()[1:]
+    values = []
+    held = [0, 0, 0]
+    for line in reversed(lines):
+        cells = line.split(',')
+        # new cases, hospital cases and deaths are the last three columns
+        for i, cell in enumerate(cells[-3:][::-1]):
+            if cell != '':
+                held[i] = int(cell)
+        values.append(tuple(held))
+    return values[::-1]
+
+
+def make_covid_rows(area_name:str, area_type:str, count:int) -> list:
+    """Makes count rows of a covid api response for an area, newest (today) first."""
+    values = recorded_covid_values()
+    today = date.today()
+    rows = []
+    for day in range(count):
+        new_cases, hospital_cases, cum_deaths = values[day % len(values)]
+        rows.append({
+                    'areaCode' : 'E'+str(92000000 + zlib.crc32(area_name.encode()) % 1000),
+                    'areaName' : area_name,
+                    'areaType' : area_type,
+                    'date' : str(today - timedelta(days=day)),
+                    'cumDeaths28DaysByDeathDate' : cum_deaths,
+                    'hospitalCases' : hospital_cases,
+                    'newCasesByPublishDate' : new_cases
+                    })
+    return rows
+
+
+def make_news_articles(count:int, prefix:str='') -> list:
+    """Makes count news api articles, each with its own title and url."""
+    with open(NEWS_FIXTURE, encoding='utf8') as fixture_file:
+        recorded = json.load(fixture_file)['articles']
+    articles = []
+    for number in range(count):
+        article = dict(recorded[number % len(recorded)])
+        article['title'] = article['title']+' ('+prefix+str(number)+')'
+        article['url'] = article['url']+'/'+prefix+str(number)
+        articles.append(article)
+    return articles
+
+
+def make_csv_file(filename:str, rows:int) -> None:
+    """Writes a covid csv file like nation_2021-10-28.csv with rows rows, the recorded days repeated for as many areas as needed."""
+    with open(COVID_CSV, encoding='utf8') as csv_file:
+        lines = csv_file.read().splitlines()
+    header, recorded = lines[0], lines[1:]
+    with open(filename, 'w', encoding='utf8') as csv_file:
+        csv_file.write(header+'\n')
+        for number in range(rows):
+            area, line = divmod(number, len(recorded))
+            cells = recorded[line].split(',')
+            cells[0] = 'E'+str(92000001 + area)
+            cells[1] = 'Area '+str(area)
+            csv_file.write(','.join(cells)+'\n')
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers covid api and news api requests from the fixtures held by the server."""
+    protocol_version = 'HTTP/1.1'
+    # headers and body are written separately, which Nagle's algorithm would delay on a kept-alive connection
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        params = {name : values[0] for name, values in parse_qs(url.query).items()}
+        self.server.requests = self.server.requests + 1
+        if url.path == '/v2/everything':
+            self.send_body(self.server.news_body(params.get('q', '')))
+        else:
+            self.send_covid_page(params)
+
+    def send_covid_page(self, params:dict) -> None:
+        """Sends a page of the rows of the area in the filters, or no content after the last page."""
+        filters = dict(item.split('=', 1) for item in params['filters'].split(';'))
+        body = self.server.covid_page(filters['areaName'], filters['areaType'], int(params.get('page', 1)))
+        if body is None:
+            self.send_response(204)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self.send_body(body)
+
+    def send_body(self, body:bytes) -> None:
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Last-Modified', 'Thu, 28 Oct 2021 15:00:00 GMT')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubAPIs(ThreadingHTTPServer):
+    """
+    A local server standing in for both apis, returning at least covid_rows rows for each area and news_articles articles.
+    The responses are made once for each size and kept, so making them isn't part of the time measured.
+    """
+    daemon_threads = True
+
+    def __init__(self, covid_rows:int=28, news_articles:int=100):
+        super().__init__(('127.0.0.1', 0), StubHandler)
+        self.covid_row_count = covid_rows
+        self.news_article_count = news_articles
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._covid = {}
+        self._news = {}
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """The url of the server."""
+        return 'http://127.0.0.1:'+str(self.server_address[1])
+
+    def covid_page(self, area_name:str, area_type:str, page:int) -> bytes:
+        """
+        Returns a page of the area's rows, None after the last page. Like the live api, the whole history of the area is
+        served (at least the recorded days) however few days are wanted, so the bytes of the rows dropped by
+        request_covid_pages are downloaded too.
+        """
+        key = (area_name, area_type, self.covid_row_count)
+        with self._lock:
+            if key not in self._covid:
+                rows = make_covid_rows(area_name, area_type, max(self.covid_row_count, len(recorded_covid_values())))
+                self._covid[key] = [json.dumps({'data' : rows[start:start + PAGE_ROWS]}).encode()
+                                    for start in range(0, len(rows), PAGE_ROWS)]
+            pages = self._covid[key]
+        return pages[page - 1] if page <= len(pages) else None
+
+    def news_body(self, terms:str) -> bytes:
+        """Returns the news api response for the search terms."""
+        key = (terms, self.news_article_count)
+        with self._lock:
+            if key not in self._news:
+                articles = make_news_articles(self.news_article_count, terms+' ')
+                self._news[key] = json.dumps({'status' : 'ok', 'totalResults' : len(articles), 'articles' : articles}).encode()
+            return self._news[key]
+
+    def start(self) -> 'StubAPIs':
+        """Starts serving in a background thread and points the covid and news api requests at the server."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        Cov19API.endpoint = self.url+'/v1/data'
+        covid_news_handling.config['news_api_url'] = self.url+'/v2/everything'
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,175 @@
+"""Module to load covid csv data into typed numpy columns and query it without python loops"""
+import numpy as np
+
+# columns in the nation_*.csv schema which are left as strings, every other column except the date is numeric
+STRING_COLUMNS = ('areaCode', 'areaName', 'areaType')
+DATE_COLUMN = 'date'
+CASES_COLUMN = 'newCasesBySpecimenDate'
+HOSPITAL_COLUMN = 'hospitalCases'
+DEATHS_COLUMN = 'cumDailyNsoDeathsByDeathDate'
+
+# the columns needed by process_covid_csv_columns
+SUMMARY_COLUMNS = ('areaCode', DATE_COLUMN, DEATHS_COLUMN, HOSPITAL_COLUMN, CASES_COLUMN)
+
+
+def load_covid_csv_columns(csv_data:any, columns:tuple=None) -> dict:
+    """
+    Description:
+
+        Function which loads covid csv data into a dictionary of numpy arrays, one for each column.
+        The 'date' column is a datetime64 array, the area columns are string arrays and every other column
+        is a float array where empty cells are NaN.
+
+    Arguments:
+
+        csv_data {any} : the name of the csv file, or a list of its lines (like the list returned from parse_csv_data)
+
+        columns {tuple} : names of the columns to load, all of them by default. Loading fewer columns uses less memory on large files
+
+    Returns:
+
+        covid_columns {dict} : dictionary with the column names as keys and numpy arrays as values
+    """
+    if isinstance(csv_data, str):
+        with open(csv_data, 'r', encoding='utf8') as csv_file:
+            header = csv_file.readline().strip().split(',')
+        lines = csv_data
+    else:
+        header = csv_data[0].strip().split(',')
+        lines = csv_data[1:]
+
+    if columns is None:
+        columns = header
+    usecols = [header.index(name) for name in columns]
+
+    raw_columns = np.loadtxt(lines, delimiter=',', dtype=str, skiprows=1 if isinstance(lines, str) else 0,
+                             usecols=usecols, ndmin=2, encoding='utf8')
+
+    covid_columns = {}
+    for i, name in enumerate(columns):
+        raw_column = raw_columns[:, i]
+        if name in STRING_COLUMNS:
+            covid_columns[name] = raw_column.copy()
+        elif name == DATE_COLUMN:
+            covid_columns[name] = parse_dates(raw_column)
+        else:
+            # empty cells become NaN so they can be masked out of the queries
+            covid_columns[name] = np.where(raw_column == '', 'nan', raw_column).astype(np.float64)
+    return covid_columns
+
+
+def parse_dates(date_column:np.ndarray) -> np.ndarray:
+    """
+    Description:
+
+        Function which converts a column of 'dd/mm/yyyy' or 'yyyy-mm-dd' date strings into a datetime64 array
+
+    Arguments:
+
+        date_column {np.ndarray} : string array of dates
+
+    Returns:
+
+        {np.ndarray} : datetime64[D] array of the dates
+    """
+    date_column = date_column.astype('U10')
+    if len(date_column) > 0 and date_column[0][2:3] == '/':
+        # reorders the characters of dd/mm/yyyy into yyyy-mm-dd without looping over the dates
+        characters = date_column.view('U1').reshape(len(date_column), 10)
+        characters = characters[:, [6, 7, 8, 9, 2, 3, 4, 5, 0, 1]]
+        characters[:, 4] = '-'
+        characters[:, 7] = '-'
+        date_column = np.ascontiguousarray(characters).view('U10').ravel()
+    return date_column.astype('datetime64[D]')
+
+
+def covid_csv_summary(covid_columns:dict) -> dict:
+    """
+    Description:
+
+        Function to get the last 7 day number of cases, current hospital cases and cumulative number of deaths for every area
+        in the columns returned from load_covid_csv_columns. The rows can be in any order.
+
+            num_cases : the sum of the 7 most recent days with cases, not including the most recent one as it is incomplete
+
+            hospital_cases : the most recent non-empty hospital cases value
+
+            cum_deaths : the most recent non-empty cumulative deaths value
+
+    Arguments:
+
+        covid_columns {dict} : dictionary of numpy arrays returned from load_covid_csv_columns
+
+    Returns:
+
+        summary {dict} : dictionary with the area codes as keys and (num_cases, hospital_cases, cum_deaths) tuples as values.
+        A value is None if the area has no data for it
+    """
+    area_codes, area_index = np.unique(covid_columns['areaCode'], return_inverse=True)
+    dates = covid_columns[DATE_COLUMN].astype(np.int64)
+    area_count = len(area_codes)
+
+    cases, cases_area, cases_rank = _rank_recent(covid_columns[CASES_COLUMN], area_index, dates)
+    in_window = (cases_rank >= 1) & (cases_rank <= 7)
+    num_cases = np.bincount(cases_area[in_window], weights=cases[in_window], minlength=area_count)
+    has_cases = np.bincount(cases_area[in_window], minlength=area_count) > 0
+
+    hospital_cases = _latest(covid_columns[HOSPITAL_COLUMN], area_index, dates, area_count)
+    cum_deaths = _latest(covid_columns[DEATHS_COLUMN], area_index, dates, area_count)
+
+    summary = {}
+    for i, area_code in enumerate(area_codes.tolist()):
+        summary[area_code] = (
+                            int(num_cases[i]) if has_cases[i] else None,
+                            None if np.isnan(hospital_cases[i]) else int(hospital_cases[i]),
+                            None if np.isnan(cum_deaths[i]) else int(cum_deaths[i])
+                            )
+    return summary
+
+
+def process_covid_csv_columns(covid_columns:dict, area_code:str=None) -> tuple[int, int, int]:
+    """
+    Description:
+
+        Function to get last 7 day number of cases, hospital cases and cumulative number of deaths for one area
+        from the columns returned from load_covid_csv_columns
+
+    Arguments:
+
+        covid_columns {dict} : dictionary of numpy arrays returned from load_covid_csv_columns
+
+        area_code {str} : the area code to get the data for, by default the first area in the columns
+
+    Returns:
+
+        num_cases {int} : integer value containing the number of covid cases in the last 7 days
+
+        hospital_cases {int} : integer value containing the number of current hospital cases from covid
+
+        cum_deaths {int} : integer value containing the cumulative number of deaths from covid
+    """
+    if area_code is None:
+        area_code = str(covid_columns['areaCode'][0])
+    return covid_csv_summary(covid_columns)[area_code]
+
+
+def _rank_recent(values:np.ndarray, area_index:np.ndarray, dates:np.ndarray) -> tuple:
+    """Sorts the non-empty values by area then newest date first, returning the values, their areas and their rank within the area."""
+    present = ~np.isnan(values)
+    values = values[present]
+    area_index = area_index[present]
+    order = np.lexsort((-dates[present], area_index))
+    values = values[order]
+    area_index = area_index[order]
+    # position of each value within its area, the newest value has rank 0
+    rank = np.arange(len(area_index)) - np.searchsorted(area_index, area_index, side='left')
+    return values, area_index, rank
+
+
+def _latest(values:np.ndarray, area_index:np.ndarray, dates:np.ndarray, area_count:int) -> np.ndarray:
+    """Gets the newest non-empty value for every area, NaN for areas without one."""
+    values, area_index, rank = _rank_recent(values, area_index, dates)
+    latest = np.full(area_count, np.nan)
+    newest = rank == 0
+    latest[area_index[newest]] = values[newest]
+    return latest
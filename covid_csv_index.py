@@ -0,0 +1,170 @@
+"""Module to look up single rows of a covid csv file through a memory map and a saved offset index"""
+import json
+import logging
+import mmap
+import os
+from datetime import date
+
+
+def normalise_date(record_date:any) -> str:
+    """
+    Description:
+
+        Function which turns a date, or a 'dd/mm/yyyy' or 'yyyy-mm-dd' string, into a 'yyyy-mm-dd' string
+
+    Arguments:
+
+        record_date {any} : the date to normalise
+
+    Returns:
+
+        {str} : the date as a 'yyyy-mm-dd' string
+    """
+    if isinstance(record_date, date):
+        return record_date.isoformat()
+    if record_date[2:3] == '/':
+        return record_date[6:10]+'-'+record_date[3:5]+'-'+record_date[0:2]
+    return record_date
+
+
+class IndexedCovidCsv:
+    """
+    A covid csv file opened as a memory map, with an index of the byte offset of every row keyed by (areaCode, date).
+
+    The index is saved next to the csv file (<csv file>.idx.json) and reused by later runs as long as the size and
+    modification time of the csv file haven't changed, so a lookup only has to seek to one line and parse it.
+    """
+    def __init__(self, csv_filename:str):
+        self.csv_filename = csv_filename
+        self.index_filename = csv_filename+'.idx.json'
+        self._file = open(csv_filename, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        stat = os.stat(csv_filename)
+        self.index = self._load_index(stat)
+        if self.index is None:
+            self.index = self._build_index(stat)
+            self._save_index()
+        self.header = self.index['header']
+        self.offsets = self.index['offsets']
+
+    def lookup(self, area_code:str, record_date:any) -> dict:
+        """
+        Description:
+
+            Function which gets one row of the csv file by seeking to its offset
+
+        Arguments:
+
+            area_code {str} : the area code of the row
+
+            record_date {any} : the date of the row, as a date or a 'dd/mm/yyyy' or 'yyyy-mm-dd' string
+
+        Returns:
+
+            row {dict} : dictionary with the column names as keys, numbers are integers and empty cells are None.
+            None if there is no row for the area and date
+        """
+        offset = self.offsets.get(area_code, {}).get(normalise_date(record_date))
+        if offset is None:
+            return None
+
+        end = self._map.find(b'\n', offset)
+        if end == -1:
+            end = len(self._map)
+        fields = self._map[offset:end].decode('utf8').strip().split(',')
+
+        row = {}
+        for name, value in zip(self.header, fields):
+            if value == '':
+                row[name] = None
+            elif value.isdigit():
+                row[name] = int(value)
+            else:
+                row[name] = value
+        return row
+
+    def lookup_value(self, area_code:str, record_date:any, column:str) -> any:
+        """
+        Description:
+
+            Function which gets the value of one column on one date for an area, e.g. the hospital cases on a date
+
+        Arguments:
+
+            area_code {str} : the area code of the row
+
+            record_date {any} : the date of the row, as a date or a 'dd/mm/yyyy' or 'yyyy-mm-dd' string
+
+            column {str} : the name of the column
+
+        Returns:
+
+            {any} : the value in the column, None if it is empty or there is no row
+        """
+        row = self.lookup(area_code, record_date)
+        if row is None:
+            return None
+        return row[column]
+
+    def close(self) -> None:
+        """Closes the memory map and the csv file."""
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _load_index(self, stat:os.stat_result) -> dict:
+        """Loads the saved index, returning None if it is missing or was made for a different version of the csv file."""
+        try:
+            with open(self.index_filename, 'r', encoding='utf8') as index_file:
+                index = json.load(index_file)
+        except (OSError, ValueError):
+            return None
+        if index.get('size') != stat.st_size or index.get('mtime_ns') != stat.st_mtime_ns:
+            logging.info('CSV INDEX %s IS OUT OF DATE', self.index_filename)
+            return None
+        return index
+
+    def _build_index(self, stat:os.stat_result) -> dict:
+        """Scans the memory map once, recording the offset of every row."""
+        header_end = self._map.find(b'\n')
+        if header_end == -1:
+            header_end = len(self._map)
+        header = self._map[:header_end].decode('utf8').strip().split(',')
+        area_column = header.index('areaCode')
+        date_column = header.index('date')
+        split_count = max(area_column, date_column) + 1
+
+        offsets = {}
+        offset = header_end + 1
+        size = len(self._map)
+        while offset < size:
+            end = self._map.find(b'\n', offset)
+            if end == -1:
+                end = size
+            fields = self._map[offset:end].split(b',', split_count)
+            if len(fields) > split_count - 1:
+                area_code = fields[area_column].decode('utf8')
+                offsets.setdefault(area_code, {})[normalise_date(fields[date_column].decode('utf8'))] = offset
+            offset = end + 1
+
+        logging.info('CSV INDEX BUILT FOR %s', self.csv_filename)
+        return {
+                'size' : stat.st_size,
+                'mtime_ns' : stat.st_mtime_ns,
+                'header' : header,
+                'offsets' : offsets
+                }
+
+    def _save_index(self) -> None:
+        """Saves the index next to the csv file, carrying on without it if it can't be written."""
+        try:
+            with open(self.index_filename, 'w', encoding='utf8') as index_file:
+                json.dump(self.index, index_file, separators=(',', ':'))
+        except OSError:
+            logging.warning('CSV INDEX %s COULD NOT BE SAVED', self.index_filename)
@@ -0,0 +1,194 @@
+"""Module to process covid csv files of any size in one pass without holding the file in memory"""
+import heapq
+from collections import namedtuple
+
+# one typed row of the csv file, empty cells are None
+CovidRecord = namedtuple('CovidRecord', ['area_code', 'date', 'cum_deaths', 'hospital_cases', 'new_cases'])
+
+
+def iter_csv_rows(csv_filename:str) -> iter:
+    """
+    Description:
+
+        Generator which reads a csv file one line at a time and yields each line split into its fields.
+        The first row yielded is the header.
+
+    Arguments:
+
+        csv_filename {str} : is the string name of the csv file
+
+    Returns:
+
+        {iter} : iterator of lists of strings, one list for each line
+    """
+    with open(csv_filename, 'r', encoding='utf8') as csv_file:
+        for line in csv_file:
+            line = line.strip()
+            if line:
+                yield line.split(',')
+
+
+def iter_covid_records(rows:iter, area_code:str=None) -> iter:
+    """
+    Description:
+
+        Generator which turns the rows from iter_csv_rows into CovidRecord tuples, using the header row to find the columns.
+        Dates are turned into 'yyyy-mm-dd' strings so they can be compared, and the numbers into integers.
+
+    Arguments:
+
+        rows {iter} : iterator of rows, starting with the header row (areaCode,areaName,areaType,
+        date,cumDailyNsoDeathsByDeathDate,hospitalCases,newCasesBySpecimenDate)
+
+        area_code {str} : if given, the rows of every other area are skipped without being parsed
+
+    Returns:
+
+        {iter} : iterator of CovidRecord tuples
+    """
+    header = next(rows)
+    area_column = header.index('areaCode')
+    date_column = header.index('date')
+    deaths_column = header.index('cumDailyNsoDeathsByDeathDate')
+    hospital_column = header.index('hospitalCases')
+    cases_column = header.index('newCasesBySpecimenDate')
+
+    for row in rows:
+        if area_code is not None and row[area_column] != area_code:
+            continue
+        record_date = row[date_column]
+        if record_date[2:3] == '/':
+            # dd/mm/yyyy to yyyy-mm-dd
+            record_date = record_date[6:10]+'-'+record_date[3:5]+'-'+record_date[0:2]
+        yield CovidRecord(
+                        row[area_column],
+                        record_date,
+                        int(row[deaths_column]) if row[deaths_column] else None,
+                        int(row[hospital_column]) if row[hospital_column] else None,
+                        int(row[cases_column]) if row[cases_column] else None
+                        )
+
+
+class RecentWindow:
+    """
+    Online aggregator which keeps the newest values seen (by date) in a heap of a fixed size,
+    so the rows can arrive in any order.
+    """
+    def __init__(self, size:int):
+        self.size = size
+        self.heap = []
+
+    def add(self, record_date:str, value:int) -> None:
+        """Adds a value, dropping the oldest value in the window if it is full."""
+        if len(self.heap) < self.size:
+            heapq.heappush(self.heap, (record_date, value))
+        elif record_date > self.heap[0][0]:
+            heapq.heapreplace(self.heap, (record_date, value))
+
+    def newest(self) -> list:
+        """Returns the values in the window, newest first."""
+        return [value for record_date, value in sorted(self.heap, reverse=True)]
+
+
+class LatestNonNull:
+    """Online aggregator which keeps the value with the newest date, ignoring empty values."""
+    def __init__(self):
+        self.date = None
+        self.value = None
+
+    def add(self, record_date:str, value:int) -> None:
+        """Keeps the value if it isn't empty and is newer than the current one."""
+        if value is not None and (self.date is None or record_date > self.date):
+            self.date = record_date
+            self.value = value
+
+
+class MaxDate:
+    """Online aggregator which keeps the newest date seen."""
+    def __init__(self):
+        self.date = None
+
+    def add(self, record_date:str) -> None:
+        """Keeps the date if it is newer than the current one."""
+        if self.date is None or record_date > self.date:
+            self.date = record_date
+
+
+def stream_covid_csv_summary(csv_filename:str, area_code:str=None) -> dict:
+    """
+    Description:
+
+        Function to get the last 7 day number of cases, current hospital cases, cumulative number of deaths and latest date
+        for every area in a covid csv file, in a single pass over the file. Only a few values are held for each area, so memory
+        does not grow with the size of the file.
+
+            num_cases : the sum of the 7 most recent days with cases, not including the most recent one as it is incomplete
+
+            hospital_cases : the most recent non-empty hospital cases value
+
+            cum_deaths : the most recent non-empty cumulative deaths value
+
+    Arguments:
+
+        csv_filename {str} : is the string name of the csv file
+
+        area_code {str} : if given, only this area is processed
+
+    Returns:
+
+        summary {dict} : dictionary with the area codes as keys and (num_cases, hospital_cases, cum_deaths, latest_date) tuples
+        as values. A value is None if the area has no data for it
+    """
+    areas = {}
+    for record in iter_covid_records(iter_csv_rows(csv_filename), area_code):
+        if record.area_code not in areas:
+            areas[record.area_code] = (RecentWindow(8), LatestNonNull(), LatestNonNull(), MaxDate())
+        cases_window, hospital_cases, cum_deaths, latest_date = areas[record.area_code]
+
+        if record.new_cases is not None:
+            cases_window.add(record.date, record.new_cases)
+        hospital_cases.add(record.date, record.hospital_cases)
+        cum_deaths.add(record.date, record.cum_deaths)
+        latest_date.add(record.date)
+
+    summary = {}
+    for code, (cases_window, hospital_cases, cum_deaths, latest_date) in areas.items():
+        # the most recent day with cases is left out as it is incomplete
+        recent_cases = cases_window.newest()[1:]
+        summary[code] = (
+                        sum(recent_cases) if recent_cases else None,
+                        hospital_cases.value,
+                        cum_deaths.value,
+                        latest_date.date
+                        )
+    return summary
+
+
+def process_covid_csv_stream(csv_filename:str, area_code:str=None) -> tuple[int, int, int]:
+    """
+    Description:
+
+        Function to get last 7 day number of cases, hospital cases and cumulative number of deaths for one area
+        of a covid csv file, without reading the whole file into memory.
+
+    Arguments:
+
+        csv_filename {str} : is the string name of the csv file
+
+        area_code {str} : the area code to get the data for, by default the area of the first row in the file
+
+    Returns:
+
+        num_cases {int} : integer value containing the number of covid cases in the last 7 days
+
+        hospital_cases {int} : integer value containing the number of current hospital cases from covid
+
+        cum_deaths {int} : integer value containing the cumulative number of deaths from covid
+    """
+    if area_code is None:
+        rows = iter_csv_rows(csv_filename)
+        header = next(rows)
+        area_code = next(rows)[header.index('areaCode')]
+        rows.close()
+    num_cases, hospital_cases, cum_deaths, latest_date = stream_covid_csv_summary(csv_filename, area_code)[area_code]
+    return num_cases, hospital_cases, cum_deaths
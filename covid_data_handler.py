@@ -1,24 +1,46 @@
 """Module to proccess all covid data returned from the covid api and csv file"""
-import json
 import sched
 import threading
 import time
 import logging
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import date, timedelta
-from uk_covid19 import Cov19API
+from http import HTTPStatus
 import global_vars
+from covid_csv_index import IndexedCovidCsv
+from snapshot_cache import SnapshotCache
+from single_flight import SingleFlight
+from metrics import timed, UPSTREAM_BYTES
+from log_handling import setup_logging
+from app_config import load_config
 
-#sets up logging for this module
-FORMAT = '%(levelname)s: %(asctime)s: %(message)s'
-logging.basicConfig(filename='log_file.log', format=FORMAT, level=logging.INFO)
+# sets up logging for this module, written to the log file by the logging thread
+setup_logging()
 
-#sets up the config file for this module
-with open("config.json", encoding='utf8') as json_data_file:
-    config = json.load(json_data_file)
+#sets up the config file for this module, loaded once and shared by every module
+config = load_config()
 
 #Creates sched instance
 SCHEDULER = sched.scheduler(time.time, time.sleep)
 
+# shares one covid api request between the snapshot refresh and scheduled updates running at the same time
+COVID_FLIGHT = SingleFlight('covid')
+
+# snapshot of the covid data which the HTML page is rendered from
+COVID_SNAPSHOT = SnapshotCache(lambda: shared_covid_data_collector(), config['covid_cache_ttl'], 'covid')
+
+# the newest rows held for each (location, location_type) area, oldest row first, used by incremental updates
+COVID_SERIES = {}
+SERIES_LOCK = threading.Lock()
+
+# the threads the covid areas are requested on, shared by every call of covid_areas_collector
+COVID_EXECUTOR = None
+EXECUTOR_LOCK = threading.Lock()
+
+# the number of newest rows read by get_num_cases, get_hospital_cases and get_cum_deaths (which reads the 15th or 16th),
+# the values of these rows are still being revised by the api so they are all requested again by each update
+READ_ROWS = 16
+
 
 def parse_csv_data(csv_filename:str) -> list:
     """
@@ -46,6 +68,25 @@ def parse_csv_data(csv_filename:str) -> list:
     corona_data.close()
     return corona_data_list
 
+def parse_csv_data_indexed(csv_filename:str) -> IndexedCovidCsv:
+    """
+        Description:
+
+            Function which opens a csv file as a memory map with an index of where each (areaCode, date) row starts,
+            so single rows can be looked up (e.g. the hospital cases on a date) without reading the whole file like parse_csv_data.
+
+            The index is saved as <csv_filename>.idx.json and reused until the csv file changes.
+
+        Arguments:
+
+            csv_file_name {str} : is the string name of the csv file
+
+        Returns:
+
+            {IndexedCovidCsv} : the indexed csv file, rows are found with its lookup and lookup_value methods
+    """
+    return IndexedCovidCsv(csv_filename)
+
 def process_covid_csv_data(covid_csv_data:list) -> tuple[int, int, int]:
     """
         Description:
@@ -53,6 +94,10 @@ def process_covid_csv_data(covid_csv_data:list) -> tuple[int, int, int]:
             Function to get last 7 day number of cases, hospital cases and cumulative number of deaths the data returned from a list
             (returned from parse_csv_data).
 
+            The list is loaded into numpy columns with load_covid_csv_columns, so the values are found by date rather than by
+            their row in the csv file: the 7 day cases skip the most recent (incomplete) day with cases, and the hospital cases and
+            deaths are the most recent non-empty values.
+
         Arguments:
 
             covid_csv_data {list} : list which contains covid data (areaCode,areaName,areaType,
@@ -66,19 +111,18 @@ def process_covid_csv_data(covid_csv_data:list) -> tuple[int, int, int]:
 
             cum_deaths {int} : integer value containing the cumulative number of deaths from covid
     """
-    num_cases = 0
-    for i in range (3, 10):
-        record = covid_csv_data[i]
-        # extract the newCasesBySpecimenDate field andadd it to the num_cases variable until last 7 days are added
-        num_cases = num_cases + int(','.join(record.split(',', 7)[6:]))
-    hospital_cases = int(','.join(covid_csv_data[1].split(',', 6)[5:6]))
-    cum_deaths = int(','.join(covid_csv_data[14].split(',', 5)[4:5]))
+    # numpy is only imported once csv data is processed
+    from covid_csv_columns import load_covid_csv_columns, process_covid_csv_columns, SUMMARY_COLUMNS
+
+    covid_columns = load_covid_csv_columns(covid_csv_data, SUMMARY_COLUMNS)
+    num_cases, hospital_cases, cum_deaths = process_covid_csv_columns(covid_columns)
 
     logging.info('COVID DATA IN CSV PROCESSED')
     return num_cases, hospital_cases, cum_deaths
 
 
-def covid_API_request(location:str='Exeter', location_type:str='ltla') -> dict:
+@timed('covid_api_request')
+def covid_API_request(location:str='Exeter', location_type:str='ltla', recent_days:int=None) -> dict:
     """
         Description:
 
@@ -90,6 +134,11 @@ def covid_API_request(location:str='Exeter', location_type:str='ltla') -> dict:
 
             location_type {str} : string containing the type of location
 
+            recent_days {int} : if given, only the most recent number of days are kept (the api returns the
+            newest days first, so no more pages are requested once there are enough rows). The api can't filter by a
+            range of dates, so the whole first page is still downloaded: for an area whose history fits on one page
+            (e.g. a nation) the bytes downloaded are the same as the whole history. By default the whole history is requested.
+
         Returns:
 
             covid_data_dictionary {dict} : dictionary containing 3 sub dictionary's: 'data' (containing all covid data requested),
@@ -112,16 +161,71 @@ def covid_API_request(location:str='Exeter', location_type:str='ltla') -> dict:
         "newCasesByPublishDate": "newCasesByPublishDate",
     }
 
+    # the api client (and requests) is only imported once data is requested, so starting the application doesn't wait for it
+    from uk_covid19 import Cov19API
+
     # initialise the COVID19API object with the chosen filters
     api = Cov19API(filters=location, structure=fields)
 
-    #creates a json file by extracting the data from the api object
-    covid_data_dictionary = api.get_json()
+    #creates a json file by extracting the data from the api object, requesting the pages here rather than with
+    #api.get_json so the bytes downloaded are counted whether or not a number of days is given
+    covid_data_dictionary = request_covid_pages(api, recent_days)
 
     #returns json file
     return covid_data_dictionary
 
 
+def request_covid_pages(api:'Cov19API', max_rows:int=None) -> dict:
+    """
+        Description:
+
+            Function which requests the pages of the api object one by one like Cov19API.get_json does, stopping as soon
+            as max_rows rows have been returned. The bytes of every page are added to the upstream bytes on /metrics.
+
+            Only the pages after the one holding the max_rows newest rows are saved: the rows of the pages which are
+            requested are all downloaded and the extra rows dropped here, as the api's date filter only matches one
+            date. 'payloadBytes' is the number of bytes actually downloaded.
+
+        Arguments:
+
+            api {Cov19API} : the api object containing the filters and structure of the request
+
+            max_rows {int} : the number of rows wanted, all pages are requested if it is None
+
+        Returns:
+
+            covid_data_dictionary {dict} : dictionary in the same form as Cov19API.get_json, with the extra
+            'payloadBytes' key containing the number of bytes which were downloaded
+    """
+    import requests
+    from uk_covid19 import Cov19API
+    from uk_covid19.exceptions import FailedRequestError
+
+    api_params = api.api_params
+    api_params['format'] = 'json'
+    api_params['page'] = 1
+
+    covid_data_dictionary = {'data' : [], 'lastUpdate' : None, 'payloadBytes' : 0}
+    while max_rows is None or len(covid_data_dictionary['data']) < max_rows:
+        response = requests.get(Cov19API.endpoint, params=api_params, timeout=config['covid_request_timeout'])
+        if response.status_code >= HTTPStatus.BAD_REQUEST:
+            raise FailedRequestError(response=response, params=api_params)
+        if response.status_code == HTTPStatus.NO_CONTENT:
+            break
+
+        covid_data_dictionary['lastUpdate'] = response.headers.get('Last-Modified')
+        covid_data_dictionary['payloadBytes'] = covid_data_dictionary['payloadBytes'] + len(response.content)
+        UPSTREAM_BYTES.inc('covid', amount=len(response.content))
+        covid_data_dictionary['data'].extend(response.json()['data'])
+        api_params['page'] = api_params['page'] + 1
+
+    if max_rows is not None:
+        covid_data_dictionary['data'] = covid_data_dictionary['data'][:max_rows]
+    covid_data_dictionary['length'] = len(covid_data_dictionary['data'])
+    covid_data_dictionary['totalPages'] = api_params['page'] - 1
+    return covid_data_dictionary
+
+
 def get_num_cases(dictionary:dict) -> int:
     """
     Description:
@@ -143,12 +247,12 @@ def get_num_cases(dictionary:dict) -> int:
     if str(dictionary['data'][0]['date']) == str(date.today()):
         for i in range (1, 8):
             if str(dictionary['data'][i]['date']) == str(date.today() - timedelta(days = i)):
-                num_cases = num_cases + int(dictionary['data'][i]['newCasesByPublishDate'])
+                num_cases = num_cases + int(dictionary['data'][i]['newCasesByPublishDate'] or 0)
     else:
         yesterday = date.today() - timedelta(days = 1)
         for i in range (0, 7):
             if str(dictionary['data'][i]['date']) == str(yesterday - timedelta(days = i)):
-                num_cases = num_cases + int(dictionary['data'][i]['newCasesByPublishDate'])
+                num_cases = num_cases + int(dictionary['data'][i]['newCasesByPublishDate'] or 0)
     return num_cases
 
 def get_hospital_cases(dictionary:dict) -> int:
@@ -164,13 +268,13 @@ def get_hospital_cases(dictionary:dict) -> int:
 
     Returns:
 
-         hospital_cases {int} : integer value containing the number of current hospital cases from covid
+         hospital_cases {int} : integer value containing the number of current hospital cases from covid, None if it is unavailable
     """
     if str(dictionary['data'][2]['date']) == str(date.today() - timedelta(days = 2)):
         index = 2
     else:
         index = 3
-    hospital_cases = int(dictionary['data'][index]['hospitalCases'])
+    hospital_cases = newest_value(dictionary['data'], index, 'hospitalCases')
     return hospital_cases
 
 def get_cum_deaths(dictionary:dict) -> int:
@@ -186,15 +290,39 @@ def get_cum_deaths(dictionary:dict) -> int:
 
     Returns:
 
-        cum_deaths {int} : integer value containing the cumulative number of deaths from covid
+        cum_deaths {int} : integer value containing the cumulative number of deaths from covid, None if it is unavailable
     """
     if str(dictionary['data'][14]['date']) == str(date.today() - timedelta(days = 14)):
         index = 14
     else:
         index = 15
-    cum_deaths = int(dictionary['data'][index]['cumDeaths28DaysByDeathDate'])
+    cum_deaths = newest_value(dictionary['data'], index, 'cumDeaths28DaysByDeathDate')
     return cum_deaths
 
+def newest_value(rows:list, index:int, field:str) -> int:
+    """
+    Description:
+
+        Function which gets the value of a field from the row at the index, or from the next older row with a value if
+        it is empty (None), e.g. a day which hadn't been reported yet when its row was saved
+
+    Arguments:
+
+        rows {list} : the rows of a dictionary returned from covid_API_request, newest row first
+
+        index {int} : the index of the row the value is wanted from
+
+        field {str} : the name of the field
+
+    Returns:
+
+        {int} : the value of the field, None if none of the rows from the index onwards have a value
+    """
+    for row in rows[index:]:
+        if row.get(field) is not None:
+            return int(row[field])
+    return None
+
 def get_location(local_dictionary:dict) -> str:
     """
     Description:
@@ -214,13 +342,120 @@ def get_location(local_dictionary:dict) -> str:
     return local_location
 
 
+def covid_executor() -> ThreadPoolExecutor:
+    """
+    Description:
+
+        Function which gets the threads the covid areas are requested on, making 'covid_max_workers' of them the
+        first time they are needed. The same threads are used by every call of covid_areas_collector, so a request
+        which hangs holds one of them instead of leaving a new thread behind on every refresh
+
+    Arguments:
+
+        None
+
+    Returns:
+
+        COVID_EXECUTOR {ThreadPoolExecutor} : the executor the covid areas are requested on
+    """
+    global COVID_EXECUTOR
+    with EXECUTOR_LOCK:
+        if COVID_EXECUTOR is None:
+            COVID_EXECUTOR = ThreadPoolExecutor(max_workers=config['covid_max_workers'], thread_name_prefix='covid')
+        return COVID_EXECUTOR
+
+
+def covid_areas_collector(areas:list, timeout:float=None, recent_days:int=None) -> dict:
+    """
+    Description:
+
+        Function which requests the covid data for every area at the same time, each covid_API_request call running
+        on one of the covid_executor threads, so the time taken is roughly that of the slowest area instead of the sum of all of them.
+
+        The areas are requested in batches of 'covid_max_workers', and each batch is given the timeout. An area which
+        fails or doesn't return within the timeout of its batch is logged and returned as None, so the areas which
+        did return can still be used.
+
+    Arguments:
+
+        areas {list} : list of (location, location_type) tuples for the areas to request
+
+        timeout {float} : number of seconds each batch of areas is given to return, 'covid_request_timeout' by default
+
+        recent_days {int} : if given, only the most recent number of days are requested for each area
+
+    Returns:
+
+        area_dictionaries {dict} : dictionary with the (location, location_type) tuples as keys and the dictionary
+        returned from covid_API_request (or None if it failed) as values
+    """
+    if timeout is None:
+        timeout = config['covid_request_timeout']
+    executor = covid_executor()
+    batch_size = config['covid_max_workers']
+
+    area_dictionaries = {}
+    for first in range(0, len(areas), batch_size):
+        futures = {}
+        for area in areas[first:first + batch_size]:
+            futures[area] = executor.submit(request_and_store_area, area[0], area[1], recent_days)
+        not_done = wait(futures.values(), timeout=timeout)[1]
+
+        for area, future in futures.items():
+            if future in not_done:
+                # an area which hasn't started yet isn't requested, one which has is left to finish on its own
+                future.cancel()
+                logging.warning('COVID API REQUEST FOR %s TIMED OUT AFTER %s SECONDS', area[0], timeout)
+                area_dictionaries[area] = None
+            elif future.exception() is not None:
+                logging.warning('COVID API REQUEST FOR %s FAILED: %r', area[0], future.exception())
+                area_dictionaries[area] = None
+            else:
+                area_dictionaries[area] = future.result()
+    return area_dictionaries
+
+
+def request_and_store_area(location:str, location_type:str, recent_days:int=None) -> dict:
+    """
+    Description:
+
+        Function which calls covid_API_request and saves the rows returned in the area's binary series file
+        (in the 'covid_cache_dir' folder) so they can be loaded on the next start without an api request
+
+    Arguments:
+
+        location {str} : string value containing the location data displayed is from
+
+        location_type {str} : string containing the type of location
+
+        recent_days {int} : if given, only the most recent number of days are requested
+
+    Returns:
+
+        covid_data_dictionary {dict} : the dictionary returned from covid_API_request
+    """
+    # the series files (and numpy) are only imported once covid data is saved or loaded
+    from covid_series_cache import store_covid_dictionary
+
+    covid_data_dictionary = covid_API_request(location, location_type, recent_days)
+    try:
+        store_covid_dictionary(config['covid_cache_dir'], location, location_type, covid_data_dictionary)
+    except (OSError, ValueError, KeyError):
+        logging.exception('COVID DATA FOR %s COULD NOT BE SAVED', location)
+    return covid_data_dictionary
+
+
+@timed('covid_data_collector')
 def covid_data_collector() -> tuple[str, str, int, int, str, str]:
     """
     Description:
 
-        Function which uses the: covid_API_request,  get_location, get_num_cases, get_hospital_cases, get_cum_deaths
+        Function which uses the: covid_areas_collector,  get_location, get_num_cases, get_hospital_cases, get_cum_deaths
         functions to get the required data to be returned to the HTML page
 
+        The local and national areas are requested at the same time. If one of them fails its values are shown as
+        unavailable, if both fail a ConnectionError is raised.
+
     Arguments:
 
         None
@@ -235,23 +470,240 @@ def covid_data_collector() -> tuple[str, str, int, int, str, str]:
 
         national_num_cases {int} : integer value containing the number of covid cases in the last complete 7 days in the national area
     """
-    #creates dictionary's from the local and national areas
-    local_dict = covid_API_request(config['location'], config['location_type'])
-    national_dict = covid_API_request(config['national_location'], 'nation')
+    local_area = (config['location'], config['location_type'])
+    national_area = (config['national_location'], 'nation')
 
+    #creates dictionary's from the local and national areas, only requesting the days which are used
+    area_dictionaries = covid_areas_collector([local_area, national_area], recent_days=config['covid_recent_days'])
+    local_dict = area_dictionaries[local_area]
+    national_dict = area_dictionaries[national_area]
+    if local_dict is None and national_dict is None:
+        raise ConnectionError('covid data could not be collected for any area')
+
+    return covid_data_from_dictionaries(local_dict, national_dict)
+
+
+def covid_data_from_dictionaries(local_dict:dict, national_dict:dict) -> tuple[str, str, int, int, str, str]:
+    """
+    Description:
+
+        Function which uses the: get_location, get_num_cases, get_hospital_cases, get_cum_deaths functions to get
+        the data returned to the HTML page from the local and national dictionaries. The values of an area
+        whose dictionary is None are shown as unavailable.
+
+    Arguments:
+
+        local_dict {dict} : dictionary returned from covid_API_request for the local area, or None
+
+        national_dict {dict} : dictionary returned from covid_API_request for the national area, or None
+
+    Returns:
+
+        {tuple} : the same data returned by the covid_data_collector function
+    """
     #gets local fields required to be put into the web page
-    local_location = get_location(local_dict)
-    local_num_cases = get_num_cases(local_dict)
+    if local_dict is not None:
+        local_location = get_location(local_dict)
+        local_num_cases = get_num_cases(local_dict)
+    else:
+        local_location = config['location']
+        local_num_cases = 'Unavailable'
 
     #gets national fields required to be put into web page
-    national_location = get_location(national_dict)
-    national_num_cases = get_num_cases(national_dict)
-    national_hospital_cases = 'Hospital Cases: '+ str(get_hospital_cases(national_dict))
-    national_cum_deaths = 'Total Deaths: '+ str(get_cum_deaths(national_dict))
+    if national_dict is not None:
+        national_location = get_location(national_dict)
+        national_num_cases = get_num_cases(national_dict)
+        national_hospital_cases = get_hospital_cases(national_dict)
+        national_cum_deaths = get_cum_deaths(national_dict)
+        # values which are empty in every held row (e.g. loaded from a series file) are shown as unavailable
+        national_hospital_cases = 'Hospital Cases: '+ ('Unavailable' if national_hospital_cases is None else str(national_hospital_cases))
+        national_cum_deaths = 'Total Deaths: '+ ('Unavailable' if national_cum_deaths is None else str(national_cum_deaths))
+    else:
+        national_location = config['national_location']
+        national_num_cases = 'Unavailable'
+        national_hospital_cases = 'Hospital Cases: Unavailable'
+        national_cum_deaths = 'Total Deaths: Unavailable'
 
     return local_location, national_location, local_num_cases, national_num_cases, national_hospital_cases, national_cum_deaths
 
 
+@timed('incremental_covid_data_collector')
+def incremental_covid_data_collector() -> tuple[str, str, int, int, str, str]:
+    """
+    Description:
+
+        Function which gets the same data as covid_data_collector, but only requests the days newer than the rows already
+        held for each area plus the days which are requested again (see days_to_request), as the api revises recent values.
+        The new rows are merged into the held rows with merge_covid_rows, replacing the revised rows, so the work done only
+        depends on the number of rows requested.
+
+        The held rows start from the binary series files saved by the last run. An area which fails to update keeps
+        using its held rows.
+
+    Arguments:
+
+        None
+
+    Returns:
+
+        {tuple} : the same data returned by the covid_data_collector function
+    """
+    from covid_series_cache import load_covid_dictionary
+
+    local_area = (config['location'], config['location_type'])
+    national_area = (config['national_location'], 'nation')
+    areas = [local_area, national_area]
+
+    with SERIES_LOCK:
+        for location, location_type in areas:
+            if (location, location_type) not in COVID_SERIES:
+                cached_dict = load_covid_dictionary(config['covid_cache_dir'], location, location_type, config['covid_recent_days'])
+                COVID_SERIES[(location, location_type)] = [] if cached_dict is None else cached_dict['data'][::-1]
+        recent_days = max(days_to_request(COVID_SERIES[area]) for area in areas)
+
+    logging.info('REQUESTING THE LAST %s DAYS OF COVID DATA', recent_days)
+    area_dictionaries = covid_areas_collector(areas, recent_days=recent_days)
+
+    held_dictionaries = {}
+    with SERIES_LOCK:
+        for area in areas:
+            if area_dictionaries[area] is not None:
+                merge_covid_rows(COVID_SERIES[area], area_dictionaries[area]['data'], config['covid_recent_days'])
+            if len(COVID_SERIES[area]) > 0:
+                # newest row first, like the dictionary returned from covid_API_request
+                held_dictionaries[area] = {'data' : COVID_SERIES[area][::-1], 'length' : len(COVID_SERIES[area])}
+            else:
+                held_dictionaries[area] = None
+
+    if held_dictionaries[local_area] is None and held_dictionaries[national_area] is None:
+        raise ConnectionError('covid data could not be collected for any area')
+    return covid_data_from_dictionaries(held_dictionaries[local_area], held_dictionaries[national_area])
+
+
+def days_to_request(held_rows:list) -> int:
+    """
+    Description:
+
+        Function which gets the number of recent days to request from the api to bring the held rows up to date.
+        Every row read for the HTML page (READ_ROWS) is requested again, even if 'covid_revision_days' is smaller,
+        so revised values replace the held ones. It limits the rows merged into the held rows, not the bytes downloaded,
+        see request_covid_pages
+
+    Arguments:
+
+        held_rows {list} : the rows held for an area, oldest row first
+
+    Returns:
+
+        {int} : the number of days since the newest held row plus 'covid_revision_days' (at least READ_ROWS),
+        or 'covid_recent_days' if no rows are held
+    """
+    if len(held_rows) == 0:
+        return config['covid_recent_days']
+    newest_date = date.fromisoformat(held_rows[-1]['date'])
+    days_since_newest = (date.today() - newest_date).days
+    return max(days_since_newest, 0) + max(config['covid_revision_days'], READ_ROWS)
+
+
+def merge_covid_rows(held_rows:list, new_rows:list, max_rows:int=None) -> list:
+    """
+    Description:
+
+        Function which merges rows returned from covid_API_request into the held rows of an area. Rows newer than the newest
+        held row are appended, rows for a date which is already held replace it (the api revises recent values) and rows
+        for an older date which isn't held (a day missing from the held rows) are inserted in date order.
+        Only the end of the held rows is searched, so the time taken depends on the number of new rows, not the held rows.
+
+    Arguments:
+
+        held_rows {list} : the rows held for an area, oldest row first. It is changed in place
+
+        new_rows {list} : the rows returned from covid_API_request, newest row first
+
+        max_rows {int} : if given, the oldest held rows are dropped so no more than this number are held
+
+    Returns:
+
+        held_rows {list} : the merged rows, oldest row first
+    """
+    for row in reversed(new_rows):
+        if len(held_rows) == 0 or row['date'] > held_rows[-1]['date']:
+            held_rows.append(row)
+            continue
+        # searches back from the newest held row for the row with the same date
+        x = len(held_rows) - 1
+        while x >= 0 and held_rows[x]['date'] > row['date']:
+            x = x - 1
+        if x >= 0 and held_rows[x]['date'] == row['date']:
+            held_rows[x] = row
+        else:
+            held_rows.insert(x + 1, row)
+
+    if max_rows is not None and len(held_rows) > max_rows:
+        del held_rows[:len(held_rows) - max_rows]
+    return held_rows
+
+
+def load_cached_covid_data() -> tuple[str, str, int, int, str, str]:
+    """
+    Description:
+
+        Function which gets the data returned to the HTML page from the binary series files saved by the last run,
+        without making any api requests. Used to show data straight away when the application starts.
+
+    Arguments:
+
+        None
+
+    Returns:
+
+        {tuple} : the same data returned by the covid_data_collector function, None if no area has been saved
+    """
+    from covid_series_cache import load_covid_dictionary
+
+    local_dict = load_covid_dictionary(config['covid_cache_dir'], config['location'], config['location_type'], config['covid_recent_days'])
+    national_dict = load_covid_dictionary(config['covid_cache_dir'], config['national_location'], 'nation', config['covid_recent_days'])
+    if local_dict is None and national_dict is None:
+        return None
+    return covid_data_from_dictionaries(local_dict, national_dict)
+
+
+def shared_covid_data_collector() -> tuple[str, str, int, int, str, str]:
+    """
+    Description:
+
+        Function which calls incremental_covid_data_collector, unless it is already running in another thread
+        (e.g. several updates scheduled for the same time), in which case it waits for and returns that call's data
+
+    Arguments:
+
+        None
+
+    Returns:
+
+        {tuple} : the same data returned by the covid_data_collector function
+    """
+    return COVID_FLIGHT.do('covid', incremental_covid_data_collector)
+
+
+def cached_covid_data_collector() -> tuple[str, str, int, int, str, str]:
+    """
+    Description:
+
+        Function which returns the last snapshot of the covid data instead of requesting it from the api.
+        Once the snapshot is older than 'covid_cache_ttl' seconds it is refreshed in the background.
+
+    Arguments:
+
+        None
+
+    Returns:
+
+        {tuple} : the same data returned by the covid_data_collector function
+    """
+    return COVID_SNAPSHOT.get()
+
+
 def schedule_covid_updates(update_interval:int, update_name:str) -> None:
     """
     Description:
@@ -269,7 +721,7 @@ def schedule_covid_updates(update_interval:int, update_name:str) -> None:
         None
     """
     #creating an instance of the schedular class
-    logging.info('update covid schedular function running for the next', update_interval, 'seconds')
+    logging.info('update covid schedular function running for the next %s seconds', update_interval)
 
     update_name = update_name+'covid'
     update_name = SCHEDULER.enter(update_interval, 1, update_covid, ()) #calls function to update covid data
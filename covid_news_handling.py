@@ -1,19 +1,33 @@
 """Module to proccess all news data returned from the news api"""
-import json
-import logging
-import requests
-from flask import Markup
+import threading
+from markupsafe import Markup
 import global_vars
+from article_store import ArticleStore, article_key
+from snapshot_cache import SnapshotCache
+from single_flight import SingleFlight
+from metrics import timed, UPSTREAM_BYTES
+from log_handling import setup_logging
+from app_config import load_config
 
-#sets up logging for this module
-FORMAT = '%(levelname)s: %(asctime)s: %(message)s'
-logging.basicConfig(filename='log_file.log', format=FORMAT, level=logging.INFO)
+# sets up logging for this module, written to the log file by the logging thread
+setup_logging()
 
-#sets up the config file for this module
-with open("config.json", encoding='utf8') as json_data_file:
-    config = json.load(json_data_file)
+#sets up the config file for this module, loaded once and shared by every module
+config = load_config()
 
+# snapshots of the news api responses, one for each set of search terms
+NEWS_SNAPSHOTS = {}
 
+# shares one news api request between callers requesting the same search terms at the same time
+NEWS_FLIGHT = SingleFlight('news')
+
+# keeps the connections to the news api open between requests, shared by every set of search terms.
+# It is made by news_session the first time the news is requested, so requests isn't imported when the application starts
+NEWS_SESSION = None
+SESSION_LOCK = threading.Lock()
+
+
+@timed('news_api_request')
 def news_API_request(covid_terms:str='Covid COVID-19 coronavirus') -> dict:
     """
     Description:
@@ -29,18 +43,103 @@ def news_API_request(covid_terms:str='Covid COVID-19 coronavirus') -> dict:
         news_dict {dict} : dictionary containing the news articles under the 'articles' key
     """
     # specifies the filters for returning the news
-    url = ('https://newsapi.org/v2/everything?'
-        'q=' + covid_terms + '&'
-        'from=2021-11-18&'
-        'sortBy=popularity&'
-        'apiKey='+config['news_api_key'])
-
-    # retrieves the dictionary from the API
-    news_dict = requests.get(url).json()
+    params = {
+            'q' : covid_terms,
+            'from' : '2021-11-18',
+            'sortBy' : 'popularity',
+            'apiKey' : config['news_api_key']
+            }
+
+    # retrieves the dictionary from the API, reusing an open connection from the session's pool
+    response = news_session().get(config['news_api_url'], params=params)
+    UPSTREAM_BYTES.inc('news', amount=len(response.content))
+    news_dict = response.json()
     return news_dict
 
 
-def update_news(articles:list=[], news_filter_terms:str='Covid COVID-19 coronavirus') -> list:
+def news_session() -> 'TimeoutSession':
+    """
+    Description:
+
+        Function which gets the pooled news api session, making it the first time it is needed
+
+    Arguments:
+
+        None
+
+    Returns:
+
+        NEWS_SESSION {TimeoutSession} : the requests session the news api requests are made through
+    """
+    global NEWS_SESSION
+    with SESSION_LOCK:
+        if NEWS_SESSION is None:
+            from http_session import make_session
+            NEWS_SESSION = make_session(config['news_pool_size'],
+                                        config['news_request_timeout'],
+                                        config['news_retries'],
+                                        config['news_retry_backoff'],
+                                        config['news_retry_jitter'])
+        return NEWS_SESSION
+
+
+def shared_news_API_request(covid_terms:str='Covid COVID-19 coronavirus') -> dict:
+    """
+    Description:
+
+        Function which calls news_API_request, unless a request for the same search terms is already running in
+        another thread, in which case it waits for and returns that request's response
+
+    Arguments:
+
+        covid_terms {str} : string containing the terms used as a filter when returning the news articles form the api
+
+    Returns:
+
+        news_dict {dict} : dictionary containing the news articles under the 'articles' key
+    """
+    return NEWS_FLIGHT.do(covid_terms, news_API_request, covid_terms)
+
+
+def cached_news_API_request(covid_terms:str='Covid COVID-19 coronavirus') -> dict:
+    """
+    Description:
+
+        Function which returns the last snapshot of the news api response for the search terms instead of requesting it.
+        Once the snapshot is older than 'news_cache_ttl' seconds it is refreshed in the background.
+
+    Arguments:
+
+        covid_terms {str} : string containing the terms used as a filter when returning the news articles form the api
+
+    Returns:
+
+        news_dict {dict} : dictionary containing the news articles under the 'articles' key
+    """
+    return news_snapshot(covid_terms).get()
+
+
+def news_snapshot(covid_terms:str='Covid COVID-19 coronavirus') -> SnapshotCache:
+    """
+    Description:
+
+        Function which gets the snapshot cache of the news api response for the search terms, making it the first time it is needed
+
+    Arguments:
+
+        covid_terms {str} : string containing the terms used as a filter when returning the news articles form the api
+
+    Returns:
+
+        {SnapshotCache} : the snapshot cache used by cached_news_API_request, its version changes when the response does
+    """
+    if covid_terms not in NEWS_SNAPSHOTS:
+        NEWS_SNAPSHOTS[covid_terms] = SnapshotCache(lambda: shared_news_API_request(covid_terms), config['news_cache_ttl'], 'news')
+    return NEWS_SNAPSHOTS[covid_terms]
+
+
+@timed('update_news')
+def update_news(articles:list=None, news_filter_terms:str='Covid COVID-19 coronavirus', use_cache:bool=False, cancel_token:threading.Event=None) -> list:
     """
     Description:
 
@@ -52,35 +151,94 @@ def update_news(articles:list=[], news_filter_terms:str='Covid COVID-19 coronavi
 
     Arguments:
 
-        articles {list} : list contaiing a list of dictionary's' (as described above)
+        articles {list} : list contaiing a list of dictionary's' (as described above), a new empty list if it is None
 
         news_filter_terms {str} : string containing the terms used as a filter when returning the news articles form the api
 
+        use_cache {bool} : if True the articles come from the cached_news_API_request snapshot instead of a new api request
+
+        cancel_token {threading.Event} : if it is set once the articles have been requested, the articles aren't changed
+
     Returns:
 
         articles {list} : list contaiing a list of dictionary's' (as described above). It has been updated.
     """
-    if articles == 'test':
+    if articles is None or articles == 'test':
         articles = []
+    news_list = news_articles_list(news_filter_terms, use_cache)
+    if cancel_token is not None and cancel_token.is_set():
+        return articles
+    return merge_news_articles(articles, news_list)
+
+
+@timed('news_articles_list')
+def news_articles_list(news_filter_terms:str='Covid COVID-19 coronavirus', use_cache:bool=False) -> list:
+    """
+    Description:
+
+        Function which gets the newest news articles from the news api, with the link to the article added to their content
+
+    Arguments:
+
+        news_filter_terms {str} : string containing the terms used as a filter when returning the news articles form the api
+
+        use_cache {bool} : if True the articles come from the cached_news_API_request snapshot instead of a new api request
+
+    Returns:
+
+        news_list {list} : list containing the news articles dictionaries
+    """
     # gets newest articles list from news api dictionary which is returned
-    news_list = news_API_request(news_filter_terms)['articles']
+    if use_cache:
+        news_dict = cached_news_API_request(news_filter_terms)
+    else:
+        news_dict = shared_news_API_request(news_filter_terms)
+    # copies each article so the links aren't added twice to an article in a cached response
+    news_list = [dict(article) for article in news_dict['articles']]
     # adds link to the url website
-    news_list = add_link(news_list)
-    # appends newsest articles from new api to the articles list before anything else
-    x = 0
-    for i in news_list:
-        article_dict = news_list[x]
+    return add_link(news_list)
+
 
+@timed('merge_news_articles')
+def merge_news_articles(articles:list, news_list:list) -> ArticleStore:
+    """
+    Description:
+
+        Function which appends the articles in news_list which aren't already held to a copy of the articles store.
+        The store given is returned unchanged if there are no new articles.
+        An article is already held if its url (or title if it has no url) is in the articles store or the global articles store
+        (including articles the user has dismissed and articles which were evicted), both are checked with their url index so the time taken doesn't grow with the number of articles held.
+
+    Arguments:
+
+        articles {list} : ArticleStore (or list, which is put into a new bounded ArticleStore) containing dictionary's with the 'seen' and 'articles' keys
+
+        news_list {list} : list containing the news articles dictionaries returned from the news api
+
+    Returns:
+
+        articles {ArticleStore} : the articles with the new articles appended, which need publishing with global_vars.update_articles
+    """
+    copied = not isinstance(articles, ArticleStore)
+    if copied:
+        articles = global_vars.new_article_store(articles)
+
+    for article_dict in news_list:
         # won't append any news articles which are already on the list
-        if find_article(article_dict['url']):
+        key = article_key(article_dict)
+        if articles.find_url(key) or find_article(key):
             continue
 
+        # the store given may be the published global store, so a copy is changed the first time an article is new
+        if not copied:
+            articles = articles.copy()
+            copied = True
+
         # adds dictionary to each list index
         articles.append({
                                     'seen' : 0,
                                     'articles': article_dict
                                 })
-        x = x + 1
     return articles
 
 
@@ -90,6 +248,8 @@ def find_article(url:str) -> bool:
 
         Function to see if an article is already present in the articles list. Used to get rid of repeat articles before being added to the global articles list
 
+        The url index of the global ArticleStore is used, so this doesn't scan the articles.
+
     Arguments:
 
         url {str} : string containing the url of an article, it is treated like a primary key in a database (unique identifier)
@@ -98,17 +258,7 @@ def find_article(url:str) -> bool:
 
         {bool} : True if the article is already present in the list
     """
-    articles = global_vars.retrieve_articles()
-    if len(articles) == 0:
-        # returns False if the list is empty (meaning that the update_news function is running for the first time)
-        return False
-
-    x = 0
-    for i in articles:
-        if url == articles[x]['articles']['url']:
-            return True
-        x = x + 1
-    return False
+    return global_vars.retrieve_articles().find_url(url)
 
 
 def news_dictionary_maker(articles_list:list) -> list:
@@ -127,11 +277,9 @@ def news_dictionary_maker(articles_list:list) -> list:
     """
     news_list = []
     # cycles through each news article and appends dictionary if article hasn't been seen before
-    x = 0
-    for i in articles_list:
-        if articles_list[x]['seen'] == 0:
-            news_list.append(articles_list[x]['articles'])
-        x = x + 1
+    for article in articles_list:
+        if article['seen'] == 0:
+            news_list.append(article['articles'])
 
     return news_list
 
@@ -142,6 +290,8 @@ def article_seen(article_title:str) -> list:
 
         Function to turn a certain article to seen if the user has clicked the 'x' on a news article.
 
+        The article is found with the title index of the global ArticleStore.
+
     Arguments:
 
         article_title {str} : string containing the title of an article the user has pressed 'x' on
@@ -150,14 +300,14 @@ def article_seen(article_title:str) -> list:
 
         articles {list} : list contaiing a list of dictionary's. The article the user pressed 'x' on has key 'seen' set to 1
     """
-    articles = global_vars.retrieve_articles()
-    # cycles through each article in the data structure, if it finds teh correct article, it changes the 'seen' key for that article to 1
-    x = 0
-    for i in articles:
-        if article_title == articles[x]['articles']['title']:
-            articles[x]['seen'] = 1
-        x = x + 1
-    return articles
+    def mark_seen(articles:ArticleStore) -> ArticleStore:
+        # the published articles are never changed, so a copy is changed and published
+        articles = articles.copy()
+        # finds the articles with the title in the title index and changes the 'seen' key for them to 1
+        articles.mark_seen(article_title)
+        return articles
+
+    return global_vars.change_articles(mark_seen)
 
 
 def add_link(news_list:list) -> list:
@@ -0,0 +1,285 @@
+"""Module to save covid api data in a compact binary file so it can be loaded again without an api request"""
+import json
+import logging
+import os
+import struct
+import threading
+import numpy as np
+
+# header of a series file: magic bytes, format version, length of the json area metadata and number of rows
+HEADER = struct.Struct('<4sHHQ')
+MAGIC = b'CVDS'
+VERSION = 1
+
+# every row is a fixed width record, empty values are stored as NULL
+SERIES_DTYPE = np.dtype([
+                        ('date', '<i4'), # days since 1970-01-01
+                        ('hospitalCases', '<i8'),
+                        ('newCasesByPublishDate', '<i8'),
+                        ('cumDeaths28DaysByDeathDate', '<i8')
+                        ])
+VALUE_FIELDS = SERIES_DTYPE.names[1:]
+NULL = -1
+
+# keys of the covid_API_request rows which are kept in the metadata instead of every row
+META_FIELDS = ('areaCode', 'areaName', 'areaType')
+
+# stops two threads appending to the same series file at once
+STORE_LOCK = threading.Lock()
+
+
+def series_cache_filename(cache_dir:str, location:str, location_type:str) -> str:
+    """
+    Description:
+
+        Function which gets the name of the file an area's series is saved in
+
+    Arguments:
+
+        cache_dir {str} : the folder the series files are kept in
+
+        location {str} : string value containing the name of the area
+
+        location_type {str} : string containing the type of location
+
+    Returns:
+
+        {str} : the path of the series file
+    """
+    safe_name = ''.join(character if character.isalnum() else '_' for character in location)
+    return os.path.join(cache_dir, location_type+'_'+safe_name+'.cvds')
+
+
+def series_from_dictionary(covid_data_dictionary:dict) -> np.ndarray:
+    """
+    Description:
+
+        Function which turns the rows of a dictionary returned from covid_API_request into a series,
+        sorted from the oldest to the newest date
+
+    Arguments:
+
+        covid_data_dictionary {dict} : dictionary containing the 'data' list of rows
+
+    Returns:
+
+        series {np.ndarray} : structured array with the SERIES_DTYPE fields
+    """
+    rows = covid_data_dictionary['data']
+    series = np.empty(len(rows), dtype=SERIES_DTYPE)
+    series['date'] = np.array([row['date'] for row in rows], dtype='datetime64[D]').astype(np.int32)
+    for field in VALUE_FIELDS:
+        series[field] = [NULL if row.get(field) is None else row[field] for row in rows]
+    return series[np.argsort(series['date'], kind='stable')]
+
+
+def dictionary_from_series(series:np.ndarray, meta:dict, max_rows:int=None) -> dict:
+    """
+    Description:
+
+        Function which turns a series back into a dictionary in the form returned from covid_API_request (newest row first),
+        so it can be used by get_num_cases, get_hospital_cases, get_cum_deaths and get_location
+
+    Arguments:
+
+        series {np.ndarray} : structured array with the SERIES_DTYPE fields, oldest row first
+
+        meta {dict} : dictionary containing the areaCode, areaName and areaType of the series
+
+        max_rows {int} : if given, only this number of the newest rows are included
+
+    Returns:
+
+        covid_data_dictionary {dict} : dictionary containing 'data', 'lastUpdate', 'length', 'totalPages'
+    """
+    newest_first = series[::-1][:max_rows]
+    dates = newest_first['date'].astype('datetime64[D]').astype(str).tolist()
+    columns = {field: newest_first[field].tolist() for field in VALUE_FIELDS}
+
+    data = []
+    for i, row_date in enumerate(dates):
+        row = {field: meta.get(field) for field in META_FIELDS}
+        row['date'] = row_date
+        for field in VALUE_FIELDS:
+            row[field] = None if columns[field][i] == NULL else columns[field][i]
+        data.append(row)
+
+    return {
+            'data' : data,
+            'lastUpdate' : meta.get('lastUpdate'),
+            'length' : len(data),
+            'totalPages' : None
+            }
+
+
+def save_series(filename:str, series:np.ndarray, meta:dict) -> None:
+    """
+    Description:
+
+        Function which writes a whole series file, replacing the file if it already exists
+
+    Arguments:
+
+        filename {str} : the path of the series file
+
+        series {np.ndarray} : structured array with the SERIES_DTYPE fields, oldest row first
+
+        meta {dict} : dictionary containing the areaCode, areaName and areaType of the series
+
+    Returns:
+
+        None
+    """
+    meta_bytes = json.dumps(meta).encode('utf8')
+    os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+    temporary_filename = filename+'.tmp'
+    with open(temporary_filename, 'wb') as series_file:
+        series_file.write(HEADER.pack(MAGIC, VERSION, len(meta_bytes), len(series)))
+        series_file.write(meta_bytes)
+        series_file.write(np.ascontiguousarray(series, dtype=SERIES_DTYPE).tobytes())
+    # replaces the old file in one step so a reader never sees half a file
+    os.replace(temporary_filename, filename)
+
+
+def load_series(filename:str) -> tuple[np.ndarray, dict]:
+    """
+    Description:
+
+        Function which reads a series file straight into a structured array
+
+    Arguments:
+
+        filename {str} : the path of the series file
+
+    Returns:
+
+        series {np.ndarray} : structured array with the SERIES_DTYPE fields, oldest row first
+
+        meta {dict} : dictionary containing the areaCode, areaName and areaType of the series
+
+        (None, None) is returned if the file is missing or isn't a valid series file
+    """
+    try:
+        with open(filename, 'rb') as series_file:
+            magic, version, meta_length, row_count = HEADER.unpack(series_file.read(HEADER.size))
+            if magic != MAGIC or version != VERSION:
+                logging.warning('SERIES FILE %s HAS AN UNKNOWN FORMAT', filename)
+                return None, None
+            meta = json.loads(series_file.read(meta_length).decode('utf8'))
+            series = np.fromfile(series_file, dtype=SERIES_DTYPE, count=row_count)
+    except (OSError, ValueError, struct.error):
+        return None, None
+    if len(series) != row_count:
+        logging.warning('SERIES FILE %s IS TRUNCATED', filename)
+        return None, None
+    return series, meta
+
+
+def append_series(filename:str, new_series:np.ndarray) -> int:
+    """
+    Description:
+
+        Function which saves the rows of new_series at the end of the series file. Saved rows from the oldest date
+        in new_series onwards are rewritten with the new rows merged in (the api revises recent values), and the rows
+        before it aren't read or rewritten
+
+    Arguments:
+
+        filename {str} : the path of an existing series file
+
+        new_series {np.ndarray} : structured array with the SERIES_DTYPE fields, oldest row first
+
+    Returns:
+
+        {int} : the number of rows added for dates which weren't saved before
+    """
+    if len(new_series) == 0:
+        return 0
+    with open(filename, 'r+b') as series_file:
+        magic, version, meta_length, row_count = HEADER.unpack(series_file.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError('unknown series file format')
+        records_start = HEADER.size + meta_length
+        # the saved rows are sorted by date, so the first row to rewrite is found without reading the others
+        start = row_count
+        if row_count > 0:
+            saved_dates = np.memmap(series_file, dtype=SERIES_DTYPE, mode='r', offset=records_start, shape=(row_count,))['date']
+            start = int(np.searchsorted(saved_dates, new_series['date'][0]))
+            del saved_dates
+        series_file.seek(records_start + start * SERIES_DTYPE.itemsize)
+        old_tail = np.fromfile(series_file, dtype=SERIES_DTYPE, count=row_count - start)
+
+        # the new rows replace the saved rows with the same date, saved dates missing from the new rows are kept
+        merged = np.concatenate([new_series, old_tail])
+        merged = merged[np.unique(merged['date'], return_index=True)[1]]
+
+        series_file.seek(records_start + start * SERIES_DTYPE.itemsize)
+        series_file.write(np.ascontiguousarray(merged, dtype=SERIES_DTYPE).tobytes())
+        # the row count is only updated once the rows are written
+        series_file.seek(0)
+        series_file.write(HEADER.pack(magic, version, meta_length, start + len(merged)))
+    return len(merged) - len(old_tail)
+
+
+def store_covid_dictionary(cache_dir:str, location:str, location_type:str, covid_data_dictionary:dict) -> None:
+    """
+    Description:
+
+        Function which saves the rows of a dictionary returned from covid_API_request in the area's series file.
+        If the file already exists only the saved rows from the oldest returned day onwards are rewritten, see append_series
+
+    Arguments:
+
+        cache_dir {str} : the folder the series files are kept in
+
+        location {str} : string value containing the name of the area
+
+        location_type {str} : string containing the type of location
+
+        covid_data_dictionary {dict} : dictionary containing the 'data' list of rows
+
+    Returns:
+
+        None
+    """
+    if len(covid_data_dictionary['data']) == 0:
+        return
+    filename = series_cache_filename(cache_dir, location, location_type)
+    series = series_from_dictionary(covid_data_dictionary)
+
+    with STORE_LOCK:
+        if os.path.exists(filename):
+            try:
+                append_series(filename, series)
+                return
+            except (OSError, ValueError, struct.error):
+                logging.warning('SERIES FILE %s COULD NOT BE APPENDED TO, REWRITING IT', filename)
+        meta = {field: covid_data_dictionary['data'][0].get(field) for field in META_FIELDS}
+        save_series(filename, series, meta)
+
+
+def load_covid_dictionary(cache_dir:str, location:str, location_type:str, max_rows:int=None) -> dict:
+    """
+    Description:
+
+        Function which loads an area's series file as a dictionary in the form returned from covid_API_request
+
+    Arguments:
+
+        cache_dir {str} : the folder the series files are kept in
+
+        location {str} : string value containing the name of the area
+
+        location_type {str} : string containing the type of location
+
+        max_rows {int} : if given, only this number of the newest rows are included
+
+    Returns:
+
+        covid_data_dictionary {dict} : dictionary containing 'data', 'lastUpdate', 'length', 'totalPages',
+        None if the area hasn't been saved
+    """
+    series, meta = load_series(series_cache_filename(cache_dir, location, location_type))
+    if series is None or len(series) == 0:
+        return None
+    return dictionary_from_series(series, meta, max_rows)
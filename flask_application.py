@@ -1,25 +1,70 @@
 """Module to interact with the HTML user interface"""
 import logging
-from flask import Flask, request
+import hmac
+import itertools
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from flask import Flask, request, Response, stream_with_context, jsonify
+from markupsafe import Markup
+from werkzeug.http import is_resource_modified
 from flask.templating import render_template
-from covid_data_handler import covid_data_collector
-from covid_news_handling import update_news
+from covid_data_handler import cached_covid_data_collector
+from covid_data_handler import COVID_SNAPSHOT
+from covid_data_handler import load_cached_covid_data
+from covid_data_handler import COVID_FLIGHT
+from covid_news_handling import news_articles_list
+from covid_news_handling import merge_news_articles
 from covid_news_handling import news_dictionary_maker
 from covid_news_handling import article_seen
+from covid_news_handling import NEWS_SNAPSHOTS
+from covid_news_handling import NEWS_FLIGHT
+from covid_news_handling import news_snapshot
 import global_vars
+from fragment_cache import FragmentCache, ENCODINGS
+from metrics import REGISTRY, timed
+from profiler import profile, memory_growth, ProfilerBusy
 from scheduler import get_interval
 from scheduler import append_updates_list
 from scheduler import name_in_use
 from scheduler import remove_update
-from scheduler import find_dictionary_key
+from scheduler import restore_updates
+from scheduler import SCHEDULER
+from log_handling import setup_logging
+from app_config import load_config
 
-# sets up logging for this module
-FORMAT = '%(levelname)s: %(asctime)s: %(message)s'
-logging.basicConfig(filename='log_file.log', format=FORMAT, level=logging.INFO)
+# sets up logging for this module, written to the log file by the logging thread
+setup_logging()
+
+#sets up the config file for this module, loaded once and shared by every module
+config = load_config()
 
 # sets all of the global variables to empty lists
 global_vars.set_global_vars()
 
+# shows the covid data saved by the last run straight away, it is refreshed on the first page load
+CACHED_COVID_DATA = load_cached_covid_data()
+if CACHED_COVID_DATA is not None:
+    global_vars.update_covid_data_list(CACHED_COVID_DATA)
+    COVID_SNAPSHOT.put(CACHED_COVID_DATA, age=COVID_SNAPSHOT.ttl)
+
+# rendered parts of the HTML page, kept until the data they are rendered from changes
+FRAGMENT_CACHE = FragmentCache()
+
+# the versions of the news snapshot and of the articles it was last merged into by index, so the same news isn't merged again
+MERGED_NEWS = None
+
+# seconds between the comments sent to keep a change stream open while nothing changes
+STREAM_KEEPALIVE = 15
+
+# each change stream holds a request thread while it is open, so only 'stream_max_clients' can be open at once
+STREAM_SLOTS = threading.BoundedSemaphore(config['stream_max_clients'])
+
+# put in the ETags of the JSON responses, as the versions start again at 0 in every process, so an ETag sent by an
+# earlier run (or another worker process) never matches data with the same version number
+BOOT_ID = uuid.uuid4().hex
+
 # sets up the flask application
 app = Flask(__name__)
 
@@ -28,58 +73,41 @@ def index() -> str:
     """
     Description:
 
-        Function which gathers the required data to be rendered on the HTML interface with the render_template function.
+        Function which gathers the required data to be rendered on the HTML interface.
+
+        The covid and news data comes from the cached snapshots, so loading the page only makes api requests
+        when there is no snapshot yet (the snapshots are refreshed in the background once they are too old).
 
     Arguments:
 
         None
 
-    Returns in render_template function:
-
-        'COVID-19 Tracker' {str} : string containing Title displayed on HTML
-
-        covid_data_list[0] {str} : string containing the local location displayed on HTML
-
-        covid_data_list[1] {str} : string containing national location displayed on HTML
-
-        covid_data_list[2] {str} : string containing local 7 day infection rateisplayed on HTML
-
-        covid_data_list[3] {str} : string containing national 7 day infection rate displayed on HTML
-
-        covid_data_list[4] {str} : string containing national current hospital cases displayed on HTML
-
-        covid_data_list[5] {str} : string containing the total cumulative deaths displayed on HTML
-
-        news_articles[0:4] {list} : list containing the first 4 items in a list of the news articles
-
-        '/static/images/shark.gif' {str} : string containing the file location of a picture used as the favicon
+    Returns:
 
-        'shark.gif' {str} : string containing the file location of a picture used as the icon
+        {Response} : the HTML page from page_response, assembled from the cached covid statistics, news headlines
+        and scheduled updates fragments
     """
 
     logging.info('LOADED: index()')
 
     # collects all data to do with covid data
-    global_vars.update_covid_data_list(covid_data_collector())
-    covid_data_list = global_vars.retrieve_covid_data_list()
+    global_vars.update_covid_data_list(cached_covid_data_collector())
 
-    # puts all news articles in articles list
-    global_vars.update_articles(update_news())
-    # creates news list to be put on html
-    news_articles = news_dictionary_maker(global_vars.retrieve_articles())
+    # puts all news articles in articles list, unless the same news snapshot was already merged into the same articles
+    global MERGED_NEWS
+    # the version is taken before the news is got, so a snapshot refreshed in between is merged by the next request too
+    news_version = news_snapshot().version
+    if MERGED_NEWS != (news_version, global_vars.retrieve_version('articles')[0]):
+        news_list = news_articles_list(use_cache=True)
+        global_vars.change_articles(lambda articles: merge_news_articles(articles, news_list))
+        MERGED_NEWS = (news_version, global_vars.retrieve_version('articles')[0])
 
-    return render_template('index.html',
-                            title='COVID-19 Tracker',
-                            location=covid_data_list[0],
-                            nation_location=covid_data_list[1],
-                            local_7day_infections=covid_data_list[2],
-                            national_7day_infections=covid_data_list[3],
-                            hospital_cases=covid_data_list[4],
-                            deaths_total=covid_data_list[5],
-                            news_articles=news_articles[0:4],
-                            favicon='/static/images/shark.gif',
-                            image='shark.gif'
-                        )
+    # the stats are only collected if they are logged
+    if logging.getLogger().isEnabledFor(logging.INFO):
+        logging.info('SNAPSHOT CACHE STATS: %s', [COVID_SNAPSHOT.stats()] + [cache.stats() for cache in NEWS_SNAPSHOTS.values()])
+        logging.info('SINGLE FLIGHT STATS: %s', [COVID_FLIGHT.stats(), NEWS_FLIGHT.stats()])
+
+    return page_response()
 
 
 @app.route('/index', methods = ['GET'])
@@ -87,7 +115,7 @@ def index2() -> str:
     """
     Description:
 
-        Function which gathers the required data to be rendered on the HTML interface with the render_template function.
+        Function which returns the HTML interface.
 
         And also gets the outputs from interface interactions (scheduling updates)
 
@@ -95,27 +123,10 @@ def index2() -> str:
 
         None
 
-    Returns in render_template function:
-
-        'COVID-19 Tracker' {str} : string containing Title displayed on HTML
-
-        covid_data_list[0] {str} : string containing the local location displayed on HTML
-
-        covid_data_list[1] {str} : string containing national location displayed on HTML
-
-        covid_data_list[2] {str} : string containing local 7 day infection rateisplayed on HTML
-
-        covid_data_list[3] {str} : string containing national 7 day infection rate displayed on HTML
-
-        covid_data_list[4] {str} : string containing national current hospital cases displayed on HTML
-
-        covid_data_list[5] {str} : string containing the total cumulative deaths displayed on HTML
-
-        news_articles[0:4] {list} : list containing the first 4 items in a list of the news articles
-
-        '/static/images/shark.gif' {str} : string containing the file location of a picture used as the favicon
+    Returns:
 
-        'shark.gif' {str} : string containing the file location of a picture used as the icon
+        {Response} : the HTML page from page_response, assembled from the cached covid statistics, news headlines
+        and scheduled updates fragments
     """
 
     logging.info('LOADED: index2() ')
@@ -124,15 +135,6 @@ def index2() -> str:
     news_delete_request()
     update_delete_request()
 
-    # collects all data to do with covid data
-    covid_data_list = global_vars.retrieve_covid_data_list()
-
-    # creates news list to be put on html
-    news_articles = news_dictionary_maker(global_vars.retrieve_articles())
-
-    # retrieves update list to put in html
-    update_list = global_vars.retrieve_updates()
-
     # scheduling
     # name of the update
     if request.args.get('two'):
@@ -189,21 +191,394 @@ def index2() -> str:
             append_updates_list(update_type, repeat, update_name, update_time, seconds_until_update)
 
 
+    return page_response()
+
+
+@app.route('/api/covid')
+def api_covid() -> Response:
+    """
+    Description:
+
+        Function which returns the global covid data list as JSON, using the same names as the HTML page
+
+    Arguments:
+
+        None
+
+    Returns:
+
+        {Response} : JSON response, or an empty 304 response if the client already has this version
+    """
+    def covid_data() -> dict:
+        covid_data_list = global_vars.retrieve_covid_data_list()
+        if len(covid_data_list) != 6:
+            return {}
+        return {
+                'location' : covid_data_list[0],
+                'nation_location' : covid_data_list[1],
+                'local_7day_infections' : covid_data_list[2],
+                'national_7day_infections' : covid_data_list[3],
+                'hospital_cases' : covid_data_list[4],
+                'deaths_total' : covid_data_list[5]
+                }
+    return versioned_json_response('covid_data_list', covid_data)
+
+
+@app.route('/api/news')
+def api_news() -> Response:
+    """
+    Description:
+
+        Function which returns the news articles which haven't been seen as JSON
+
+    Arguments:
+
+        None
+
+    Returns:
+
+        {Response} : JSON response, or an empty 304 response if the client already has this version
+    """
+    return versioned_json_response('articles', lambda: news_dictionary_maker(global_vars.retrieve_articles()))
+
+
+@app.route('/api/updates')
+def api_updates() -> Response:
+    """
+    Description:
+
+        Function which returns the scheduled updates as JSON
+
+    Arguments:
+
+        None
+
+    Returns:
+
+        {Response} : JSON response, or an empty 304 response if the client already has this version
+    """
+    return versioned_json_response('updates', lambda: global_vars.retrieve_updates().listing())
+
+
+@app.route('/metrics')
+def metrics() -> Response:
+    """
+    Description:
+
+        Function which returns the metrics of the application (latency histograms of the hot paths, bytes downloaded
+        from the apis, cache hit ratios, article and update counts and the number of threads) in the Prometheus text format
+
+    Arguments:
+
+        None
+
+    Returns:
+
+        {Response} : the metrics as text/plain, for Prometheus to scrape
+    """
+    return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+
+@app.route('/debug/profile')
+def debug_profile() -> Response:
+    """
+    Description:
+
+        Function which samples the stacks of every thread (request threads, the scheduler thread and its job threads)
+        for ?seconds=N seconds and returns them as collapsed stacks (for a flame graph), or with ?format=top as a table
+        of the functions seen most often. Only available when 'debug_profiling' is set in the config
+
+    Arguments:
+
+        None
+
+    Returns:
+
+        {Response} : the profile as text/plain
+    """
+    return debug_response(lambda seconds: profile(seconds, request.args.get('format', 'collapsed')))
+
+
+@app.route('/debug/memory')
+def debug_memory() -> Response:
+    """
+    Description:
+
+        Function which traces the memory allocated for ?seconds=N seconds and returns the lines whose allocations grew
+        the most, grouped by traceback with ?frames=N. Only available when 'debug_profiling' is set in the config
+
+    Arguments:
+
+        None
+
+    Returns:
+
+        {Response} : the memory growth as text/plain
+    """
+    frames = request.args.get('frames', 1, type=int)
+    return debug_response(lambda seconds: memory_growth(seconds, frames=max(1, min(frames, 50))))
+
+
+def debug_response(run) -> Response:
+    """
+    Description:
+
+        Function which checks a debug request is allowed and runs it for the requested number of seconds. The pages are
+        not found unless 'debug_profiling' is set, and need ?token= to match 'debug_token'. They are forbidden while
+        'debug_token' is empty, so turning profiling on doesn't open them to anyone who can reach the server
+
+    Arguments:
+
+        run {function} : function which is given the number of seconds and returns the text of the response
+
+    Returns:
+
+        {Response} : the text returned by run, or an error response
+    """
+    if not config['debug_profiling']:
+        return Response('Not Found\n', status=404, mimetype='text/plain')
+    if not config['debug_token']:
+        return Response('Forbidden, debug_token must be set to use the debug pages\n', status=403, mimetype='text/plain')
+    if not hmac.compare_digest(request.args.get('token', ''), config['debug_token']):
+        return Response('Forbidden\n', status=403, mimetype='text/plain')
+
+    seconds = request.args.get('seconds', 10, type=float)
+    if not 0 < seconds <= config['debug_max_seconds']:
+        return Response('seconds must be between 0 and '+str(config['debug_max_seconds'])+'\n', status=400, mimetype='text/plain')
+    try:
+        text = run(seconds)
+    except ProfilerBusy:
+        return Response('a profile is already running\n', status=409, mimetype='text/plain')
+    logging.info('PROFILED FOR %s SECONDS: %s', seconds, request.path)
+    return Response(text, mimetype='text/plain')
+
+
+def versioned_json_response(name:str, make_data) -> Response:
+    """
+    Description:
+
+        Function which makes a JSON response for a global variable with a strong ETag made from the BOOT_ID and its version and a
+        Last-Modified header from the time it last changed. If the request's If-None-Match (or If-Modified-Since)
+        header shows the client already has this version, an empty 304 response is returned without making the JSON.
+
+    Arguments:
+
+        name {str} : the name of the global variable, 'articles', 'covid_data_list' or 'updates'
+
+        make_data {function} : function which returns the data to send as JSON
+
+    Returns:
+
+        {Response} : the JSON response or the 304 response
+    """
+    # the version is read before the data, so the ETag is never newer than the data sent with it
+    version, changed_at = global_vars.retrieve_version(name)
+    etag = name+'-'+BOOT_ID+'-'+str(version)
+    last_modified = datetime.fromtimestamp(int(changed_at), timezone.utc)
+
+    if is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        response = jsonify(make_data())
+    else:
+        response = Response(status=304)
+    response.set_etag(etag)
+    response.last_modified = last_modified
+    # the client has to check the version every time, which only costs a header comparison
+    response.cache_control.no_cache = True
+    return response
+
+
+@app.route('/stream')
+def stream() -> Response:
+    """
+    Description:
+
+        Function which streams server-sent events to the HTML page when the covid data, news articles or updates change,
+        so the page replaces the part which changed instead of reloading
+
+    Arguments:
+
+        None
+
+    Returns:
+
+        {Response} : 'text/event-stream' response made from the change_events generator, which ends after
+        'stream_max_seconds' so the page reconnects. 503 Service Unavailable if 'stream_max_clients' streams are already open
+    """
+    logging.info('LOADED: stream()')
+    if not STREAM_SLOTS.acquire(blocking=False):
+        logging.warning('STREAM REFUSED, %s STREAMS ARE ALREADY OPEN', config['stream_max_clients'])
+        return Response('too many streams are open\n', status=503, mimetype='text/plain', headers={'Retry-After' : str(STREAM_KEEPALIVE)})
+    # the first line is sent straight away, so the headers aren't held back until the first change or keep-alive,
+    # and tells the page to reconnect after a second when the stream ends
+    events = itertools.chain(['retry: 1000\n\n'], change_events(global_vars.retrieve_versions(), config['stream_max_seconds']))
+    response = Response(stream_with_context(events), mimetype='text/event-stream', headers={'Cache-Control' : 'no-cache'})
+    # the slot is given back when the response is closed, whether the stream ended or the client went away
+    response.call_on_close(STREAM_SLOTS.release)
+    return response
+
+
+def change_events(versions:dict=None, max_seconds:float=None):
+    """
+    Description:
+
+        Generator which waits for the global variables to change and yields a server-sent event for each part of the
+        page which changed, containing the part rendered again. Only the changed parts are sent.
+
+    Arguments:
+
+        versions {dict} : the versions of the global variables already shown, the current versions if None
+
+        max_seconds {float} : if given, the generator ends after this number of seconds (the page's EventSource then
+        reconnects), so a stream whose client has gone away doesn't hold its thread for long
+
+    Returns:
+
+        {str} : server-sent events, or a comment every STREAM_KEEPALIVE seconds while nothing changes
+    """
+    if versions is None:
+        versions = global_vars.retrieve_versions()
+    end_at = None if max_seconds is None else time.monotonic() + max_seconds
+
+    while True:
+        timeout = STREAM_KEEPALIVE
+        if end_at is not None:
+            timeout = max(min(timeout, end_at - time.monotonic()), 0)
+        new_versions = global_vars.wait_for_change(versions, timeout)
+        if new_versions == versions:
+            if end_at is not None and time.monotonic() >= end_at:
+                return
+            yield ': keep-alive\n\n'
+            continue
+
+        # the parts are taken from the FRAGMENT_CACHE, so they are rendered once for all of the streams
+        for name, (data_name, render) in FRAGMENTS.items():
+            if new_versions[data_name] != versions[data_name]:
+                yield server_sent_event(name, cached_fragment(name, new_versions), new_versions[data_name])
+        versions = new_versions
+
+
+def server_sent_event(event:str, data:str, event_id:int) -> str:
+    """
+    Description:
+
+        Function which formats a server-sent event
+
+    Arguments:
+
+        event {str} : the name of the event
+
+        data {str} : the data of the event, which can be more than one line
+
+        event_id {int} : the id of the event
+
+    Returns:
+
+        {str} : the event in the text/event-stream format
+    """
+    data_lines = ''.join('data: '+line+'\n' for line in data.split('\n'))
+    return 'event: '+event+'\nid: '+str(event_id)+'\n'+data_lines+'\n'
+
+
+def page_response() -> Response:
+    """
+    Description:
+
+        Function which makes the response for the HTML page. The page is taken from the FRAGMENT_CACHE, so it is only
+        rendered again when the covid data, articles or updates have changed, and the compressed variant the browser
+        accepts is sent without compressing the page again
+
+    Arguments:
+
+        None
+
+    Returns:
+
+        {Response} : the HTML page response
+    """
+    versions = global_vars.retrieve_versions()
+    variants = FRAGMENT_CACHE.page((versions['covid_data_list'], versions['articles'], versions['updates']), lambda: render_page(versions))
+
+    encoding = request.accept_encodings.best_match(ENCODINGS + ('identity',), default='identity')
+    response = Response(variants[encoding], mimetype='text/html')
+    if encoding != 'identity':
+        response.content_encoding = encoding
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+@timed('render_page')
+def render_page(versions:dict) -> str:
+    """
+    Description:
+
+        Function which renders the HTML page from the cached fragments
+
+    Arguments:
+
+        versions {dict} : the versions of the global variables, returned by global_vars.retrieve_versions
+
+    Returns:
+
+        {str} : the HTML page
+    """
     return render_template('index.html',
                             title='COVID-19 Tracker',
+                            covid_stats=Markup(cached_fragment('covid_stats', versions)),
+                            news=Markup(cached_fragment('news', versions)),
+                            updates=Markup(cached_fragment('updates', versions)),
+                            favicon='/static/images/shark.gif',
+                            image='shark.gif'
+                        )
+
+
+def cached_fragment(name:str, versions:dict) -> str:
+    """
+    Description:
+
+        Function which gets a part of the page from the FRAGMENT_CACHE, rendering it if its data has changed
+
+    Arguments:
+
+        name {str} : 'covid_stats', 'news' or 'updates'
+
+        versions {dict} : the versions of the global variables, returned by global_vars.retrieve_versions
+
+    Returns:
+
+        {str} : the rendered part of the page
+    """
+    data_name, render = FRAGMENTS[name]
+    return FRAGMENT_CACHE.fragment(name, versions[data_name], render)
+
+
+@timed('render_covid_stats')
+def render_covid_stats() -> str:
+    """Renders the covid statistics part of the page from the global covid data list."""
+    covid_data_list = global_vars.retrieve_covid_data_list()
+    if len(covid_data_list) != 6:
+        return ''
+    return render_template('covid_stats.html',
                             location=covid_data_list[0],
                             nation_location=covid_data_list[1],
                             local_7day_infections=covid_data_list[2],
                             national_7day_infections=covid_data_list[3],
                             hospital_cases=covid_data_list[4],
-                            deaths_total=covid_data_list[5],
-                            news_articles=news_articles[0:4],
-                            updates=update_list,
-                            favicon='/static/images/shark.gif',
-                            image='shark.gif'
+                            deaths_total=covid_data_list[5]
                         )
 
 
+@timed('render_news')
+def render_news() -> str:
+    """Renders the news headlines part of the page from the global articles."""
+    return render_template('news.html', news_articles=news_dictionary_maker(global_vars.retrieve_articles())[0:4])
+
+
+@timed('render_updates')
+def render_updates() -> str:
+    """Renders the scheduled updates part of the page from the global updates registry."""
+    return render_template('updates.html', updates=global_vars.retrieve_updates().listing())
+
+
 def news_delete_request() -> None:
     """
     Description:
@@ -224,18 +599,17 @@ def news_delete_request() -> None:
         # getting input with notif = news article title in HTML form
         news_title = request.args.get('notif')
 
-        # adds new news
-        global_vars.update_articles(article_seen(news_title))
+        # marks the article as seen and publishes the articles
+        article_seen(news_title)
 
-        log = 'REMOVED NEWS ARTICLE:', news_title
-        logging.info(log)
+        logging.info('REMOVED NEWS ARTICLE: %s', news_title)
 
 
 def update_delete_request() -> None:
     """
     Description:
 
-        Function to remove updates form the global updates list. When the 'x' is pressed on the updates, the update is removed from the global updates list.
+        Function to remove updates form the global updates registry. When the 'x' is pressed on the updates, the update is removed from the global updates registry.
 
     Arguments:
 
@@ -248,17 +622,101 @@ def update_delete_request() -> None:
     if request.args.get('update_item'):
         # gets name of the update to be removed
         update_name = request.args.get('update_item')
-        update_time = find_dictionary_key(update_name, 'title', 'update_time', global_vars.retrieve_updates())
+        update = global_vars.retrieve_updates().get(update_name)
+        update_time = update['update_time'] if update is not None else None
+
+        remove_update(update_name, global_vars.retrieve_updates())
+
+        logging.info('REMOVED UPDATE: %s at %s', update_name, update_time)
+
 
-        global_vars.update_updates(remove_update(update_name, global_vars.retrieve_updates()))
- 
-        if global_vars.retrieve_updates() == None:
-            global_vars.update_updates([])
+# the name of the global variable each part of the page is rendered from, and the function which renders it
+FRAGMENTS = {
+            'covid_stats' : ('covid_data_list', render_covid_stats),
+            'news' : ('articles', render_news),
+            'updates' : ('updates', render_updates)
+            }
 
-        log = 'REMOVED UPDATE:', update_name, 'at', update_time
-        logging.info(log)
+
+def cache_requests() -> dict:
+    """
+    Description:
+
+        Function which gets the hit and miss counters of the covid and news snapshots and the page cache
+
+    Arguments:
+
+        None
+
+    Returns:
+
+        {dict} : the counters keyed by (cache, result)
+    """
+    counts = {}
+    snapshots = [('covid_snapshot', COVID_SNAPSHOT.stats())] + [('news_snapshot', cache.stats()) for cache in list(NEWS_SNAPSHOTS.values())]
+    for cache, stats in snapshots:
+        for result in ('hits', 'stale_hits', 'misses'):
+            counts[(cache, result)] = counts.get((cache, result), 0) + stats[result]
+    page_stats = FRAGMENT_CACHE.stats()
+    counts[('page', 'hits')] = page_stats['hits']
+    counts[('page', 'misses')] = page_stats['misses']
+    return counts
+
+
+def cache_hit_ratios() -> dict:
+    """
+    Description:
+
+        Function which gets the share of requests answered from each cache (stale snapshots count as hits)
+
+    Arguments:
+
+        None
+
+    Returns:
+
+        {dict} : the hit ratios keyed by (cache,), caches which haven't been used yet are left out
+    """
+    totals = {}
+    hits = {}
+    for (cache, result), count in cache_requests().items():
+        totals[cache] = totals.get(cache, 0) + count
+        if result != 'misses':
+            hits[cache] = hits.get(cache, 0) + count
+    return {(cache,) : hits.get(cache, 0) / total for cache, total in totals.items() if total > 0}
+
+
+def single_flight_calls() -> dict:
+    """Gets the api requests issued and the requests which shared another's response, keyed by (flight, result)."""
+    calls = {}
+    for stats in (COVID_FLIGHT.stats(), NEWS_FLIGHT.stats()):
+        calls[(stats['name'], 'issued')] = stats['issued']
+        calls[(stats['name'], 'coalesced')] = stats['coalesced']
+    return calls
+
+
+def article_counts() -> dict:
+    """Gets the number of articles held and the number of them which have been seen, keyed by (state,)."""
+    stats = global_vars.retrieve_articles().stats()
+    return {('all',) : stats['articles'], ('seen',) : stats['seen']}
+
+
+# the metrics read from the application each time the /metrics page is loaded
+REGISTRY.callback('covid_dashboard_cache_requests_total', 'Requests for cached data by cache and result.', 'counter',
+                    cache_requests, ('cache', 'result'))
+REGISTRY.callback('covid_dashboard_cache_hit_ratio', 'Share of the requests for cached data answered from the cache.', 'gauge',
+                    cache_hit_ratios, ('cache',))
+REGISTRY.callback('covid_dashboard_single_flight_calls_total', 'Api requests issued and requests which shared a running request.', 'counter',
+                    single_flight_calls, ('flight', 'result'))
+REGISTRY.callback('covid_dashboard_articles', 'News articles held, all of them and the seen ones.', 'gauge',
+                    article_counts, ('state',))
+REGISTRY.callback('covid_dashboard_updates', 'Scheduled updates.', 'gauge', lambda: len(global_vars.retrieve_updates()))
+REGISTRY.callback('covid_dashboard_scheduled_events', 'Events waiting in the scheduler.', 'gauge', lambda: len(SCHEDULER.queue))
+REGISTRY.callback('covid_dashboard_threads', 'Live threads.', 'gauge', threading.active_count)
 
 
 # runs the flask application
 if __name__ == '__main__':
+    # schedules the updates saved by the last run again, when the application is run rather than imported (e.g. by the tests)
+    restore_updates()
     app.run()
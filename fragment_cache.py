@@ -0,0 +1,128 @@
+"""Module used to cache the rendered parts of the HTML page until the data they are rendered from changes"""
+import gzip
+import threading
+
+# brotli is optional, pages are only compressed with gzip without it
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# content encodings the page is precompressed with, best first
+ENCODINGS = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+class FragmentCache:
+    """
+    The rendered parts (fragments) of the HTML page, each kept with the version of the data it was rendered from,
+    and the whole page, kept with the versions of all of its fragments along with its compressed variants.
+
+    A fragment is only rendered again when the version of its data changes, and the page is only assembled and
+    compressed again when the version of one of its fragments changes. Only the newest version of each is kept.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._fragments = {}
+        self._page = None
+
+        # counters used to check how often the page is rendered
+        self.hits = 0
+        self.misses = 0
+
+    def fragment(self, name:str, version:any, render) -> str:
+        """
+        Description:
+
+            Function which gets a rendered fragment, rendering it if the version of its data has changed
+
+        Arguments:
+
+            name {str} : the name of the fragment
+
+            version {any} : the version of the data the fragment is rendered from
+
+            render {function} : function which renders the fragment
+
+        Returns:
+
+            {str} : the rendered fragment
+        """
+        with self._lock:
+            cached = self._fragments.get(name)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        text = render()
+        with self._lock:
+            self._fragments[name] = (version, text)
+        return text
+
+    def page(self, versions:tuple, assemble) -> dict:
+        """
+        Description:
+
+            Function which gets the page and its compressed variants, assembling the page if the versions have changed
+
+        Arguments:
+
+            versions {tuple} : the versions of the data the page's fragments are rendered from
+
+            assemble {function} : function which assembles the page from its fragments
+
+        Returns:
+
+            {dict} : dictionary with the page encoded as utf8 under the 'identity' key and each of the
+            compressed variants under its content encoding ('gzip', 'br')
+        """
+        with self._lock:
+            cached = self._page
+            if cached is not None and cached[0] == versions:
+                self.hits = self.hits + 1
+                return cached[1]
+            self.misses = self.misses + 1
+
+        variants = compressed_variants(assemble().encode('utf8'))
+        with self._lock:
+            self._page = (versions, variants)
+        return variants
+
+    def stats(self) -> dict:
+        """
+        Description:
+
+            Function which gets the hit and miss counters of the page
+
+        Arguments:
+
+            None
+
+        Returns:
+
+            stats {dict} : dictionary containing the counters of the cache
+        """
+        with self._lock:
+            return {
+                    'hits' : self.hits,
+                    'misses' : self.misses,
+                    'fragments' : len(self._fragments)
+                    }
+
+
+def compressed_variants(body:bytes) -> dict:
+    """
+    Description:
+
+        Function which compresses a response body with each of the ENCODINGS
+
+    Arguments:
+
+        body {bytes} : the uncompressed body
+
+    Returns:
+
+        {dict} : dictionary with the body under the 'identity' key and the compressed bodies under their content encoding
+    """
+    variants = {'identity' : body, 'gzip' : gzip.compress(body, compresslevel=6)}
+    if brotli is not None:
+        variants['br'] = brotli.compress(body, quality=5)
+    return variants
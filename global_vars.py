@@ -1,7 +1,19 @@
 """Module used to set, update and retrieve the global articles"""
-ARTICLES = []
-COVID_DATA_LIST = []
-UPDATES = []
+from article_store import ArticleStore
+from update_registry import UpdateRegistry
+from state_store import StateStore
+from app_config import load_config
+
+#sets up the config file for this module, loaded once and shared by every module
+config = load_config()
+
+# the global variables, published as immutable snapshots so request and scheduler threads can read them without locks.
+# A published value is never changed, the update functions publish a new value (or a changed copy) instead
+STATE = StateStore({
+                    'articles' : ArticleStore(max_count=config['max_articles'], max_bytes=config['max_article_bytes']),
+                    'covid_data_list' : [],
+                    'updates' : UpdateRegistry()
+                    })
 
 def init() -> None:
     """
@@ -28,8 +40,7 @@ def set_articles() -> None:
 
         Sets the 'ARTICLES' global variable
     """
-    global ARTICLES
-    ARTICLES = []
+    STATE.publish('articles', new_article_store())
 
 def set_covid_data_list() -> None:
     """
@@ -37,8 +48,7 @@ def set_covid_data_list() -> None:
 
         Sets the 'COVID_DATA_LIST' global variable
     """
-    global COVID_DATA_LIST
-    COVID_DATA_LIST = []
+    STATE.publish('covid_data_list', [])
 
 def set_updates() -> None:
     """
@@ -46,75 +56,167 @@ def set_updates() -> None:
 
         Sets the 'UPDATES' global variable
     """
-    global UPDATES
-    UPDATES = []
+    STATE.publish('updates', UpdateRegistry())
+
+def new_article_store(entries:list=None) -> ArticleStore:
+    """
+    Definition:
+
+        Creates an ArticleStore bounded by the 'max_articles' and 'max_article_bytes' values in the config file
+
+    Arguments:
+
+        entries {list} : the article dictionaries to put in the store
+
+    Returns:
+
+        {ArticleStore} : the new store
+    """
+    return ArticleStore(entries, config['max_articles'], config['max_article_bytes'])
 
 
 def retrieve_articles() -> None:
     """
     Definition:
 
-        Retrieves the 'ARTICLES' global variable
+        Retrieves the 'ARTICLES' global variable from the current snapshot. It must not be changed
     """
-    global ARTICLES
-    if 'ARTICLES' not in globals():
-        ARTICLES = []
-    return ARTICLES
+    return STATE.get('articles')
 
 def retrieve_covid_data_list() -> None:
     """
     Definition:
 
-        Retrieves the 'COVID_DATA_LIST' global variable
+        Retrieves the 'COVID_DATA_LIST' global variable from the current snapshot. It must not be changed
     """
-    global COVID_DATA_LIST
-    return COVID_DATA_LIST
+    return STATE.get('covid_data_list')
 
 def retrieve_updates() -> None:
     """
     Definition:
 
-        Retrieves the 'UPDATES' global variable
+        Retrieves the 'UPDATES' global variable from the current snapshot. It must not be changed, use change_updates instead
     """
-    global UPDATES
-    return UPDATES
+    return STATE.get('updates')
 
 
 def update_articles(input:list) -> None:
     """
     Definition:
 
-        Updates the 'ARTICLES' global variable
+        Updates the 'ARTICLES' global variable. A list is put into a new ArticleStore so the articles are indexed.
+        Nothing is published if the input is the store which is already published
 
     Arguments:
 
         input {list} : the list which will update
     """
-    global ARTICLES
-    ARTICLES = input
+    if not isinstance(input, ArticleStore):
+        input = new_article_store(input)
+    if input is not STATE.get('articles'):
+        STATE.publish('articles', input)
 
 def update_covid_data_list(input:list) -> None:
     """
     Definition:
 
-        Updates the 'COVID_DATA_LIST' global variable
+        Updates the 'COVID_DATA_LIST' global variable. Nothing is published if the data hasn't changed
 
     Arguments:
 
         input {list} : the list which will update
     """
-    global COVID_DATA_LIST
-    COVID_DATA_LIST = input
+    if input != STATE.get('covid_data_list'):
+        STATE.publish('covid_data_list', input)
 
 def update_updates(input:list) -> None:
     """
     Definition:
 
-        Updates the 'UPDATES' global variable
+        Updates the 'UPDATES' global variable. A list is put into a new UpdateRegistry so the updates are keyed by name
 
     Arguments:
 
         input {list} : the list which will update
     """
-    global UPDATES
-    UPDATES = input
+    if not isinstance(input, UpdateRegistry):
+        input = UpdateRegistry(input)
+    STATE.publish('updates', input)
+
+
+def change_articles(function) -> ArticleStore:
+    """
+    Definition:
+
+        Publishes the ArticleStore returned by a function of the 'ARTICLES' global variable, e.g. a copy with new
+        articles. Changes made at the same time by other threads aren't lost
+
+    Arguments:
+
+        function {function} : function which is given the current store (which it mustn't change) and returns the new store
+
+    Returns:
+
+        {ArticleStore} : the published store
+    """
+    return STATE.replace('articles', function)
+
+def change_updates(change) -> any:
+    """
+    Definition:
+
+        Changes a copy of the 'UPDATES' global variable and publishes it, so threads reading the registry
+        never see it change. Changes made at the same time by other threads aren't lost
+
+    Arguments:
+
+        change {function} : function which is given the copy of the registry to change
+
+    Returns:
+
+        {any} : the value returned by the change function
+    """
+    return STATE.update('updates', change)
+
+def retrieve_versions() -> dict:
+    """
+    Definition:
+
+        Retrieves the versions of the global variables, each increased every time the variable changes
+    """
+    return dict(STATE.snapshot().versions)
+
+def retrieve_version(name:str) -> tuple[int, float]:
+    """
+    Definition:
+
+        Retrieves the version of a global variable and the time it last changed
+
+    Arguments:
+
+        name {str} : the name of the global variable, 'articles', 'covid_data_list' or 'updates'
+
+    Returns:
+
+        {tuple} : the version and the time it last changed in seconds since the epoch
+    """
+    snapshot = STATE.snapshot()
+    return snapshot.versions[name], snapshot.changed_at[name]
+
+def wait_for_change(versions:dict, timeout:float=None) -> dict:
+    """
+    Definition:
+
+        Waits until the version of a global variable is different to the versions given, or the timeout passes
+
+    Arguments:
+
+        versions {dict} : versions returned by retrieve_versions or wait_for_change
+
+        timeout {float} : the maximum number of seconds to wait
+
+    Returns:
+
+        {dict} : the versions of the global variables, the same as versions if the timeout passed
+    """
+    return dict(STATE.wait_for_change(versions, timeout).versions)
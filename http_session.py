@@ -0,0 +1,84 @@
+"""Module used to make the pooled HTTP sessions the api requests are made through"""
+import random
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# responses which are worth retrying, the api is busy or briefly unavailable
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class JitterRetry(Retry):
+    """
+    A urllib3 Retry which adds up to jitter random seconds to each backoff. urllib3 2 has its own backoff_jitter
+    argument, but urllib3 1.x (which requests still allows) doesn't, so the jitter is added here instead.
+    """
+    def __init__(self, *args, jitter:float=0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.jitter = jitter
+
+    def new(self, **kwargs) -> 'JitterRetry':
+        # Retry makes a new object after each retry, which wouldn't know the jitter
+        retry = super().new(**kwargs)
+        retry.jitter = self.jitter
+        return retry
+
+    def get_backoff_time(self) -> float:
+        """Gets the seconds to wait before the next retry, with the jitter added once there is a backoff."""
+        backoff = super().get_backoff_time()
+        if backoff > 0 and self.jitter > 0:
+            backoff = backoff + random.uniform(0, self.jitter)
+        return backoff
+
+
+class TimeoutSession(requests.Session):
+    """
+    A requests session which keeps its connections open between requests (keep-alive) and gives every request a
+    timeout, unless the request is given its own, so a request can't hang a scheduled update forever.
+    """
+    def __init__(self, timeout:float=None):
+        super().__init__()
+        self.timeout = timeout
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        return super().request(method, url, **kwargs)
+
+
+def make_session(pool_size:int=10, timeout:float=None, retries:int=3, backoff:float=0.5, jitter:float=0.5) -> TimeoutSession:
+    """
+    Description:
+
+        Function which makes a session with a pool of keep-alive connections for each host, retrying requests which
+        fail to connect or return a busy status with an exponential backoff and random jitter
+
+    Arguments:
+
+        pool_size {int} : the number of connections kept open to each host
+
+        timeout {float} : the number of seconds each request is given to connect and to respond
+
+        retries {int} : the number of times a failed request is retried
+
+        backoff {float} : the backoff factor, the n-th retry waits backoff * 2 ** (n - 1) seconds
+
+        jitter {float} : the maximum number of random seconds added to each backoff, so requests which failed
+        together don't retry together
+
+    Returns:
+
+        session {TimeoutSession} : the session
+    """
+    retry = JitterRetry(total=retries,
+                        backoff_factor=backoff,
+                        jitter=jitter,
+                        status_forcelist=RETRY_STATUSES,
+                        allowed_methods=('GET',),
+                        respect_retry_after_header=True,
+                        raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+    session = TimeoutSession(timeout)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
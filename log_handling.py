@@ -0,0 +1,85 @@
+"""Module used to set up the logging of the application, written to the log file by one background thread"""
+import atexit
+import logging
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from app_config import load_config
+
+#sets up the config file for this module, loaded once and shared by every module
+config = load_config()
+
+FORMAT = '%(levelname)s: %(asctime)s: %(message)s'
+
+# the thread writing the queued log records to the log file, None until setup_logging is called
+LISTENER = None
+_LOCK = threading.Lock()
+
+
+def setup_logging(handler:logging.Handler=None) -> QueueListener:
+    """
+    Description:
+
+        Function which sets up the root logger once, however many modules call it. Records are put on a queue by the
+        thread logging them (a request or a scheduled update) and written by one listener thread, so a slow disk
+        doesn't hold up the page. The level is set once from 'log_level', so messages below it are never formatted
+
+    Arguments:
+
+        handler {logging.Handler} : the handler the listener writes to. By default a RotatingFileHandler writing to
+        'log_file', which starts a new file once it is 'log_max_bytes' long and keeps 'log_backup_count' old files
+
+    Returns:
+
+        {QueueListener} : the listener writing the records
+    """
+    global LISTENER
+    with _LOCK:
+        if LISTENER is not None:
+            return LISTENER
+
+        if handler is None:
+            handler = RotatingFileHandler(config['log_file'], maxBytes=config['log_max_bytes'],
+                                          backupCount=config['log_backup_count'], encoding='utf8', delay=True)
+        handler.setFormatter(logging.Formatter(FORMAT))
+
+        log_queue = queue.SimpleQueue()
+        root = logging.getLogger()
+        root.setLevel(config['log_level'])
+        root.addHandler(QueueHandler(log_queue))
+
+        LISTENER = QueueListener(log_queue, handler, respect_handler_level=True)
+        LISTENER.start()
+        return LISTENER
+
+
+def stop_logging() -> None:
+    """
+    Description:
+
+        Function which writes the records still on the queue and stops the listener thread, called when the
+        application exits
+
+    Arguments:
+
+        None
+
+    Returns:
+
+        None
+    """
+    global LISTENER
+    with _LOCK:
+        if LISTENER is None:
+            return
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            if isinstance(handler, QueueHandler) and handler.queue is LISTENER.queue:
+                root.removeHandler(handler)
+        LISTENER.stop()
+        for handler in LISTENER.handlers:
+            handler.close()
+        LISTENER = None
+
+
+atexit.register(stop_logging)
@@ -0,0 +1,259 @@
+"""Module containing the metrics of the application, shown in the Prometheus text format on the /metrics page"""
+import functools
+import math
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# the upper bounds (in seconds) of the latency histogram buckets, from a cached page to a slow api request
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+class Counter:
+    """
+    A count which only goes up, kept for each set of label values.
+    """
+    def __init__(self, name:str, documentation:str, labelnames:tuple=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def inc(self, *labelvalues, amount:float=1) -> None:
+        """
+        Description:
+
+            Function which adds to the count of the label values
+
+        Arguments:
+
+            labelvalues {str} : the value of each of the labels, in the order of labelnames
+
+            amount {float} : the amount added to the count
+
+        Returns:
+
+            None
+        """
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def value(self, *labelvalues) -> float:
+        """Gets the count of the label values."""
+        with self._lock:
+            return self._values.get(labelvalues, 0)
+
+    def samples(self) -> list:
+        """Gets the (name, labels, value) samples of the counter."""
+        with self._lock:
+            return [(self.name, dict(zip(self.labelnames, labelvalues)), value) for labelvalues, value in self._values.items()]
+
+
+class Histogram:
+    """
+    The number of observations (e.g. latencies in seconds) which fall in each bucket, along with their count and sum,
+    kept for each set of label values.
+    """
+    def __init__(self, name:str, documentation:str, labelnames:tuple=(), buckets:tuple=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        # [bucket counts..., sum] for each set of label values, the last bucket is +Inf
+        self._values = {}
+
+    def observe(self, value:float, *labelvalues) -> None:
+        """
+        Description:
+
+            Function which records an observation
+
+        Arguments:
+
+            value {float} : the value observed
+
+            labelvalues {str} : the value of each of the labels, in the order of labelnames
+
+        Returns:
+
+            None
+        """
+        bucket = bisect_left(self.buckets, value)
+        with self._lock:
+            values = self._values.get(labelvalues)
+            if values is None:
+                values = self._values[labelvalues] = [0] * (len(self.buckets) + 2)
+            values[bucket] = values[bucket] + 1
+            values[-1] = values[-1] + value
+
+    @contextmanager
+    def time(self, *labelvalues):
+        """Observes the number of seconds the with block takes, even if it raises an exception."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labelvalues)
+
+    def count(self, *labelvalues) -> int:
+        """Gets the number of observations of the label values."""
+        with self._lock:
+            return sum(self._values.get(labelvalues, [0])[:-1])
+
+    def samples(self) -> list:
+        """Gets the (name, labels, value) samples of the histogram, with cumulative buckets like Prometheus expects."""
+        samples = []
+        with self._lock:
+            values = {labelvalues : list(counts) for labelvalues, counts in self._values.items()}
+        for labelvalues, counts in values.items():
+            labels = dict(zip(self.labelnames, labelvalues))
+            total = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts[:-1]):
+                total = total + bucket_count
+                samples.append((self.name+'_bucket', dict(labels, le=format_value(bound)), total))
+            samples.append((self.name+'_count', labels, total))
+            samples.append((self.name+'_sum', labels, counts[-1]))
+        return samples
+
+
+class Callback:
+    """
+    A gauge or counter whose values are read from the application when the metrics are shown, e.g. the number
+    of held articles or the hit counters an object already keeps. The function returns a number, or a dictionary
+    of numbers keyed by tuples of label values.
+    """
+    def __init__(self, name:str, documentation:str, metric_type:str, function, labelnames:tuple=()):
+        self.name = name
+        self.documentation = documentation
+        self.metric_type = metric_type
+        self.labelnames = labelnames
+        self.function = function
+
+    def samples(self) -> list:
+        """Gets the (name, labels, value) samples from the function."""
+        values = self.function()
+        if not isinstance(values, dict):
+            values = {() : values}
+        return [(self.name, dict(zip(self.labelnames, labelvalues)), value) for labelvalues, value in values.items()]
+
+
+class Registry:
+    """
+    The metrics of the application, in the order they are shown.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}
+
+    def counter(self, name:str, documentation:str, labelnames:tuple=()) -> Counter:
+        """Registers and returns a counter."""
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name:str, documentation:str, labelnames:tuple=(), buckets:tuple=LATENCY_BUCKETS) -> Histogram:
+        """Registers and returns a histogram."""
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def callback(self, name:str, documentation:str, metric_type:str, function, labelnames:tuple=()) -> Callback:
+        """Registers and returns a gauge or counter read from function."""
+        return self.register(Callback(name, documentation, metric_type, function, labelnames))
+
+    def register(self, metric:any) -> any:
+        """Registers a metric, replacing the metric with the same name."""
+        with self._lock:
+            self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """
+        Description:
+
+            Function which shows the metrics in the Prometheus text exposition format (version 0.0.4)
+
+        Arguments:
+
+            None
+
+        Returns:
+
+            {str} : the metrics, a HELP and TYPE line followed by the samples of each metric
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+
+        lines = []
+        for metric in metrics:
+            lines.append('# HELP '+metric.name+' '+metric.documentation.replace('\\', '\\\\').replace('\n', '\\n'))
+            lines.append('# TYPE '+metric.name+' '+metric_type(metric))
+            for name, labels, value in metric.samples():
+                lines.append(name+format_labels(labels)+' '+format_value(value))
+        return '\n'.join(lines)+'\n'
+
+
+def metric_type(metric:any) -> str:
+    """Gets the Prometheus type of a metric."""
+    if isinstance(metric, Histogram):
+        return 'histogram'
+    if isinstance(metric, Counter):
+        return 'counter'
+    return metric.metric_type
+
+
+def format_labels(labels:dict) -> str:
+    """Formats labels as {name="value",...}, escaping the values."""
+    if len(labels) == 0:
+        return ''
+    return '{'+','.join(name+'="'+str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')+'"'
+                        for name, value in labels.items())+'}'
+
+
+def format_value(value:float) -> str:
+    """Formats a sample value, using the Prometheus names for infinity."""
+    if value == math.inf:
+        return '+Inf'
+    if value == -math.inf:
+        return '-Inf'
+    if isinstance(value, bool):
+        return str(int(value))
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+# the metrics of the application, shown on the /metrics page
+REGISTRY = Registry()
+
+# time taken by the api requests, covid data collectors, news updates and template rendering
+LATENCY = REGISTRY.histogram('covid_dashboard_latency_seconds', 'Time taken by the hot paths of the dashboard.', ('operation',))
+
+# time taken by each scheduled job, and the number which failed
+JOB_LATENCY = REGISTRY.histogram('covid_dashboard_scheduler_job_seconds', 'Time taken by the scheduled jobs.', ('job',))
+JOB_FAILURES = REGISTRY.counter('covid_dashboard_scheduler_job_failures_total', 'Scheduled jobs which raised an exception.', ('job',))
+
+# bytes downloaded from the covid and news apis
+UPSTREAM_BYTES = REGISTRY.counter('covid_dashboard_upstream_bytes_total', 'Bytes downloaded from the apis.', ('api',))
+
+
+def timed(operation:str):
+    """
+    Description:
+
+        Decorator which observes the time taken by each call of a function in the LATENCY histogram
+
+    Arguments:
+
+        operation {str} : the value of the histogram's operation label
+
+    Returns:
+
+        {function} : the decorator
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with LATENCY.time(operation):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,189 @@
+"""Module used to profile the running application on demand, sampling the stacks of every thread and the memory allocated"""
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+# only one profile runs at a time, so profiles don't sample each other
+PROFILE_LOCK = threading.Lock()
+
+
+class ProfilerBusy(Exception):
+    """Raised when a profile is requested while another one is running."""
+
+
+def sample_stacks(seconds:float, interval:float=0.005) -> Counter:
+    """
+    Description:
+
+        Function which samples the stack of every thread (flask request threads, the scheduler thread and its
+        job threads) every interval seconds for the given number of seconds. Nothing is traced between the
+        samples and nothing runs at all when no profile is requested
+
+    Arguments:
+
+        seconds {float} : the number of seconds to sample for
+
+        interval {float} : the number of seconds between samples
+
+    Returns:
+
+        stacks {Counter} : the number of samples of each stack, keyed by a tuple of the thread name followed by
+        the functions from the outermost call to the innermost
+    """
+    sampler = threading.get_ident()
+    stacks = Counter()
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        names = {thread.ident : thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == sampler:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(frame_label(frame))
+                frame = frame.f_back
+            stacks[(names.get(ident, str(ident)),) + tuple(reversed(stack))] += 1
+        time.sleep(interval)
+    return stacks
+
+
+def frame_label(frame:any) -> str:
+    """Labels a frame with its file and function, e.g. covid_data_handler.py:covid_API_request."""
+    code = frame.f_code
+    return os.path.basename(code.co_filename)+':'+getattr(code, 'co_qualname', code.co_name)
+
+
+def collapsed_stacks(stacks:Counter) -> str:
+    """
+    Description:
+
+        Function which formats sampled stacks as collapsed stacks, one 'thread;outer;...;inner count' line for
+        each stack, which flamegraph.pl and speedscope can show as a flame graph
+
+    Arguments:
+
+        stacks {Counter} : the stacks returned from sample_stacks
+
+    Returns:
+
+        {str} : the collapsed stacks, most sampled first
+    """
+    return ''.join(';'.join(stack)+' '+str(count)+'\n' for stack, count in stacks.most_common())
+
+
+def top_functions(stacks:Counter, limit:int=40) -> str:
+    """
+    Description:
+
+        Function which formats sampled stacks as a table of the functions seen most often, like the pstats output:
+        the samples in the function itself (self) and the samples in it or the functions it called (total)
+
+    Arguments:
+
+        stacks {Counter} : the stacks returned from sample_stacks
+
+        limit {int} : the number of functions shown
+
+    Returns:
+
+        {str} : the table, sorted by the total samples
+    """
+    samples = sum(stacks.values())
+    own = Counter()
+    total = Counter()
+    for stack, count in stacks.items():
+        functions = stack[1:]
+        if len(functions) > 0:
+            own[functions[-1]] += count
+        for function in set(functions):
+            total[function] += count
+
+    lines = [str(samples)+' samples\n', f'{"self":>8} {"self%":>7} {"total":>8} {"total%":>7}  function\n']
+    for function, count in total.most_common(limit):
+        lines.append(f'{own[function]:>8} {percent(own[function], samples):>7} {count:>8} {percent(count, samples):>7}  {function}\n')
+    return ''.join(lines)
+
+
+def percent(count:int, samples:int) -> str:
+    """Formats count as a percentage of samples."""
+    return f'{100 * count / samples:.1f}%' if samples > 0 else '0.0%'
+
+
+def profile(seconds:float, output:str='collapsed', interval:float=0.005) -> str:
+    """
+    Description:
+
+        Function which samples every thread for the given number of seconds, raising ProfilerBusy if another
+        profile is running
+
+    Arguments:
+
+        seconds {float} : the number of seconds to sample for
+
+        output {str} : 'collapsed' for collapsed stacks, or 'top' for a table of the functions seen most often
+
+        interval {float} : the number of seconds between samples
+
+    Returns:
+
+        {str} : the profile
+    """
+    if not PROFILE_LOCK.acquire(blocking=False):
+        raise ProfilerBusy('a profile is already running')
+    try:
+        stacks = sample_stacks(seconds, interval)
+    finally:
+        PROFILE_LOCK.release()
+    return top_functions(stacks) if output == 'top' else collapsed_stacks(stacks)
+
+
+def memory_growth(seconds:float, limit:int=30, frames:int=1) -> str:
+    """
+    Description:
+
+        Function which traces the memory allocated for the given number of seconds and compares snapshots taken at the
+        start and the end, showing the lines whose allocations grew the most (e.g. the lines appending to the articles
+        store, the updates registry or the api dictionaries). Memory is only traced while this runs, unless tracemalloc
+        was already started (e.g. with python -X tracemalloc), in which case it is left running
+
+    Arguments:
+
+        seconds {float} : the number of seconds to trace for
+
+        limit {int} : the number of lines shown
+
+        frames {int} : the number of frames kept for each allocation, more than 1 groups the growth by traceback
+
+    Returns:
+
+        {str} : the lines whose allocations grew the most, largest first
+    """
+    if not PROFILE_LOCK.acquire(blocking=False):
+        raise ProfilerBusy('a profile is already running')
+    try:
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start(frames)
+        try:
+            # the snapshots themselves aren't part of the growth
+            filters = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+            before = tracemalloc.take_snapshot().filter_traces(filters)
+            time.sleep(seconds)
+            after = tracemalloc.take_snapshot().filter_traces(filters)
+            traced, peak = tracemalloc.get_traced_memory()
+        finally:
+            if started:
+                tracemalloc.stop()
+    finally:
+        PROFILE_LOCK.release()
+
+    statistics = after.compare_to(before, 'traceback' if frames > 1 else 'lineno')
+    lines = [f'traced {traced / 1e6:.1f} MB, peak {peak / 1e6:.1f} MB\n']
+    for statistic in statistics[:limit]:
+        lines.append(str(statistic)+'\n')
+        if frames > 1:
+            lines.extend(line+'\n' for line in statistic.traceback.format())
+    return ''.join(lines)
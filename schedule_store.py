@@ -0,0 +1,99 @@
+"""Module used to save the scheduled updates in a SQLite database so they survive a restart"""
+import logging
+import sqlite3
+import threading
+
+
+class ScheduleStore:
+    """
+    The scheduled updates saved in a SQLite database, one row per update keyed by its name.
+
+    Each row holds the update dictionary's values and the time (seconds since the epoch) the update is next due,
+    which is all that is needed to schedule the update again when the application starts. The database is only
+    opened the first time it is used.
+    """
+    def __init__(self, filename:str):
+        self.filename = filename
+        self._lock = threading.Lock()
+        self._connection = None
+
+    def save(self, update:dict, next_run:float) -> None:
+        """
+        Description:
+
+            Function which saves an update, replacing the saved update with the same name
+
+        Arguments:
+
+            update {dict} : dictionary containing the 'title', 'content', 'update_time', 'update_type' and 'repeat' keys
+
+            next_run {float} : the time the update is next due, in seconds since the epoch
+
+        Returns:
+
+            None
+        """
+        self._execute('INSERT OR REPLACE INTO updates (title, content, update_time, update_type, repeat, next_run) '
+                      'VALUES (?, ?, ?, ?, ?, ?)',
+                      (update['title'], update['content'], update['update_time'], update['update_type'], int(update['repeat']), next_run))
+
+    def remove(self, update_name:str) -> None:
+        """
+        Description:
+
+            Function which removes a saved update
+
+        Arguments:
+
+            update_name {str} : string containing the name of the update
+
+        Returns:
+
+            None
+        """
+        self._execute('DELETE FROM updates WHERE title = ?', (update_name,))
+
+    def load(self) -> list:
+        """
+        Description:
+
+            Function which loads the saved updates, in the order they are due
+
+        Arguments:
+
+            None
+
+        Returns:
+
+            {list} : list of (update dictionary, next_run) tuples
+        """
+        rows = self._execute('SELECT title, content, update_time, update_type, repeat, next_run FROM updates ORDER BY next_run')
+        return [({
+                'title' : title,
+                'content' : content,
+                'update_time' : update_time,
+                'update_type' : update_type,
+                'repeat' : bool(repeat)
+                }, next_run) for title, content, update_time, update_type, repeat, next_run in rows]
+
+    def close(self) -> None:
+        """Closes the database."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _execute(self, statement:str, parameters:tuple=()) -> list:
+        """Runs a statement in its own transaction, logging errors so a broken database doesn't stop the updates running."""
+        with self._lock:
+            try:
+                if self._connection is None:
+                    self._connection = sqlite3.connect(self.filename, check_same_thread=False)
+                    self._connection.execute('CREATE TABLE IF NOT EXISTS updates ('
+                                             'title TEXT PRIMARY KEY, content TEXT, update_time TEXT, '
+                                             'update_type TEXT, repeat INTEGER, next_run REAL)')
+                with self._connection:
+                    return self._connection.execute(statement, parameters).fetchall()
+            except sqlite3.Error:
+                logging.exception('SCHEDULE STORE %s COULD NOT BE USED', self.filename)
+                return []
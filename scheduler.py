@@ -1,53 +1,75 @@
 """Module used for scheduling covid and news updates"""
-import json
-import  sched
 import  time
 import  threading
-import  sys
 import logging
 from datetime import datetime
 import  global_vars
-from covid_data_handler import covid_data_collector
+from covid_data_handler import shared_covid_data_collector
+from covid_data_handler import COVID_SNAPSHOT
+from covid_news_handling import news_articles_list
+from covid_news_handling import merge_news_articles
 from covid_news_handling import update_news
+from scheduler_worker import SchedulerWorker
+from update_registry import UpdateRegistry
+from schedule_store import ScheduleStore
+from log_handling import setup_logging
+from app_config import load_config
 
-# sets up logging for this module
-FORMAT = '%(levelname)s: %(asctime)s: %(message)s'
-logging.basicConfig(filename='log_file.log', format=FORMAT, level=logging.INFO)
+# sets up logging for this module, written to the log file by the logging thread
+setup_logging()
 
-#sets up the config file for this module
-with open("config.json") as json_data_file:
-    config = json.load(json_data_file)
+#sets up the config file for this module, loaded once and shared by every module
+config = load_config()
 
-# creates sched instance
-SCHEDULER = sched.scheduler(time.time, time.sleep)
+# creates the scheduler, one thread runs every scheduled update in a pool of 'scheduler_workers' threads
+SCHEDULER = SchedulerWorker(config['scheduler_workers'])
 
-# global variable for this module is set
-ACTIVE_SCHEDS = []
+# saves the scheduled updates so they are scheduled again when the application restarts.
+# It is made by schedule_store the first time an update is saved or restored, so importing the module doesn't open it
+SCHEDULE_STORE = None
+STORE_LOCK = threading.Lock()
 
 
-def schedule_covid_updates(update_interval:int, update_name:str, repeat:bool, update_type:str, update_time:str) -> sched.Event:
+def schedule_store() -> ScheduleStore:
     """
     Description:
 
-        Function to schedule updates from the covid API requests by creating instances of the sched class.
-        There are three sched events created:
+        Function which gets the store the scheduled updates are saved in, making it from 'schedule_store' the first time it is needed
+
+    Arguments:
 
-            repeat_sched : only created if the update is going to repeat every 24 hours. Calls the repeat_update function
+        None
 
-            update_name : calls the update_covid function
+    Returns:
 
-            cancel_sched : calls the remove_updates function. Run when the data has been updated
+        SCHEDULE_STORE {ScheduleStore} : the store of the scheduled updates
+    """
+    global SCHEDULE_STORE
+    with STORE_LOCK:
+        if SCHEDULE_STORE is None:
+            SCHEDULE_STORE = ScheduleStore(config['schedule_store'])
+        return SCHEDULE_STORE
 
-        SCHEDULER instance is run in another thread with with the Kthread class.
 
-        Sched event names are added to a list of dictionary's, ACTIVE_SCHEDS, so that the
-        threads can be terminated of the user cancles an update
+def schedule_covid_updates(update_interval:int, update_name:str, repeat:bool, update_type:str, update_time:str) -> list:
+    """
+    Description:
+
+        Function to schedule updates from the covid API requests by creating instances of the sched class.
+        The sched event calls the update_covid function, which calls the finish_update function once the data has
+        been updated (or the update failed). It schedules the update again in 24 hours if it repeats, otherwise it
+        removes the update.
+
+        The event is added to the shared SCHEDULER, whose single thread runs it when it is due.
+
+        Sched events are stored in the global updates registry under the update's name, along with a cancellation token
+        so that they can be cancelled if the user cancles an update, even once the update has started
 
     Arguments:
 
-        update_interval {int} : integer value showing the number of seconds until the update function is run from the sched object
+        update_interval <class 'int'> : integer value showing the number of seconds until the update function is run from the sched object
 
-        update_name {str} : string containing the name of the update
+        update_name <class 'str'> : string containing the name of the update
 
         repeat {bool} : boolean stating whether the update will repeat every 24 hours or not
 
@@ -57,75 +79,74 @@ def schedule_covid_updates(update_interval:int, update_name:str, repeat:bool, up
 
     Returns:
 
-        None
+        {list} : list of the active scheds of the update
     """
-    sched_name = update_name
-    log = 'COVID UPDATE SCHED INSTANCE,', update_name, ', RUNNING FOR', update_interval, 'SECONDS UNTIL', update_time
-    logging.info(log)
-
+    logging.info('COVID UPDATE SCHED INSTANCE, %s, RUNNING FOR %s SECONDS UNTIL %s', update_name, update_interval, update_time)
     if repeat:
-        repeat_sched = SCHEDULER.enter(update_interval, 1, repeat_update, (update_type, update_name, update_time))
         logging.info('EVERY 24 HOURS')
 
-    update_name = update_name+'covid'
-    update_name = SCHEDULER.enter(update_interval, 2, update_covid, ())
+    active_sched = {
+                    'sched_name' : update_name,
+                    'sched_type' : 'covid',
+                    # set if the update is cancelled while it is running, so it stops before changing the global variables
+                    'cancel_token' : threading.Event()
+    }
+    active_sched['sched'] = SCHEDULER.enter(update_interval, 2, update_covid, (active_sched,))
 
-    cancel_sched = sched_name+'covid_cancel'
-    cancel_sched = SCHEDULER.enter(update_interval, 3, remove_update, (sched_name, global_vars.retrieve_updates(), False))
+    global_vars.change_updates(lambda updates: updates.add_sched(update_name, active_sched))
+    return global_vars.retrieve_updates().scheds(update_name)
 
-    covid_thread = KThread(target=SCHEDULER.run)
-    covid_thread.start()
-
-    ACTIVE_SCHEDS.append({
-                        'sched_name' : sched_name, # acts as primary key
-                        'sched' : update_name,
-                        'cancel_sched' : cancel_sched,
-                        'thread_name' : covid_thread
-    })
-
-    return ACTIVE_SCHEDS
-
-def update_covid() -> None:
+def update_covid(active_sched:dict=None) -> None:
     """
     Description:
 
-        Function which updates the global variable covid_data_list with new covid data by calling the covid_data_collector function
+        Function which updates the global variable covid_data_list with new covid data by calling the
+        incremental_covid_data_collector function, which only requests the days newer than the data already held.
+        It is called through shared_covid_data_collector, so updates scheduled for the same time share one request
 
     Arguments:
 
-        None
+        active_sched {dict} : the active sched of the scheduled update which is running, None for an update which
+            wasn't scheduled by the user. Its 'cancel_token' is set by stop_thread if the update is cancelled and is
+            checked before the global variables are changed, and finish_update is called with it once the update is done
 
     Returns:
 
         None
     """
-    global_vars.update_covid_data_list(covid_data_collector())
-    logging.info('COVID UPDATED')
-
-
-def schedule_news_updates(update_interval:int, update_name:str, repeat:bool, update_type:str, update_time:str) -> sched.Event:
+    try:
+        covid_data = shared_covid_data_collector()
+        if active_sched is not None and active_sched['cancel_token'].is_set():
+            logging.info('COVID UPDATE CANCELLED')
+            return
+        global_vars.update_covid_data_list(covid_data)
+        # stops the page being rendered from an older snapshot than the scheduled update
+        COVID_SNAPSHOT.put(covid_data)
+        logging.info('COVID UPDATED')
+    finally:
+        if active_sched is not None:
+            finish_update(active_sched)
+
+
+def schedule_news_updates(update_interval:int, update_name:str, repeat:bool, update_type:str, update_time:str) -> list:
     """
     Description:
 
-        Function to schedule updates from the covid API requests by creating instances of the sched class.
-        There are three sched events created:
-
-            repeat_sched : only created if the update is going to repeat every 24 hours. Calls the repeat_update function
+        Function to schedule updates from the news API requests by creating instances of the sched class.
+        The sched event calls the update_news_articles function, which calls the finish_update function once the data has
+        been updated (or the update failed). It schedules the update again in 24 hours if it repeats, otherwise it
+        removes the update.
 
-            update_name : calls the update_covid function
+        The event is added to the shared SCHEDULER, whose single thread runs it when it is due.
 
-            cancel_sched : calls the remove_updates function. Run when the data has been updated
-
-        SCHEDULER instance is run in another thread with with the Kthread class.
-
-        Sched event names are added to a list of dictionary's, ACTIVE_SCHEDS, so that the
-        threads can be terminated of the user cancles an update
+        Sched events are stored in the global updates registry under the update's name, along with a cancellation token
+        so that they can be cancelled if the user cancles an update, even once the update has started
 
     Arguments:
 
-        update_interval {int} : integer value showing the number of seconds until the update function is run from the sched object
+        update_interval <class 'int'> : integer value showing the number of seconds until the update function is run from the sched object
 
-        update_name {str} : string containing the name of the update
+        update_name <class 'str'> : string containing the name of the update
 
         repeat {bool} : boolean stating whether the update will repeat every 24 hours or not
 
@@ -135,51 +156,50 @@ def schedule_news_updates(update_interval:int, update_name:str, repeat:bool, upd
 
     Returns:
 
-        None
+        {list} : list of the active scheds of the update
     """
-    sched_name = update_name
-
-    log = 'NEWS UPDATE SCHED INSTANCE,', update_name, ', RUNNING FOR', update_interval, 'SECONDS UNTIL', update_time
-    logging.info(log)
-
+    logging.info('NEWS UPDATE SCHED INSTANCE, %s, RUNNING FOR %s SECONDS UNTIL %s', update_name, update_interval, update_time)
     if repeat:
-        repeat_sched = SCHEDULER.enter(update_interval, 1, repeat_update, (update_type, update_name, update_time))
         logging.info('EVERY 24 HOURS')
 
-    update_name = update_name+'news'
-    update_name = SCHEDULER.enter(update_interval, 2, update_news_articles, ())
-
-    cancel_sched = sched_name+'news_cancel'
-    cancel_sched = SCHEDULER.enter(update_interval, 3, remove_update, (sched_name, global_vars.retrieve_updates(), False))
+    active_sched = {
+                    'sched_name' : update_name,
+                    'sched_type' : 'news',
+                    # set if the update is cancelled while it is running, so it stops before changing the global variables
+                    'cancel_token' : threading.Event()
+    }
+    active_sched['sched'] = SCHEDULER.enter(update_interval, 2, update_news_articles, (active_sched,))
 
-    news_thread = KThread(target=SCHEDULER.run)
-    news_thread.start()
+    global_vars.change_updates(lambda updates: updates.add_sched(update_name, active_sched))
+    return global_vars.retrieve_updates().scheds(update_name)
 
-    ACTIVE_SCHEDS.append({
-                        'sched_name' : sched_name, # acts as primary key
-                        'sched' : update_name,
-                        'cancel_sched' : cancel_sched,
-                        'thread_name' : news_thread
-    })
-
-    return ACTIVE_SCHEDS
-
-def update_news_articles() -> None:
+def update_news_articles(active_sched:dict=None) -> None:
     """
     Description:
 
-        Function which updates the global variable articles with new covid data by calling the update_news function
+        Function which updates the global variable articles with the newest news articles, merged in with merge_news_articles
 
     Arguments:
 
-        None
+        active_sched {dict} : the active sched of the scheduled update which is running, None for an update which
+            wasn't scheduled by the user. Its 'cancel_token' is set by stop_thread if the update is cancelled and is
+            checked before the global variables are changed, and finish_update is called with it once the update is done
 
     Returns:
 
         None
     """
-    global_vars.update_articles(update_news(global_vars.retrieve_articles(), config['news_search_terms']))
-    logging.info('NEWS UPDATED')
+    try:
+        news_list = news_articles_list(config['news_search_terms'])
+        if active_sched is not None and active_sched['cancel_token'].is_set():
+            logging.info('NEWS UPDATE CANCELLED')
+            return
+        # the new articles are merged into the articles published when the update finishes, so no change is lost
+        global_vars.change_articles(lambda articles: merge_news_articles(articles, news_list))
+        logging.info('NEWS UPDATED')
+    finally:
+        if active_sched is not None:
+            finish_update(active_sched)
 
 
 def get_interval(update_time:str) -> int:
@@ -261,7 +281,7 @@ def append_updates_list(update_type:str, repeat:bool, update_name:str, update_ti
     """
     Description:
 
-        Function to append update information in a dictionary to global updates list
+        Function to add update information in a dictionary to the global updates registry and schedule its events
 
     Arguments:
 
@@ -280,29 +300,11 @@ def append_updates_list(update_type:str, repeat:bool, update_name:str, update_ti
         None
     """
     if update_type == 'cn':
-
-        log = 'COVID DATA AND NEWS UPDATE SCHEDULED FOR', seconds_until_update, 'SECONDS'
-        logging.info(log)
-
         update_words = 'covid stats and news articles'
-        schedule_covid_updates(seconds_until_update, update_name, repeat, update_type, update_time)
-        schedule_news_updates(seconds_until_update, update_name, repeat, update_type, update_time)
-
     elif update_type == 'c':
-
-        log = 'COVID DATA UPDATE SCHEDULED FOR', seconds_until_update, 'SECONDS'
-        logging.info(log)
-
         update_words = 'covid stats'
-        schedule_covid_updates(seconds_until_update, update_name, repeat, update_type, update_time)
-
     elif update_type == 'n':
-
-        log = 'NEWS UPDATE SCHEDULED FOR', seconds_until_update, 'SECONDS'
-        logging.info(log)
-
         update_words = 'news articles'
-        schedule_news_updates(seconds_until_update, update_name, repeat, update_type,update_time)
 
     if repeat:
         repeats = ' It does this very 24 hours.'
@@ -317,10 +319,28 @@ def append_updates_list(update_type:str, repeat:bool, update_name:str, update_ti
                         'repeat' : repeat
                         }
 
-    # appends to list of updates
-    updates = global_vars.retrieve_updates()
-    updates.append(dictionary_to_add)
-    global_vars.update_updates(updates)
+    # adds to the updates registry before the events are scheduled, so they always find the update
+    global_vars.change_updates(lambda updates: updates.append(dictionary_to_add))
+    schedule_store().save(dictionary_to_add, time.time() + seconds_until_update)
+
+    if update_type == 'cn':
+
+        logging.info('COVID DATA AND NEWS UPDATE SCHEDULED FOR %s SECONDS', seconds_until_update)
+
+        schedule_covid_updates(seconds_until_update, update_name, repeat, update_type, update_time)
+        schedule_news_updates(seconds_until_update, update_name, repeat, update_type, update_time)
+
+    elif update_type == 'c':
+
+        logging.info('COVID DATA UPDATE SCHEDULED FOR %s SECONDS', seconds_until_update)
+
+        schedule_covid_updates(seconds_until_update, update_name, repeat, update_type, update_time)
+
+    elif update_type == 'n':
+
+        logging.info('NEWS UPDATE SCHEDULED FOR %s SECONDS', seconds_until_update)
+
+        schedule_news_updates(seconds_until_update, update_name, repeat, update_type,update_time)
 
 
 def name_in_use(update_name:str) -> bool:
@@ -335,212 +355,212 @@ def name_in_use(update_name:str) -> bool:
 
     Returns:
 
-        None
+        {bool} : True if there is an update with the name in the global updates registry
     """
-    if find_dictionary_key(update_name, 'title', 'title', global_vars.retrieve_updates()):
-        return True
-    return
+    return update_name in global_vars.retrieve_updates()
 
 
-def find_dictionary_key(query_data:any, search_key:str, key_to_find:str, list:list) -> any:
+def remove_update(update_name:str, updates:list, remove_both:bool=True) -> list:
     """
     Description:
 
-        Function to find a dictionary keys data in a list based on another dictionary keys data.
+        Function to remove updates form the update registry and unschedule if the user has clicked the "x" on an update
 
     Arguments:
 
-        query_data {any} : the data you start off with within one of the dictionaries withon the list
-
-        search_key {str} : string containing the name of the key which contains the query_data
+        update_name {str} : string containing the name of the update
 
-        key_to_find {str} : string containing the name of the key containing the daa we want to find
+        updates {list} : the global updates registry, or a list of updates which the update is removed from without
+            changing the global updates registry
 
-        list {list} : the list of dictionaries being queried
+        remove_both {bool} : booelan value which states whether the scheduled events of the update are cancelled,
+            False when the update has already run
 
     Returns:
 
-        return_data {any} : the data which is linked to the key_to_find key
+        updates {list} : the global updates registry without the update which was just removed, or the list given
+            without the update
     """
-    return_data = False
+    if not isinstance(updates, UpdateRegistry):
+        # cycles through each update in the list and removes it once the name has been found
+        for x, update in enumerate(updates):
+            if update['title'] == update_name:
+                updates.pop(x)
+                break
+        return updates
 
-    x = 0
-    for i in list:
-        if list[x][search_key] == query_data:
-            return_data =  list[x][key_to_find]
-            break
+    # Cancels the update from schedular
+    if remove_both:
+        stop_thread(update_name)
+        remove_sched(update_name)
 
-        return_data = False
+        logging.info('(1)SCHEDULER INSTANCES:"%s" REMOVED', update_name)
+    else:
+        logging.info('(2)SCHEDULER INSTANCE:"%s" REMOVED', update_name)
 
-        x = x + 1
+    # Removes from update registry
+    global_vars.change_updates(lambda updates: updates.remove(update_name))
+    schedule_store().remove(update_name)
 
-    return return_data
+    return global_vars.retrieve_updates()
 
 
-def remove_update(update_name:str, updates:list, remove_both:bool=True) -> list:
+def remove_sched(update_name:str) -> None:
     """
     Description:
 
-        Function to remove updates form the update list and unschedule if the user has clicked the "x" on a news article
+        function to remove the active scheds of an update from the global updates registry
 
     Arguments:
 
         update_name {str} : string containing the name of the update
 
-        updates {list} : list containing all updates that are going to happen
-
-        remove_both {bool} : booelan value which states whether news and covid data update is
-            being removed or just news or covid data update
-
     Returns:
 
-        updates {list} : list containing the updates without the updates which was just removed
+        None
     """
-    # Cancels the update from schedular
-    if remove_both:
-        update_type = find_dictionary_key(update_name, 'title', 'update_type', global_vars.retrieve_updates())
+    global_vars.change_updates(lambda updates: updates.remove_sched(update_name))
 
-        # runs stop thread and remove sched twice as there  are 2 threads with that name running
-        if update_type == 'cn':
-            stop_thread(update_name)
-            stop_thread(update_name)
 
-            remove_sched(update_name)
-            remove_sched(update_name)
-
-            log = '(1)CN SCHEDULER INSTANCES:"'+update_name+'","'+update_name+'" REMOVED'
-            logging.info(log)
-
-        elif update_type == 'c':
-            stop_thread(update_name)
-
-            remove_sched(update_name)
-
-            log = '(1)C SCHEDULER INSTANCE:"'+update_name+'" REMOVED'
-            logging.info(log)
-
-        elif update_type == 'n':
-            stop_thread(update_name)
+def stop_thread(update_name:str) -> None:
+    """
+    Description:
 
-            remove_sched(update_name)
+        Function which cancels the sched events of an update based on it's name, so they are never run by the SCHEDULER.
+        If the update is already running its cancellation token is set, so it stops before changing the global variables.
+        A running update stays in the global updates registry until it finishes, so it can always be cancelled.
 
-            log = '(1)N SCHEDULER INSTANCE:"'+update_name+'" REMOVED'
-            logging.info(log)
-    else:
-        log = '(2)SCHEDULER INSTANCE:"'+ update_name+ '" REMOVED'
-        logging.info(log)
+    Arguments:
 
+        update_name {str} : string containing the name of the update in the global updates registry
 
-    # Removes from update list
-    # cycles through each update in the list and removes it once the name has been found
-    x = 0
-    for i in updates:
-        if updates[x]['title'] == update_name:
-            updates.pop(x)
-            break
-        x = x + 1
+    Returns:
 
-    return updates
+        None
+    """
+    for active_sched in global_vars.retrieve_updates().scheds(update_name):
+        SCHEDULER.cancel(active_sched['sched'])
+        active_sched['cancel_token'].set()
 
 
-def remove_sched(update_name:str) -> None:
+def finish_update(active_sched:dict) -> None:
     """
     Description:
 
-        function to remove sched instance from sched list
+        Function called by update_covid and update_news_articles once a scheduled update's data has been updated
+        (in the same job, so it never runs before the update is done). If the update repeats, the same type of
+        data is scheduled to update again in 24 hours, otherwise the update is removed once all of its events have run.
 
     Arguments:
 
-        update_name {str} : string containing the name of the active sched
+        active_sched {dict} : dictionary containing the 'sched_name', 'sched_type', sched event and 'cancel_token' of the update
 
     Returns:
 
         None
     """
-    x = 0
-    for i in ACTIVE_SCHEDS:
-        if ACTIVE_SCHEDS[x]['sched_name'] == update_name:
-            ACTIVE_SCHEDS.pop(x)
-        x = x + 1
+    update_name = active_sched['sched_name']
+    update = global_vars.retrieve_updates().get(update_name)
+    remaining_scheds = global_vars.change_updates(lambda updates: updates.remove_sched(update_name, active_sched))
 
+    if update is None or active_sched['cancel_token'].is_set():
+        return
 
-def stop_thread(update_name:str) -> None:
+    if update['repeat']:
+        repeat_update(active_sched['sched_type'][0], update_name, update['update_time'])
+    elif remaining_scheds == 0:
+        remove_update(update_name, global_vars.retrieve_updates(), False)
+
+
+def repeat_update(update_type:str, update_name:str, update_time:str) -> None:
     """
     Description:
 
-        Function which stops a thread based on it's name. Uses the KThread Class to kill the thread.
+        Function called to repeat an update if repeat is set to True when creating an update.
+        It will update again in 24 hours.
 
     Arguments:
 
-        update_name {str} : string containing the name of the update in the ACTIVE_SCHEDS list of dictionaries
+        update_type {str} : string which states whether the update will update news, covid data or news and covid data
+
+        update_name {str} : string containing the name of the update
+
+        update_time {str} : string containing the time the update is meant to run
 
     Returns:
 
         None
     """
-    thread = find_dictionary_key(update_name, 'sched_name', 'thread_name', ACTIVE_SCHEDS)
+    if 'c' in update_type:
+        schedule_covid_updates(86400, update_name, True, update_type, update_time)
+    if 'n' in update_type:
+        schedule_news_updates(86400, update_name, True, update_type, update_time)
+    update = global_vars.retrieve_updates().get(update_name)
+    if update is not None:
+        schedule_store().save(update, time.time() + 86400)
 
-    thread.kill() # kills the thread
+    logging.info('UPDATE: %s, WILL REPEAT IN 24 HOURS', update_name)
 
 
-class KThread(threading.Thread):
+def restore_updates() -> None:
     """
-    A subclass of threading.Thread, with a kill() method.
+    Description:
 
-    This sub-class is from:
-    https://web.archive.org/web/20130503082442/http:/mail.python.org/pipermail/python-list/2004-May/281943.html
-    """
-    def __init__(self, *args, **keywords):
-        threading.Thread.__init__(self, *args, **keywords)
-        self.killed = False
+        Function called when the application starts (not when it is imported) to schedule the updates saved in the
+        SCHEDULE_STORE again.
 
-    def start(self):
-        """Start the thread."""
-        self.__run_backup = self.run
-        self.run = self.__run # Force the Thread to install our trace.
-        threading.Thread.start(self)
+        Only the next run of each update is scheduled. Runs which were missed while the application was stopped
+        aren't replayed one by one, instead the data they would have updated is refreshed once by catch_up_update.
+        A missed update which doesn't repeat is removed, a repeating one is scheduled for its next update time.
 
-    def __run(self):
-        """Hacked run function, which installs the trace."""
-        sys.settrace(self.globaltrace)
-        self.__run_backup()
-        self.run = self.__run_backup
+    Arguments:
+
+        None
 
-    def globaltrace(self, frame, why, arg):
-        if why == 'call':
-            return self.localtrace
+    Returns:
+
+        None
+    """
+    now = time.time()
+    missed_update_types = ''
+    for update, next_run in schedule_store().load():
+        if update['title'] in global_vars.retrieve_updates():
+            continue
+
+        if next_run > now:
+            seconds_until_update = int(next_run - now)
         else:
-            return None
+            missed_update_types = missed_update_types + update['update_type']
+            if not update['repeat']:
+                schedule_store().remove(update['title'])
+                continue
+            seconds_until_update = get_interval(update['update_time'])
 
-    def localtrace(self, frame, why, arg):
-        if self.killed:
-            if why == 'line':
-                raise SystemExit()
-        return self.localtrace
+        append_updates_list(update['update_type'], update['repeat'], update['title'], update['update_time'], seconds_until_update)
 
-    def kill(self):
-        self.killed = True
+        logging.info('RESTORED UPDATE: %s at %s', update['title'], update['update_time'])
 
-def repeat_update(update_type:str, update_name:str, update_time:str) -> None:
+    if missed_update_types:
+        catch_up_update(missed_update_types)
+
+
+def catch_up_update(update_type:str) -> None:
     """
     Description:
 
-        Function called to repeat an update if repeat is set to True when creating an update.
-        It will update again in 24 hours.
+        Function which schedules one update straight away of the data which missed updates would have updated
 
     Arguments:
 
-        update_type {str} : string which states whether the update will update news, covid data or news and covid data
-
-        update_name {str} : string containing the name of the update
-
-        update_time {str} : string containing the time the update is meant to run
+        update_type {str} : string containing 'c' if covid data needs updating and 'n' if news needs updating
 
     Returns:
 
         None
     """
-    append_updates_list(update_type, True, update_name, update_time, 86400)
+    if 'c' in update_type:
+        SCHEDULER.enter(0, 2, update_covid, ())
+    if 'n' in update_type:
+        SCHEDULER.enter(0, 2, update_news_articles, ())
 
-    log = 'UPDATE:', update_name, ',WILL REPEAT IN 24 HOURS'
-    logging.info(log)
+    logging.info('CATCH UP UPDATE SCHEDULED FOR MISSED UPDATES OF TYPE %s', update_type)
@@ -0,0 +1,169 @@
+"""Module containing the single scheduler thread which runs every scheduled update"""
+import heapq
+import itertools
+import logging
+import sched
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from metrics import JOB_LATENCY, JOB_FAILURES
+
+
+class SchedulerWorker:
+    """
+    A replacement for running sched.scheduler.run in a new thread for every update.
+
+    Events are kept in a priority queue (a heap ordered by time, priority and sequence like sched.scheduler) and one
+    long-lived thread waits for the next event, waking up early when an event is added or cancelled. Due events are run
+    in a thread pool with a fixed number of threads, so the number of threads doesn't grow with the number of updates.
+
+    The enter, enterabs, cancel, empty and queue methods work like those of sched.scheduler and return sched.Event tuples.
+    """
+    def __init__(self, max_workers:int=4, timefunc=time.time, name:str='scheduler'):
+        self.timefunc = timefunc
+        self.name = name
+        self._queue = []
+        # sequence numbers of the events in the queue, and of the ones in it which have been cancelled
+        self._pending = set()
+        self._cancelled = set()
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name+'-job')
+        self._thread = None
+        self._stopped = False
+
+    def enterabs(self, event_time:float, priority:int, action, argument:tuple=(), kwargs:dict=None) -> sched.Event:
+        """
+        Description:
+
+            Function which adds an event to run at an absolute time
+
+        Arguments:
+
+            event_time {float} : the time the event runs at, from the timefunc
+
+            priority {int} : events at the same time are started in order of priority (lowest first)
+
+            action {function} : the function the event calls
+
+            argument {tuple} : the arguments the function is called with
+
+            kwargs {dict} : the keyword arguments the function is called with
+
+        Returns:
+
+            event {sched.Event} : the event, which can be passed to cancel
+        """
+        if kwargs is None:
+            kwargs = {}
+        event = sched.Event(event_time, priority, next(self._sequence), action, argument, kwargs)
+        with self._condition:
+            heapq.heappush(self._queue, event)
+            self._pending.add(event.sequence)
+            self._start()
+            # wakes the worker up in case the new event is due before the one it is waiting for
+            self._condition.notify()
+        return event
+
+    def enter(self, delay:float, priority:int, action, argument:tuple=(), kwargs:dict=None) -> sched.Event:
+        """
+        Description:
+
+            Function which adds an event to run after a delay
+
+        Arguments:
+
+            delay {float} : the number of seconds until the event runs
+
+            priority {int} : events at the same time are started in order of priority (lowest first)
+
+            action {function} : the function the event calls
+
+            argument {tuple} : the arguments the function is called with
+
+            kwargs {dict} : the keyword arguments the function is called with
+
+        Returns:
+
+            event {sched.Event} : the event, which can be passed to cancel
+        """
+        return self.enterabs(self.timefunc() + delay, priority, action, argument, kwargs)
+
+    def cancel(self, event:sched.Event) -> None:
+        """
+        Description:
+
+            Function which stops an event from running. The event is only marked as cancelled, it is dropped
+            when it reaches the front of the queue, so cancelling doesn't search the queue.
+
+        Arguments:
+
+            event {sched.Event} : the event returned from enter or enterabs
+
+        Returns:
+
+            None
+        """
+        with self._condition:
+            if event.sequence in self._pending:
+                self._cancelled.add(event.sequence)
+                self._condition.notify()
+
+    def empty(self) -> bool:
+        """Returns True if there are no events waiting to run."""
+        with self._condition:
+            return len(self._pending) == len(self._cancelled)
+
+    @property
+    def queue(self) -> list:
+        """The events waiting to run, in the order they will run."""
+        with self._condition:
+            return sorted(event for event in self._queue if event.sequence not in self._cancelled)
+
+    def shutdown(self) -> None:
+        """Stops the worker thread and waits for the running events to finish."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+        self._executor.shutdown(wait=True)
+
+    def _start(self) -> None:
+        """Starts the worker thread the first time an event is added."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        """Waits for each event to be due and hands it to the thread pool."""
+        while True:
+            with self._condition:
+                while True:
+                    if self._stopped:
+                        return
+                    # drops cancelled events from the front of the queue
+                    while self._queue and self._queue[0].sequence in self._cancelled:
+                        sequence = heapq.heappop(self._queue).sequence
+                        self._cancelled.discard(sequence)
+                        self._pending.discard(sequence)
+                    if not self._queue:
+                        self._condition.wait()
+                        continue
+                    delay = self._queue[0].time - self.timefunc()
+                    if delay <= 0:
+                        event = heapq.heappop(self._queue)
+                        self._pending.discard(event.sequence)
+                        break
+                    self._condition.wait(delay)
+            self._executor.submit(self._run_event, event)
+
+    def _run_event(self, event:sched.Event) -> None:
+        """Runs an event, logging any exception so it doesn't stop other events."""
+        job = getattr(event.action, '__name__', repr(event.action))
+        try:
+            with JOB_LATENCY.time(job):
+                event.action(*event.argument, **event.kwargs)
+        except Exception:
+            JOB_FAILURES.inc(job)
+            logging.exception('SCHEDULED EVENT %s FAILED', job)
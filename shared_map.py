@@ -0,0 +1,232 @@
+"""Module containing maps whose copies share the parts which haven't changed, used by the published global stores"""
+
+# the keys of a SharedMap are spread over BRANCHES lists of BRANCHES dictionaries by their hash
+BRANCHES = 64
+
+# the number of keys in each chunk of the order of a SharedOrderedMap
+CHUNK = 256
+
+# the dictionaries and lists which haven't been written to yet, they are copied before they are changed so they stay empty
+_EMPTY_SHARD = {}
+_EMPTY_BRANCH = [_EMPTY_SHARD] * BRANCHES
+
+# marks the slot of a key which was removed from a chunk
+_REMOVED = object()
+
+
+class SharedMap:
+    """
+    A dictionary whose keys are spread over BRANCHES lists of BRANCHES smaller dictionaries (shards) by their hash.
+
+    A copy shares the lists and shards with the map it was copied from. A list or shard is copied the first time one
+    of its keys is changed, so copying the map and changing a few keys takes the same time however many keys it holds.
+    Neither the map nor its copy changes a shared list or shard in place.
+    """
+    def __init__(self, items:dict=None):
+        self._branches = [_EMPTY_BRANCH] * BRANCHES
+        # the numbers of the branches and shards only this map holds, which can be changed in place
+        self._owned_branches = set()
+        self._owned_shards = set()
+        self._length = 0
+        if items is not None:
+            for key, value in items.items():
+                self[key] = value
+
+    def get(self, key:any, default:any=None) -> any:
+        """Gets the value of the key, default if the key isn't in the map."""
+        return self._shard(key).get(key, default)
+
+    def pop(self, key:any, default:any=None) -> any:
+        """Removes the key and returns its value, default if the key isn't in the map."""
+        if key not in self._shard(key):
+            return default
+        self._length = self._length - 1
+        return self._writable_shard(key).pop(key)
+
+    def copy(self) -> 'SharedMap':
+        """
+        Description:
+
+            Function which makes a copy of the map which shares the lists and shards holding the keys. Only the list of
+            BRANCHES references is copied
+
+        Arguments:
+
+            None
+
+        Returns:
+
+            {SharedMap} : the copy
+        """
+        shared = SharedMap()
+        shared._branches = list(self._branches)
+        shared._length = self._length
+        # the branches are held by both maps now, so this map copies them before changing them too
+        self._owned_branches = set()
+        self._owned_shards = set()
+        return shared
+
+    def items(self):
+        """Iterates over the (key, value) pairs of the map, in no particular order."""
+        for branch in self._branches:
+            for shard in branch:
+                yield from shard.items()
+
+    def _shard(self, key:any) -> dict:
+        """Gets the shard holding the key."""
+        number = hash(key)
+        return self._branches[number % BRANCHES][number // BRANCHES % BRANCHES]
+
+    def _writable_shard(self, key:any) -> dict:
+        """Gets the shard holding the key, copying it and its branch first if they are shared."""
+        number = hash(key)
+        branch_number = number % BRANCHES
+        shard_number = number // BRANCHES % BRANCHES
+        if branch_number not in self._owned_branches:
+            self._branches[branch_number] = list(self._branches[branch_number])
+            self._owned_branches.add(branch_number)
+        branch = self._branches[branch_number]
+        if branch_number * BRANCHES + shard_number not in self._owned_shards:
+            branch[shard_number] = dict(branch[shard_number])
+            self._owned_shards.add(branch_number * BRANCHES + shard_number)
+        return branch[shard_number]
+
+    def __contains__(self, key):
+        return key in self._shard(key)
+
+    def __getitem__(self, key):
+        return self._shard(key)[key]
+
+    def __setitem__(self, key, value):
+        shard = self._writable_shard(key)
+        if key not in shard:
+            self._length = self._length + 1
+        shard[key] = value
+
+    def __len__(self):
+        return self._length
+
+
+class SharedOrderedMap:
+    """
+    A SharedMap which keeps its keys in the order they were added, oldest first. Changing the value of a key keeps its place.
+
+    Each key is given the next number when it is added, and the (key, value) pairs are kept in chunks of CHUNK numbers.
+    A copy shares the chunks and copies a chunk the first time it changes one of its keys, so copying the map copies
+    one reference for each chunk.
+    """
+    def __init__(self):
+        # the number of each key
+        self._numbers = SharedMap()
+        # lists of (key, value) pairs (or _REMOVED) keyed by the number of the chunk. Chunks are only ever added
+        # after the last chunk, so the dictionary keeps them in order
+        self._chunks = {}
+        # the numbers of the chunks only this map holds, which can be changed in place
+        self._owned = set()
+        self._next = 0
+        # no key has a number below this
+        self._first = 0
+
+    def get(self, key:any, default:any=None) -> any:
+        """Gets the value of the key, default if the key isn't in the map."""
+        number = self._numbers.get(key)
+        if number is None:
+            return default
+        return self._chunks[number // CHUNK][number % CHUNK][1]
+
+    def pop(self, key:any, default:any=None) -> any:
+        """Removes the key and returns its value, default if the key isn't in the map."""
+        number = self._numbers.pop(key)
+        if number is None:
+            return default
+        chunk = self._writable_chunk(number // CHUNK)
+        value = chunk[number % CHUNK][1]
+        chunk[number % CHUNK] = _REMOVED
+        # a full chunk whose keys have all been removed is never added to again
+        if len(chunk) == CHUNK and chunk.count(_REMOVED) == CHUNK:
+            del self._chunks[number // CHUNK]
+            self._owned.discard(number // CHUNK)
+        return value
+
+    def first(self) -> any:
+        """Gets the oldest key, raising KeyError if the map is empty."""
+        number = self._first
+        while number < self._next:
+            chunk = self._chunks.get(number // CHUNK, ())
+            for offset in range(number % CHUNK, len(chunk)):
+                if chunk[offset] is not _REMOVED:
+                    self._first = number // CHUNK * CHUNK + offset
+                    return chunk[offset][0]
+            number = (number // CHUNK + 1) * CHUNK
+        raise KeyError('first(): map is empty')
+
+    def copy(self) -> 'SharedOrderedMap':
+        """
+        Description:
+
+            Function which makes a copy of the map which shares the chunks holding the keys and the shards of their numbers
+
+        Arguments:
+
+            None
+
+        Returns:
+
+            {SharedOrderedMap} : the copy
+        """
+        shared = SharedOrderedMap()
+        shared._numbers = self._numbers.copy()
+        shared._chunks = dict(self._chunks)
+        shared._next = self._next
+        shared._first = self._first
+        # the chunks are held by both maps now, so this map copies them before changing them too
+        self._owned = set()
+        return shared
+
+    def keys(self):
+        """Iterates over the keys in the order they were added."""
+        for key, value in self.items():
+            yield key
+
+    def values(self):
+        """Iterates over the values in the order their keys were added."""
+        for key, value in self.items():
+            yield value
+
+    def items(self):
+        """Iterates over the (key, value) pairs in the order the keys were added."""
+        for chunk in list(self._chunks.values()):
+            for pair in chunk:
+                if pair is not _REMOVED:
+                    yield pair
+
+    def _writable_chunk(self, chunk_number:int) -> list:
+        """Gets the chunk with the number, making it if it doesn't exist and copying it first if it is shared."""
+        chunk = self._chunks.get(chunk_number)
+        if chunk is None or chunk_number not in self._owned:
+            chunk = self._chunks[chunk_number] = [] if chunk is None else list(chunk)
+            self._owned.add(chunk_number)
+        return chunk
+
+    def __contains__(self, key):
+        return key in self._numbers
+
+    def __getitem__(self, key):
+        number = self._numbers[key]
+        return self._chunks[number // CHUNK][number % CHUNK][1]
+
+    def __setitem__(self, key, value):
+        number = self._numbers.get(key)
+        if number is None:
+            number = self._next
+            self._next = self._next + 1
+            self._numbers[key] = number
+            self._writable_chunk(number // CHUNK).append((key, value))
+        else:
+            self._writable_chunk(number // CHUNK)[number % CHUNK] = (key, value)
+
+    def __iter__(self):
+        return self.keys()
+
+    def __len__(self):
+        return len(self._numbers)
@@ -0,0 +1,96 @@
+"""Module used to share one in-flight api request between every caller which asks for the same data at the same time"""
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key into one call.
+
+    The first caller for a key runs the function. Callers which ask for the same key while it is running wait on
+    the same future and get its result (or its exception) instead of running the function again. Once the call has
+    finished the next caller for the key runs the function again, so results are never cached.
+    """
+    def __init__(self, name:str='single_flight'):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls = {}
+
+        # counters used to check how many requests are shared between callers
+        self.issued = 0
+        self.coalesced = 0
+
+    def do(self, key:any, function, *args) -> any:
+        """
+        Description:
+
+            Function which calls the function with the arguments, unless a call with the same key is in flight,
+            in which case it waits for that call's result
+
+        Arguments:
+
+            key {any} : hashable value identifying the data being requested
+
+            function {function} : the function which requests the data
+
+            *args : the arguments the function is called with
+
+        Returns:
+
+            {any} : the value returned by the function
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            if future is None:
+                future = Future()
+                self._calls[key] = future
+                self.issued = self.issued + 1
+                leader = True
+            else:
+                self.coalesced = self.coalesced + 1
+                leader = False
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = function(*args)
+        except BaseException as error:
+            self._finish(key)
+            future.set_exception(error)
+            raise
+        self._finish(key)
+        future.set_result(result)
+        return result
+
+    def in_flight(self) -> int:
+        """Returns the number of calls currently running."""
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self) -> dict:
+        """
+        Description:
+
+            Function which gets the issued and coalesced counters
+
+        Arguments:
+
+            None
+
+        Returns:
+
+            stats {dict} : dictionary containing the counters of the single flight
+        """
+        with self._lock:
+            return {
+                    'name' : self.name,
+                    'issued' : self.issued,
+                    'coalesced' : self.coalesced,
+                    'in_flight' : len(self._calls)
+                    }
+
+    def _finish(self, key:any) -> None:
+        """Removes the call, so callers arriving after it has finished start a new call."""
+        with self._lock:
+            del self._calls[key]
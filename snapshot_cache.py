@@ -0,0 +1,169 @@
+"""Module used to cache snapshots of the data returned from the covid and news apis"""
+import logging
+import threading
+import time
+
+
+class SnapshotCache:
+    """
+    A TTL based cache which holds the last good snapshot returned by a loader function.
+
+    While the snapshot is younger than the ttl it is returned straight away. Once it is older it is
+    still returned (stale-while-revalidate), but a single background thread calls the loader again
+    so the next request gets the fresh snapshot. The loader is only called in the request thread
+    when there is no snapshot at all.
+    """
+    def __init__(self, loader, ttl:float, name:str='snapshot'):
+        self.loader = loader
+        self.ttl = ttl
+        self.name = name
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._value = None
+        self._loaded_at = None
+        self._refreshing = False
+        # increased every time a new snapshot is stored, so callers can skip work they did for the last snapshot
+        self.version = 0
+
+        # counters used to check that requests are not turning into upstream traffic
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.errors = 0
+
+    def get(self) -> any:
+        """
+        Description:
+
+            Function which returns the current snapshot, loading it if there isn't one yet and
+            starting a background refresh if it is older than the ttl.
+
+        Arguments:
+
+            None
+
+        Returns:
+
+            value {any} : the last good value returned by the loader
+        """
+        start_refresh = False
+        with self._lock:
+            if self._loaded_at is None:
+                has_snapshot = False
+            else:
+                has_snapshot = True
+                value = self._value
+                if self.age() < self.ttl:
+                    self.hits = self.hits + 1
+                else:
+                    self.stale_hits = self.stale_hits + 1
+                    if not self._refreshing:
+                        self._refreshing = True
+                        start_refresh = True
+
+        if not has_snapshot:
+            return self._load()
+
+        if start_refresh:
+            threading.Thread(target=self._refresh, name=self.name+'-refresh', daemon=True).start()
+
+        return value
+
+    def put(self, value:any, age:float=0) -> None:
+        """
+        Description:
+
+            Function to store a value which was loaded somewhere else (e.g. by a scheduled update) as the current snapshot
+
+        Arguments:
+
+            value {any} : the new snapshot
+
+            age {float} : how many seconds old the value already is. A value at least ttl seconds old is served but refreshed straight away
+
+        Returns:
+
+            None
+        """
+        with self._lock:
+            self._value = value
+            self._loaded_at = time.monotonic() - age
+            self.version = self.version + 1
+
+    def age(self) -> float:
+        """
+        Description:
+
+            Function which gets the number of seconds since the snapshot was loaded
+
+        Arguments:
+
+            None
+
+        Returns:
+
+            age {float} : seconds since the snapshot was loaded, None if there is no snapshot
+        """
+        if self._loaded_at is None:
+            return None
+        return time.monotonic() - self._loaded_at
+
+    def stats(self) -> dict:
+        """
+        Description:
+
+            Function which gets the hit, miss, refresh and error counters along with the age of the snapshot
+
+        Arguments:
+
+            None
+
+        Returns:
+
+            stats {dict} : dictionary containing the counters of the cache
+        """
+        return {
+                'name' : self.name,
+                'hits' : self.hits,
+                'stale_hits' : self.stale_hits,
+                'misses' : self.misses,
+                'refreshes' : self.refreshes,
+                'errors' : self.errors,
+                'age' : self.age()
+                }
+
+    def _load(self) -> any:
+        """Loads the first snapshot in the calling thread, making sure only one thread calls the loader."""
+        with self._load_lock:
+            with self._lock:
+                if self._loaded_at is not None:
+                    # another thread loaded the snapshot while this one was waiting
+                    self.hits = self.hits + 1
+                    return self._value
+                self.misses = self.misses + 1
+            try:
+                value = self.loader()
+            except Exception:
+                with self._lock:
+                    self.errors = self.errors + 1
+                raise
+            self.put(value)
+            return value
+
+    def _refresh(self) -> None:
+        """Calls the loader in a background thread, keeping the last good snapshot if it fails."""
+        try:
+            value = self.loader()
+        except Exception:
+            with self._lock:
+                self.errors = self.errors + 1
+            logging.exception('%s SNAPSHOT REFRESH FAILED, SERVING LAST GOOD SNAPSHOT', self.name.upper())
+        else:
+            self.put(value)
+            with self._lock:
+                self.refreshes = self.refreshes + 1
+            logging.info('%s SNAPSHOT REFRESHED', self.name.upper())
+        finally:
+            with self._lock:
+                self._refreshing = False
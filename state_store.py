@@ -0,0 +1,158 @@
+"""Module containing the store the global variables are published in as immutable snapshots"""
+import threading
+import time
+from collections import namedtuple
+from types import MappingProxyType
+
+# the values of all of the global variables at one point in time, with the version of each and when it last changed
+Snapshot = namedtuple('Snapshot', ['version', 'values', 'versions', 'changed_at'])
+
+
+class StateStore:
+    """
+    Named values published as immutable snapshots.
+
+    Readers take the current snapshot without a lock and can use it for as long as they like, as a published snapshot
+    (and the values in it) is never changed. Writers make a new snapshot, changing a copy of a value (copy-on-write),
+    and swap it in as one assignment, increasing the version of the snapshot and of the values which changed.
+    Writers take a lock so they don't lose each other's changes, and threads waiting for a change are woken up.
+    """
+    def __init__(self, values:dict):
+        self._condition = threading.Condition()
+        now = time.time()
+        self._snapshot = Snapshot(0,
+                                MappingProxyType(dict(values)),
+                                MappingProxyType({name : 0 for name in values}),
+                                MappingProxyType({name : now for name in values}))
+
+    def snapshot(self) -> Snapshot:
+        """
+        Description:
+
+            Function which gets the current snapshot, without taking a lock
+
+        Arguments:
+
+            None
+
+        Returns:
+
+            {Snapshot} : the current snapshot
+        """
+        return self._snapshot
+
+    def get(self, name:str) -> any:
+        """
+        Description:
+
+            Function which gets a value from the current snapshot, without taking a lock. The value must not be changed
+
+        Arguments:
+
+            name {str} : the name of the value
+
+        Returns:
+
+            {any} : the value
+        """
+        return self._snapshot.values[name]
+
+    def publish(self, name:str, value:any) -> Snapshot:
+        """
+        Description:
+
+            Function which publishes a new snapshot with the value replaced
+
+        Arguments:
+
+            name {str} : the name of the value
+
+            value {any} : the new value, which mustn't be changed once it is published
+
+        Returns:
+
+            {Snapshot} : the new snapshot
+        """
+        with self._condition:
+            return self._swap(name, value)
+
+    def update(self, name:str, change) -> any:
+        """
+        Description:
+
+            Function which copies a value, changes the copy and publishes it in a new snapshot. The change is made
+            while holding the writers' lock, so it should be quick
+
+        Arguments:
+
+            name {str} : the name of the value, which must have a copy method
+
+            change {function} : function which is given the copy to change
+
+        Returns:
+
+            {any} : the value returned by the change function
+        """
+        with self._condition:
+            value = self._snapshot.values[name].copy()
+            result = change(value)
+            self._swap(name, value)
+            return result
+
+    def replace(self, name:str, function) -> any:
+        """
+        Description:
+
+            Function which publishes the value returned by a function of the current value, e.g. a changed copy of it.
+            The function is called while holding the writers' lock, so it should be quick. If it returns the current
+            value nothing is published
+
+        Arguments:
+
+            name {str} : the name of the value
+
+            function {function} : function which is given the current value (which it mustn't change) and returns the new value
+
+        Returns:
+
+            {any} : the new value
+        """
+        with self._condition:
+            value = function(self._snapshot.values[name])
+            if value is not self._snapshot.values[name]:
+                self._swap(name, value)
+            return value
+
+    def wait_for_change(self, versions:dict, timeout:float=None) -> Snapshot:
+        """
+        Description:
+
+            Function which waits until the version of a value is different to the versions given, or the timeout passes
+
+        Arguments:
+
+            versions {dict} : the versions of the values, e.g. from the versions of a snapshot
+
+            timeout {float} : the maximum number of seconds to wait
+
+        Returns:
+
+            {Snapshot} : the current snapshot, whose versions are the same as versions if the timeout passed
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self._snapshot.versions != versions, timeout)
+            return self._snapshot
+
+    def _swap(self, name:str, value:any) -> Snapshot:
+        """Makes the new snapshot and swaps it in, the condition must be held."""
+        old = self._snapshot
+        values = dict(old.values)
+        values[name] = value
+        versions = dict(old.versions)
+        versions[name] = versions[name] + 1
+        changed_at = dict(old.changed_at)
+        changed_at[name] = time.time()
+
+        self._snapshot = Snapshot(old.version + 1, MappingProxyType(values), MappingProxyType(versions), MappingProxyType(changed_at))
+        self._condition.notify_all()
+        return self._snapshot
@@ -0,0 +1,14 @@
+from app_config import load_config
+import covid_data_handler
+import covid_news_handling
+import global_vars
+
+def test_load_config():
+    config = load_config()
+    assert load_config() is config
+    assert config['location'] == 'Exeter'
+
+def test_config_shared():
+    assert covid_data_handler.config is load_config()
+    assert covid_news_handling.config is load_config()
+    assert global_vars.config is load_config()
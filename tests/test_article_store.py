@@ -0,0 +1,84 @@
+from article_store import ArticleStore
+from article_store import article_of
+from article_store import article_key
+
+def make_entry(number):
+    return {'seen' : 0, 'articles' : {'title' : 'title '+str(number), 'url' : 'url '+str(number)}}
+
+def test_append():
+    store = ArticleStore()
+    store.append(make_entry(1))
+    assert len(store) == 1
+    assert store[0] == make_entry(1)
+    assert store == [make_entry(1)]
+
+def test_find_url():
+    store = ArticleStore([make_entry(1), make_entry(2)])
+    assert store.find_url('url 2')
+    assert not store.find_url('url 3')
+
+def test_mark_seen():
+    store = ArticleStore([make_entry(1), make_entry(2)])
+    assert store.mark_seen('title 2') == 1
+    assert store[1]['seen'] == 1
+    assert store[0]['seen'] == 0
+    assert store.mark_seen('title 3') == 0
+
+def test_article_of():
+    assert article_of(make_entry(1)) == {'title' : 'title 1', 'url' : 'url 1'}
+    assert article_of(1) is None
+
+def test_max_count():
+    store = ArticleStore([make_entry(number) for number in range(5)], max_count=3)
+    assert len(store) == 3
+    assert store[0] == make_entry(2)
+    assert store.stats()['evicted'] == 2
+
+def test_seen_evicted_first():
+    store = ArticleStore([make_entry(number) for number in range(3)], max_count=3)
+    store.mark_seen('title 1')
+    store.append(make_entry(3))
+    assert [entry['articles']['title'] for entry in store] == ['title 0', 'title 2', 'title 3']
+
+def test_max_bytes():
+    store = ArticleStore(max_bytes=1000)
+    for number in range(10):
+        store.append(make_entry(number))
+    assert store.stats()['bytes'] <= 1000
+    assert len(store) == 4
+
+def test_dismissed_url_found_after_eviction():
+    store = ArticleStore([make_entry(1)], max_count=1)
+    store.mark_seen('title 1')
+    store.append(make_entry(2))
+    assert len(store) == 1
+    assert store.find_url('url 1')
+    assert not store.find_url('url 3')
+
+def test_seen_content_dropped():
+    entry = make_entry(1)
+    entry['articles']['content'] = 'content'
+    store = ArticleStore([entry])
+    store.mark_seen('title 1')
+    assert store[0]['articles'] == {'title' : 'title 1', 'url' : 'url 1'}
+
+def test_copy():
+    store = ArticleStore([make_entry(1)])
+    copy = store.copy()
+    copy.append(make_entry(2))
+    copy.mark_seen('title 1')
+    assert store == [make_entry(1)]
+    assert not store.find_url('url 2')
+    assert copy[0]['seen'] == 1
+
+def test_evicted_url_found():
+    store = ArticleStore([make_entry(number) for number in range(3)], max_count=2)
+    # the evicted article is remembered so it isn't added back by the next refresh
+    assert store.find_url('url 0')
+    assert store.stats()['dismissed'] == 1
+
+def test_articles_without_url():
+    store = ArticleStore([{'seen' : 0, 'articles' : {'title' : 'title '+str(number), 'url' : None}} for number in range(2)])
+    assert len(store) == 2
+    assert store.find_url(article_key({'title' : 'title 1', 'url' : None}))
+    assert not store.find_url(None)
@@ -0,0 +1,34 @@
+import numpy as np
+from covid_csv_columns import load_covid_csv_columns
+from covid_csv_columns import parse_dates
+from covid_csv_columns import covid_csv_summary
+from covid_csv_columns import process_covid_csv_columns
+from covid_data_handler import parse_csv_data
+
+HEADER = 'areaCode,areaName,areaType,date,cumDailyNsoDeathsByDeathDate,hospitalCases,newCasesBySpecimenDate'
+
+def test_load_covid_csv_columns():
+    data = load_covid_csv_columns('nation_2021-10-28.csv')
+    assert len(data['date']) == 638
+    assert data['date'][0] == np.datetime64('2021-10-28')
+    assert np.isnan(data['newCasesBySpecimenDate'][0])
+    assert data['hospitalCases'][0] == 7019
+
+def test_parse_dates():
+    data = parse_dates(np.array(['28/10/2021', '01/02/2020']))
+    assert list(data) == [np.datetime64('2021-10-28'), np.datetime64('2020-02-01')]
+    assert parse_dates(np.array(['2021-10-28']))[0] == np.datetime64('2021-10-28')
+
+def test_process_covid_csv_columns():
+    data = load_covid_csv_columns(parse_csv_data('nation_2021-10-28.csv'))
+    assert process_covid_csv_columns(data) == (240_299, 7_019, 141_544)
+
+def test_covid_csv_summary():
+    # two areas with their rows out of order
+    lines = [HEADER]
+    for day in range(1, 11):
+        lines.append(f'B1,Area B,ltla,{day:02d}/01/2021,{day * 10 if day < 9 else ""},{day},{day}')
+        lines.append(f'A1,Area A,ltla,{day:02d}/01/2021,,,{100}')
+    data = covid_csv_summary(load_covid_csv_columns([HEADER] + lines[:0:-1]))
+    assert data['B1'] == (3 + 4 + 5 + 6 + 7 + 8 + 9, 10, 80)
+    assert data['A1'] == (700, None, None)
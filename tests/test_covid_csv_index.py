@@ -0,0 +1,40 @@
+import os
+import shutil
+from datetime import date
+from covid_csv_index import IndexedCovidCsv
+from covid_csv_index import normalise_date
+
+def copy_csv(tmp_path):
+    path = str(tmp_path / 'nation.csv')
+    shutil.copy('nation_2021-10-28.csv', path)
+    return path
+
+def test_normalise_date():
+    assert normalise_date('28/10/2021') == '2021-10-28'
+    assert normalise_date('2021-10-28') == '2021-10-28'
+    assert normalise_date(date(2021, 10, 28)) == '2021-10-28'
+
+def test_lookup(tmp_path):
+    with IndexedCovidCsv(copy_csv(tmp_path)) as csv_data:
+        row = csv_data.lookup('E92000001', '15/10/2021')
+        assert row['cumDailyNsoDeathsByDeathDate'] == 141_544
+        assert row['areaName'] == 'England'
+        assert csv_data.lookup_value('E92000001', date(2021, 10, 28), 'hospitalCases') == 7_019
+        assert csv_data.lookup_value('E92000001', date(2021, 10, 28), 'newCasesBySpecimenDate') is None
+        assert csv_data.lookup('E92000001', '2030-01-01') is None
+
+def test_index_reused(tmp_path):
+    path = copy_csv(tmp_path)
+    IndexedCovidCsv(path).close()
+    assert os.path.exists(path+'.idx.json')
+    modified_time = os.stat(path+'.idx.json').st_mtime_ns
+    IndexedCovidCsv(path).close()
+    assert os.stat(path+'.idx.json').st_mtime_ns == modified_time
+
+def test_index_invalidated(tmp_path):
+    path = copy_csv(tmp_path)
+    IndexedCovidCsv(path).close()
+    with open(path, 'a') as csv_file:
+        csv_file.write('E92000001,England,nation,29/10/2021,,7100,9000\n')
+    with IndexedCovidCsv(path) as csv_data:
+        assert csv_data.lookup_value('E92000001', '2021-10-29', 'hospitalCases') == 7_100
@@ -0,0 +1,51 @@
+import tracemalloc
+from covid_csv_stream import iter_csv_rows
+from covid_csv_stream import iter_covid_records
+from covid_csv_stream import RecentWindow
+from covid_csv_stream import stream_covid_csv_summary
+from covid_csv_stream import process_covid_csv_stream
+from covid_csv_columns import load_covid_csv_columns
+from covid_csv_columns import covid_csv_summary
+
+HEADER = 'areaCode,areaName,areaType,date,cumDailyNsoDeathsByDeathDate,hospitalCases,newCasesBySpecimenDate\n'
+
+def write_csv(path, areas, days):
+    with open(path, 'w') as csv_file:
+        csv_file.write(HEADER)
+        for area in range(areas):
+            for day in range(days):
+                csv_file.write(f'A{area},Area {area},ltla,{day % 28 + 1:02d}/{day // 28 % 12 + 1:02d}/{2000 + day // 336},'
+                               f'{day if day % 5 else ""},{day % 7 or ""},{day if day % 3 else ""}\n')
+
+def test_iter_covid_records():
+    records = iter_covid_records(iter_csv_rows('nation_2021-10-28.csv'))
+    record = next(records)
+    assert record.date == '2021-10-28'
+    assert record.hospital_cases == 7019
+    assert record.new_cases is None
+    assert len(list(records)) == 637
+
+def test_recent_window():
+    window = RecentWindow(3)
+    for day, value in [('2021-01-02', 2), ('2021-01-04', 4), ('2021-01-01', 1), ('2021-01-03', 3)]:
+        window.add(day, value)
+    assert window.newest() == [4, 3, 2]
+
+def test_process_covid_csv_stream():
+    assert process_covid_csv_stream('nation_2021-10-28.csv') == (240_299, 7_019, 141_544)
+
+def test_stream_covid_csv_summary(tmp_path):
+    path = str(tmp_path / 'areas.csv')
+    write_csv(path, 5, 400)
+    columns_summary = covid_csv_summary(load_covid_csv_columns(path))
+    stream_summary = stream_covid_csv_summary(path)
+    assert {area: data[:3] for area, data in stream_summary.items()} == columns_summary
+
+def test_stream_covid_csv_summary_memory(tmp_path):
+    path = str(tmp_path / 'large.csv')
+    write_csv(path, 10, 5000)
+    tracemalloc.start()
+    stream_covid_csv_summary(path)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert peak < 200_000
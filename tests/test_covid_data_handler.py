@@ -9,6 +9,7 @@ from covid_data_handler import get_cum_deaths
 from covid_data_handler import get_location
 from covid_data_handler import covid_data_collector
 from covid_data_handler import update_covid
+from covid_data_handler import incremental_covid_data_collector
 
 import global_vars
 
@@ -30,6 +31,11 @@ def test_covid_API_request():
     data = covid_API_request()
     assert isinstance(data, dict)
 
+def test_covid_API_request_recent_days():
+    data = covid_API_request('England', 'nation', recent_days=20)
+    assert data['length'] == 20
+    assert data['totalPages'] == 1
+
 def test_get_num_cases():
     global test_dict
     data = get_num_cases(test_dict)
@@ -50,6 +56,11 @@ def test_get_location():
 def test_covid_data_collector():
     data = covid_data_collector()
 
+def test_incremental_covid_data_collector():
+    data = incremental_covid_data_collector()
+    assert len(data) == 6
+    assert incremental_covid_data_collector() == data
+
 def test_schedule_covid_updates():
     schedule_covid_updates(update_interval=10, update_name='update test')
 
@@ -0,0 +1,118 @@
+import json
+import threading
+import time
+from datetime import date, timedelta
+
+import requests
+
+import covid_data_handler
+from covid_data_handler import incremental_covid_data_collector
+from covid_data_handler import get_hospital_cases
+from covid_data_handler import get_cum_deaths
+from covid_data_handler import covid_areas_collector
+from covid_data_handler import merge_covid_rows
+from covid_data_handler import days_to_request
+from covid_data_handler import covid_API_request
+from metrics import UPSTREAM_BYTES
+
+def make_rows(location:str, days:int, revised:dict=None) -> list:
+    # newest row first, like the dictionary returned from covid_API_request
+    rows = []
+    for i in range(days):
+        deaths = 1000 - i if revised is None else revised.get(i, 1000 - i)
+        rows.append({'areaName' : location, 'date' : str(date.today() - timedelta(days=i)),
+                     'cumDeaths28DaysByDeathDate' : deaths, 'hospitalCases' : 100, 'newCasesByPublishDate' : 10})
+    return rows
+
+def test_incremental_covid_data_collector_revised(monkeypatch):
+    local_area = (covid_data_handler.config['location'], covid_data_handler.config['location_type'])
+    national_area = (covid_data_handler.config['national_location'], 'nation')
+    held = {local_area : make_rows(local_area[0], 28)[::-1], national_area : make_rows(national_area[0], 28)[::-1]}
+    monkeypatch.setattr(covid_data_handler, 'COVID_SERIES', held)
+
+    def revised_request(areas, recent_days=None):
+        # the deaths of 14 days ago were revised after they were first published
+        return {area : {'data' : make_rows(area[0], recent_days, {14 : 5000})} for area in areas}
+    monkeypatch.setattr(covid_data_handler, 'covid_areas_collector', revised_request)
+    data = incremental_covid_data_collector()
+    assert data[5] == 'Total Deaths: 5000'
+
+def test_get_hospital_cases_missing():
+    rows = make_rows('England', 20)
+    rows[2]['hospitalCases'] = None
+    rows[3]['hospitalCases'] = 90
+    # an empty value (e.g. loaded from a series file) is taken from the next older row
+    assert get_hospital_cases({'data' : rows}) == 90
+    for row in rows:
+        row['cumDeaths28DaysByDeathDate'] = None
+    assert get_cum_deaths({'data' : rows}) is None
+
+def test_covid_areas_collector(monkeypatch):
+    def request(location, location_type, recent_days=None):
+        if location == 'Broken':
+            raise ConnectionError('no data')
+        return {'data' : make_rows(location, recent_days)}
+    monkeypatch.setattr(covid_data_handler, 'request_and_store_area', request)
+    data = covid_areas_collector([('England', 'nation'), ('Broken', 'ltla')], recent_days=3)
+    assert data[('England', 'nation')]['data'][0]['areaName'] == 'England'
+    assert data[('Broken', 'ltla')] is None
+    assert covid_areas_collector([]) == {}
+
+def test_covid_areas_collector_timeout(monkeypatch):
+    release = threading.Event()
+    def slow_request(location, location_type, recent_days=None):
+        if location == 'Stuck':
+            release.wait(5)
+        else:
+            time.sleep(0.1)
+        return {'data' : [], 'location' : location}
+    monkeypatch.setattr(covid_data_handler, 'request_and_store_area', slow_request)
+    monkeypatch.setitem(covid_data_handler.config, 'covid_max_workers', 2)
+    # each batch of covid_max_workers areas is given the timeout
+    areas = [('A', 'ltla'), ('B', 'ltla'), ('C', 'ltla')]
+    data = covid_areas_collector(areas, timeout=0.5)
+    assert [data[area]['location'] for area in areas] == ['A', 'B', 'C']
+    data = covid_areas_collector([('Stuck', 'ltla'), ('A', 'ltla')], timeout=0.5)
+    assert data[('Stuck', 'ltla')] is None
+    assert data[('A', 'ltla')]['location'] == 'A'
+    release.set()
+    # the threads are shared between calls instead of new ones being made each time
+    assert covid_data_handler.covid_executor() is covid_data_handler.covid_executor()
+
+def test_merge_covid_rows():
+    held = [{'date' : '2021-10-01', 'hospitalCases' : 1}, {'date' : '2021-10-02', 'hospitalCases' : 2}]
+    new = [{'date' : '2021-10-03', 'hospitalCases' : 3}, {'date' : '2021-10-02', 'hospitalCases' : 20}]
+    merge_covid_rows(held, new, 2)
+    assert held == [{'date' : '2021-10-02', 'hospitalCases' : 20}, {'date' : '2021-10-03', 'hospitalCases' : 3}]
+
+def test_merge_covid_rows_gap():
+    held = [{'date' : '2021-10-01', 'hospitalCases' : 1}, {'date' : '2021-10-03', 'hospitalCases' : 3}]
+    new = [{'date' : '2021-10-04', 'hospitalCases' : 4}, {'date' : '2021-10-02', 'hospitalCases' : 2}]
+    merge_covid_rows(held, new)
+    # the missing day is inserted in date order, not dropped
+    assert [row['date'] for row in held] == ['2021-10-01', '2021-10-02', '2021-10-03', '2021-10-04']
+    assert held[1]['hospitalCases'] == 2
+
+def test_days_to_request():
+    assert days_to_request([]) == 28
+    assert days_to_request([{'date' : str(date.today() - timedelta(days=2))}]) == 30
+
+class PageResponse:
+    # a response of the covid api with the rows of one page, or no content after the last page
+    def __init__(self, rows:list):
+        self.status_code = 200 if len(rows) > 0 else 204
+        self.headers = {'Last-Modified' : 'Thu, 28 Oct 2021 15:00:00 GMT'}
+        self.content = json.dumps({'data' : rows}).encode()
+
+    def json(self):
+        return json.loads(self.content)
+
+def test_covid_API_request_counts_bytes(monkeypatch):
+    pages = [make_rows('England', 20), make_rows('England', 5), []]
+    monkeypatch.setattr(requests, 'get', lambda url, params, timeout: PageResponse(pages[params['page'] - 1]))
+    before = UPSTREAM_BYTES.value('covid')
+    # the whole history is requested when no number of days is given, and its bytes are counted too
+    data = covid_API_request('England', 'nation')
+    assert data['length'] == 25
+    assert data['totalPages'] == 2
+    assert UPSTREAM_BYTES.value('covid') - before == data['payloadBytes'] > 0
@@ -0,0 +1,71 @@
+import os
+from covid_series_cache import series_cache_filename
+from covid_series_cache import series_from_dictionary
+from covid_series_cache import dictionary_from_series
+from covid_series_cache import save_series
+from covid_series_cache import load_series
+from covid_series_cache import append_series
+from covid_series_cache import store_covid_dictionary
+from covid_series_cache import load_covid_dictionary
+
+def make_dictionary(days, first_day=1):
+    data = []
+    for day in range(first_day + days - 1, first_day - 1, -1):
+        data.append({
+            'areaCode' : 'E92000001',
+            'areaName' : 'England',
+            'areaType' : 'nation',
+            'date' : f'2021-10-{day:02d}',
+            'cumDeaths28DaysByDeathDate' : None if day > 20 else 1000 + day,
+            'hospitalCases' : day * 10,
+            'newCasesByPublishDate' : day * 100
+        })
+    return {'data' : data, 'lastUpdate' : None, 'length' : len(data), 'totalPages' : 1}
+
+def test_series_cache_filename():
+    assert series_cache_filename('cache', 'Isle of Wight', 'ltla') == os.path.join('cache', 'ltla_Isle_of_Wight.cvds')
+
+def test_series_round_trip(tmp_path):
+    dictionary = make_dictionary(25)
+    series = series_from_dictionary(dictionary)
+    assert list(series['hospitalCases'][:2]) == [10, 20]
+    filename = str(tmp_path / 'england.cvds')
+    save_series(filename, series, {'areaName' : 'England'})
+    loaded_series, meta = load_series(filename)
+    assert meta == {'areaName' : 'England'}
+    assert dictionary_from_series(loaded_series, meta)['data'][0]['date'] == '2021-10-25'
+    assert dictionary_from_series(loaded_series, meta)['data'][0]['cumDeaths28DaysByDeathDate'] is None
+    assert dictionary_from_series(loaded_series, meta, 5)['length'] == 5
+
+def test_load_series_missing(tmp_path):
+    assert load_series(str(tmp_path / 'missing.cvds')) == (None, None)
+
+def test_append_series(tmp_path):
+    filename = str(tmp_path / 'england.cvds')
+    save_series(filename, series_from_dictionary(make_dictionary(10)), {})
+    # days 8 to 12, only 11 and 12 are new
+    assert append_series(filename, series_from_dictionary(make_dictionary(5, 8))) == 2
+    series, meta = load_series(filename)
+    assert len(series) == 12
+    assert series['newCasesByPublishDate'][-1] == 1200
+
+def test_store_covid_dictionary(tmp_path):
+    store_covid_dictionary(str(tmp_path), 'England', 'nation', make_dictionary(10))
+    store_covid_dictionary(str(tmp_path), 'England', 'nation', make_dictionary(10, 5))
+    dictionary = load_covid_dictionary(str(tmp_path), 'England', 'nation')
+    assert dictionary['length'] == 14
+    assert dictionary['data'][0]['areaName'] == 'England'
+    assert load_covid_dictionary(str(tmp_path), 'Exeter', 'ltla') is None
+
+def test_store_covid_dictionary_revised(tmp_path):
+    store_covid_dictionary(str(tmp_path), 'England', 'nation', make_dictionary(10))
+    revised = make_dictionary(4, 8)
+    for row in revised['data']:
+        row['hospitalCases'] = row['hospitalCases'] + 1
+    # day 9 is missing from the new rows, so its saved row is kept
+    del revised['data'][2]
+    store_covid_dictionary(str(tmp_path), 'England', 'nation', revised)
+    dictionary = load_covid_dictionary(str(tmp_path), 'England', 'nation')
+    assert [row['date'][-2:] for row in dictionary['data']][0:5] == ['11', '10', '09', '08', '07']
+    assert [row['hospitalCases'] for row in dictionary['data']][0:5] == [111, 101, 90, 81, 70]
+    assert dictionary['length'] == 11
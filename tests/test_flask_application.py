@@ -0,0 +1,191 @@
+import gzip
+import threading
+import time
+import global_vars
+import flask_application
+from profiler import PROFILE_LOCK
+from flask_application import app
+from flask_application import FRAGMENT_CACHE
+from flask_application import change_events
+from flask_application import server_sent_event
+from covid_data_handler import COVID_SNAPSHOT
+from covid_news_handling import news_snapshot
+from covid_news_handling import merge_news_articles
+
+def test_server_sent_event():
+    assert server_sent_event('news', 'line 1\nline 2', 3) == 'event: news\nid: 3\ndata: line 1\ndata: line 2\n\n'
+
+def test_change_events():
+    global_vars.init()
+    with app.app_context():
+        events = change_events(global_vars.retrieve_versions())
+        global_vars.update_covid_data_list(['Exeter', 'England', 10, 20, 'Hospital Cases: 30', 'Total Deaths: 40'])
+        event = next(events)
+        assert event.startswith('event: covid_stats\n')
+        assert 'Local 7-day infection rate in Exeter: 10' in event
+
+        global_vars.update_updates([{'title' : 'test', 'content' : 'Updates news articles at 10:00.'}])
+        event = next(events)
+        assert event.startswith('event: updates\n')
+        assert 'Updates news articles at 10:00.' in event
+
+def test_change_events_unchanged():
+    global_vars.init()
+    global_vars.update_covid_data_list([1, 2, 3])
+    versions = global_vars.retrieve_versions()
+    # the same data doesn't change the version
+    global_vars.update_covid_data_list([1, 2, 3])
+    assert global_vars.retrieve_versions() == versions
+
+def test_api_covid():
+    global_vars.init()
+    global_vars.update_covid_data_list(['Exeter', 'England', 10, 20, 'Hospital Cases: 30', 'Total Deaths: 40'])
+    client = app.test_client()
+    response = client.get('/api/covid')
+    assert response.status_code == 200
+    assert response.get_json()['location'] == 'Exeter'
+    etag = response.headers['ETag']
+    assert response.headers['Last-Modified']
+
+    response = client.get('/api/covid', headers={'If-None-Match' : etag})
+    assert response.status_code == 304
+    assert response.data == b''
+
+    global_vars.update_covid_data_list(['Exeter', 'England', 11, 20, 'Hospital Cases: 30', 'Total Deaths: 40'])
+    response = client.get('/api/covid', headers={'If-None-Match' : etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+
+def test_api_etag_after_restart(monkeypatch):
+    global_vars.init()
+    client = app.test_client()
+    etag = client.get('/api/covid').headers['ETag']
+    # another process starts its versions from 0 too, so its ETags mustn't match
+    monkeypatch.setattr(flask_application, 'BOOT_ID', 'restarted')
+    response = client.get('/api/covid', headers={'If-None-Match' : etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+
+def test_api_updates():
+    global_vars.init()
+    global_vars.update_updates([{'title' : 'test', 'content' : 'Updates news articles at 10:00.'}])
+    response = app.test_client().get('/api/updates')
+    assert response.get_json() == [{'title' : 'test', 'content' : 'Updates news articles at 10:00.'}]
+
+def test_api_news():
+    global_vars.init()
+    global_vars.update_articles([{'seen' : 0, 'articles' : {'title' : 'a', 'url' : 'u'}}, {'seen' : 1, 'articles' : {'title' : 'b', 'url' : 'v'}}])
+    response = app.test_client().get('/api/news')
+    assert response.get_json() == [{'title' : 'a', 'url' : 'u'}]
+
+def test_index2_page_cache():
+    global_vars.init()
+    global_vars.update_covid_data_list(['Exeter', 'England', 10, 20, 'Hospital Cases: 30', 'Total Deaths: 40'])
+    client = app.test_client()
+    misses = FRAGMENT_CACHE.stats()['misses']
+    response = client.get('/index')
+    assert response.status_code == 200
+    assert 'Local 7-day infection rate in Exeter: 10' in response.get_data(as_text=True)
+    assert client.get('/index').data == response.data
+    assert FRAGMENT_CACHE.stats()['misses'] == misses + 1
+
+    global_vars.update_covid_data_list(['Exeter', 'England', 11, 20, 'Hospital Cases: 30', 'Total Deaths: 40'])
+    assert 'Local 7-day infection rate in Exeter: 11' in client.get('/index').get_data(as_text=True)
+
+def test_index2_gzip():
+    global_vars.init()
+    global_vars.update_covid_data_list(['Exeter', 'England', 10, 20, 'Hospital Cases: 30', 'Total Deaths: 40'])
+    client = app.test_client()
+    response = client.get('/index', headers={'Accept-Encoding' : 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Exeter: 10' in gzip.decompress(response.data).decode('utf8')
+
+def test_metrics():
+    global_vars.init()
+    global_vars.update_articles([{'seen' : 0, 'articles' : {'title' : 'a', 'url' : 'u'}}, {'seen' : 1, 'articles' : {'title' : 'b', 'url' : 'v'}}])
+    client = app.test_client()
+    client.get('/index')
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+    text = response.get_data(as_text=True)
+    assert '# TYPE covid_dashboard_latency_seconds histogram' in text
+    assert 'covid_dashboard_latency_seconds_count{operation="render_page"}' in text
+    assert 'covid_dashboard_articles{state="all"} 2' in text
+    assert 'covid_dashboard_articles{state="seen"} 1' in text
+    assert 'covid_dashboard_cache_requests_total{cache="page",result="misses"}' in text
+    assert 'covid_dashboard_threads ' in text
+
+def test_debug_profile_disabled(monkeypatch):
+    monkeypatch.setitem(flask_application.config, 'debug_profiling', False)
+    assert app.test_client().get('/debug/profile?seconds=0.1').status_code == 404
+    assert app.test_client().get('/debug/memory?seconds=0.1').status_code == 404
+
+def test_debug_profile(monkeypatch):
+    monkeypatch.setitem(flask_application.config, 'debug_profiling', True)
+    monkeypatch.setitem(flask_application.config, 'debug_token', 'secret')
+    client = app.test_client()
+    assert client.get('/debug/profile?seconds=0.1').status_code == 403
+    assert client.get('/debug/profile?seconds=1000&token=secret').status_code == 400
+
+    stop = threading.Event()
+    worker = threading.Thread(target=stop.wait, name='profiled-thread')
+    worker.start()
+    response = client.get('/debug/profile?seconds=0.1&token=secret')
+    stop.set()
+    assert response.status_code == 200
+    assert 'profiled-thread;' in response.get_data(as_text=True)
+    assert 'samples' in client.get('/debug/profile?seconds=0.1&format=top&token=secret').get_data(as_text=True)
+    assert client.get('/debug/memory?seconds=0.1&token=secret').get_data(as_text=True).startswith('traced')
+
+def test_debug_profile_busy(monkeypatch):
+    monkeypatch.setitem(flask_application.config, 'debug_profiling', True)
+    monkeypatch.setitem(flask_application.config, 'debug_token', 'secret')
+    with PROFILE_LOCK:
+        assert app.test_client().get('/debug/profile?seconds=0.1&token=secret').status_code == 409
+
+def test_debug_profile_no_token(monkeypatch):
+    monkeypatch.setitem(flask_application.config, 'debug_profiling', True)
+    monkeypatch.setitem(flask_application.config, 'debug_token', '')
+    # the pages aren't served without a token, even with ?token= empty
+    assert app.test_client().get('/debug/profile?seconds=0.1').status_code == 403
+    assert app.test_client().get('/debug/memory?seconds=0.1&token=').status_code == 403
+
+def test_index_merges_news_once(monkeypatch):
+    global_vars.init()
+    COVID_SNAPSHOT.put(('Exeter', 'England', 10, 20, 'Hospital Cases: 30', 'Total Deaths: 40'))
+    news_snapshot().put({'articles' : [{'title' : 'a', 'url' : 'u', 'content' : 'content [+10 chars]'}]})
+    merges = []
+    def counted_merge(articles, news_list):
+        merges.append(len(news_list))
+        return merge_news_articles(articles, news_list)
+    monkeypatch.setattr(flask_application, 'merge_news_articles', counted_merge)
+    client = app.test_client()
+    assert client.get('/').status_code == 200
+    assert client.get('/').status_code == 200
+    assert merges == [1]
+    assert global_vars.retrieve_articles()[0]['articles']['title'] == 'a'
+
+    # a new news snapshot is merged
+    news_snapshot().put({'articles' : [{'title' : 'b', 'url' : 'v', 'content' : 'content [+10 chars]'}]})
+    client.get('/')
+    assert merges == [1, 1]
+    assert len(global_vars.retrieve_articles()) == 2
+
+def test_stream_limit(monkeypatch):
+    monkeypatch.setattr(flask_application, 'STREAM_SLOTS', threading.BoundedSemaphore(1))
+    client = app.test_client()
+    response = client.get('/stream', buffered=False)
+    assert response.status_code == 200
+    # the only slot is held by the open stream
+    assert client.get('/stream').status_code == 503
+    response.close()
+    assert flask_application.STREAM_SLOTS.acquire(blocking=False)
+
+def test_change_events_max_seconds():
+    global_vars.init()
+    with app.app_context():
+        start = time.monotonic()
+        # the stream ends once it has been open for max_seconds, so the page reconnects
+        assert list(change_events(global_vars.retrieve_versions(), 0.2)) == []
+        assert time.monotonic() - start < 5
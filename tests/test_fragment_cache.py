@@ -0,0 +1,31 @@
+import gzip
+from fragment_cache import FragmentCache
+from fragment_cache import compressed_variants
+
+def test_fragment():
+    cache = FragmentCache()
+    renders = []
+
+    def render():
+        renders.append(1)
+        return 'fragment '+str(len(renders))
+
+    assert cache.fragment('news', 1, render) == 'fragment 1'
+    assert cache.fragment('news', 1, render) == 'fragment 1'
+    assert cache.fragment('news', 2, render) == 'fragment 2'
+    assert len(renders) == 2
+
+def test_page():
+    cache = FragmentCache()
+    page = cache.page((1, 1, 1), lambda: 'page')
+    assert page['identity'] == b'page'
+    assert gzip.decompress(page['gzip']) == b'page'
+    assert cache.page((1, 1, 1), lambda: 'changed') is page
+    assert cache.page((1, 2, 1), lambda: 'changed')['identity'] == b'changed'
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 2
+
+def test_compressed_variants():
+    variants = compressed_variants(b'<html></html>' * 100)
+    assert gzip.decompress(variants['gzip']) == variants['identity']
+    assert len(variants['gzip']) < len(variants['identity'])
@@ -0,0 +1,80 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from urllib3.util.retry import RequestHistory
+from http_session import JitterRetry
+from http_session import make_session
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # headers and body are written separately, which Nagle's algorithm would delay on a kept-alive connection
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        self.server.connections.add(self.client_address)
+        if self.server.failures > 0:
+            self.server.failures = self.server.failures - 1
+            status, body = 503, b''
+        else:
+            status, body = 200, json.dumps({'articles' : []}).encode()
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.requests = []
+    server.connections = set()
+    server.failures = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def stub_url(server):
+    return 'http://127.0.0.1:'+str(server.server_address[1])+'/v2/everything'
+
+def test_make_session_reuses_connection(stub_server):
+    session = make_session(pool_size=2, timeout=5)
+    for i in range(5):
+        assert session.get(stub_url(stub_server), params={'q' : 'Covid'}).json() == {'articles' : []}
+    assert len(stub_server.requests) == 5
+    assert len(stub_server.connections) == 1
+    assert stub_server.requests[0] == '/v2/everything?q=Covid'
+
+def test_make_session_retries(stub_server):
+    stub_server.failures = 2
+    session = make_session(timeout=5, retries=3, backoff=0, jitter=0)
+    response = session.get(stub_url(stub_server))
+    assert response.status_code == 200
+    assert len(stub_server.requests) == 3
+
+def test_make_session_gives_up(stub_server):
+    stub_server.failures = 5
+    session = make_session(timeout=5, retries=1, backoff=0, jitter=0)
+    response = session.get(stub_url(stub_server))
+    assert response.status_code == 503
+    assert len(stub_server.requests) == 2
+
+def test_make_session_timeout():
+    session = make_session(timeout=7)
+    assert session.timeout == 7
+
+def test_jitter_retry():
+    failure = RequestHistory('GET', '/v2/everything', None, 503, None)
+    retry = JitterRetry(total=5, backoff_factor=1, jitter=0.5)
+    assert retry.get_backoff_time() == 0
+    # the jitter is kept by the new Retry made after each failure
+    retry = retry.new(history=(failure, failure))
+    assert retry.jitter == 0.5
+    for i in range(20):
+        assert 2 <= retry.get_backoff_time() <= 2.5
+    assert JitterRetry(total=5, backoff_factor=1).new(history=(failure, failure)).get_backoff_time() == 2
@@ -0,0 +1,31 @@
+import logging
+from logging.handlers import QueueHandler
+import log_handling
+from log_handling import setup_logging, stop_logging
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(self.format(record))
+
+def test_setup_logging():
+    stop_logging()
+    handler = ListHandler()
+    try:
+        listener = setup_logging(handler)
+        assert setup_logging() is listener
+        assert sum(isinstance(root_handler, QueueHandler) for root_handler in logging.getLogger().handlers) == 1
+
+        logging.info('REMOVED UPDATE: %s at %s', 'test', '10:00')
+        logging.debug('NOT LOGGED %s', 'test')
+    finally:
+        stop_logging()
+    assert len(handler.messages) == 1
+    assert handler.messages[0].startswith('INFO: ')
+    assert handler.messages[0].endswith(': REMOVED UPDATE: test at 10:00')
+    assert log_handling.LISTENER is None
+    assert not any(isinstance(root_handler, QueueHandler) for root_handler in logging.getLogger().handlers)
+    setup_logging()
@@ -0,0 +1,55 @@
+import math
+import pytest
+from metrics import Registry, Histogram, format_value
+
+def test_counter():
+    registry = Registry()
+    counter = registry.counter('test_bytes_total', 'Bytes.', ('api',))
+    counter.inc('news', amount=10)
+    counter.inc('news', amount=5)
+    counter.inc('covid')
+    assert counter.value('news') == 15
+    assert counter.value('covid') == 1
+    text = registry.render()
+    assert '# HELP test_bytes_total Bytes.\n# TYPE test_bytes_total counter\n' in text
+    assert 'test_bytes_total{api="news"} 15\n' in text
+
+def test_histogram():
+    registry = Registry()
+    histogram = registry.histogram('test_seconds', 'Latency.', ('operation',), buckets=(0.1, 1))
+    histogram.observe(0.05, 'a')
+    histogram.observe(0.1, 'a')
+    histogram.observe(0.5, 'a')
+    histogram.observe(5, 'a')
+    assert histogram.count('a') == 4
+    text = registry.render()
+    assert 'test_seconds_bucket{operation="a",le="0.1"} 2\n' in text
+    assert 'test_seconds_bucket{operation="a",le="1"} 3\n' in text
+    assert 'test_seconds_bucket{operation="a",le="+Inf"} 4\n' in text
+    assert 'test_seconds_count{operation="a"} 4\n' in text
+    assert 'test_seconds_sum{operation="a"} 5.65\n' in text
+
+def test_histogram_time():
+    histogram = Histogram('test_seconds', 'Latency.')
+    with pytest.raises(ValueError):
+        with histogram.time():
+            raise ValueError
+    assert histogram.count() == 1
+
+def test_callback():
+    registry = Registry()
+    registry.callback('test_threads', 'Threads.', 'gauge', lambda: 3)
+    registry.callback('test_ratio', 'Ratio.', 'gauge', lambda: {('page',) : 0.5}, ('cache',))
+    text = registry.render()
+    assert '# TYPE test_threads gauge\ntest_threads 3\n' in text
+    assert 'test_ratio{cache="page"} 0.5\n' in text
+
+def test_format_labels_escaped():
+    registry = Registry()
+    registry.counter('test_total', 'Test.', ('name',)).inc('a "quoted"\nname')
+    assert 'test_total{name="a \\"quoted\\"\\nname"} 1\n' in registry.render()
+
+def test_format_value():
+    assert format_value(math.inf) == '+Inf'
+    assert format_value(2.0) == '2'
+    assert format_value(0.25) == '0.25'
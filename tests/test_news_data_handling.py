@@ -3,7 +3,9 @@ from covid_news_handling import update_news
 from covid_news_handling import find_article
 from covid_news_handling import news_dictionary_maker
 from covid_news_handling import article_seen
+from covid_news_handling import merge_news_articles
 import global_vars
+from article_store import ArticleStore
 
 # setup data for test
 global_vars.init()
@@ -34,3 +36,18 @@ def test_article_seen():
     }])
     article_seen('this is a title')
     assert global_vars.retrieve_articles()[0]['seen'] == 1
+
+def test_merge_news_articles():
+    global_vars.init()
+    news_list = [{'title' : 'title 1', 'url' : 'url 1'}, {'title' : 'title 2', 'url' : 'url 2'}, {'title' : 'title 1', 'url' : 'url 1'}]
+    articles = merge_news_articles([], news_list)
+    assert len(articles) == 2
+    assert len(merge_news_articles(articles, news_list)) == 2
+
+def test_merge_news_articles_after_eviction():
+    global_vars.init()
+    news_list = [{'title' : 'title '+str(number), 'url' : 'url '+str(number)} for number in range(3)] + [{'title' : 'no url', 'url' : None}]
+    articles = merge_news_articles(ArticleStore(max_count=2), news_list)
+    assert [entry['articles']['title'] for entry in articles] == ['title 2', 'no url']
+    # the evicted articles aren't added back, so a full store isn't changed by the same refresh
+    assert merge_news_articles(articles, news_list) is articles
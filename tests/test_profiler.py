@@ -0,0 +1,47 @@
+import threading
+from collections import Counter
+import pytest
+from profiler import sample_stacks, collapsed_stacks, top_functions, profile, memory_growth, ProfilerBusy, PROFILE_LOCK
+
+def test_sample_stacks():
+    stop = threading.Event()
+    worker = threading.Thread(target=stop.wait, name='sampled')
+    worker.start()
+    stacks = sample_stacks(0.05, 0.01)
+    stop.set()
+    worker.join()
+    sampled = [stack for stack in stacks if stack[0] == 'sampled']
+    assert len(sampled) > 0
+    assert 'threading.py:Event.wait' in sampled[0]
+    # the sampling thread isn't sampled
+    assert not any('profiler.py:sample_stacks' in stack for stack in stacks)
+
+def test_collapsed_stacks():
+    stacks = Counter({('main', 'a.py:f', 'a.py:g') : 3, ('main', 'a.py:f') : 1})
+    assert collapsed_stacks(stacks) == 'main;a.py:f;a.py:g 3\nmain;a.py:f 1\n'
+
+def test_top_functions():
+    stacks = Counter({('main', 'a.py:f', 'a.py:g') : 3, ('main', 'a.py:f') : 1})
+    lines = top_functions(stacks).splitlines()
+    assert lines[0] == '4 samples'
+    assert lines[2].split() == ['1', '25.0%', '4', '100.0%', 'a.py:f']
+    assert lines[3].split() == ['3', '75.0%', '3', '75.0%', 'a.py:g']
+
+def test_profile_busy():
+    with PROFILE_LOCK:
+        with pytest.raises(ProfilerBusy):
+            profile(0.01)
+        with pytest.raises(ProfilerBusy):
+            memory_growth(0.01)
+
+def test_memory_growth():
+    held = []
+    def grow():
+        for i in range(1000):
+            held.append('article '+str(i))
+    timer = threading.Timer(0.02, grow)
+    timer.start()
+    text = memory_growth(0.2)
+    timer.join()
+    assert text.startswith('traced')
+    assert 'test_profiler.py' in text
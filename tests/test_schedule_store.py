@@ -0,0 +1,26 @@
+from schedule_store import ScheduleStore
+
+def make_update(name:str, repeat:bool=False) -> dict:
+    return {'title' : name, 'content' : 'Updates covid stats at 10:00.', 'update_time' : '10:00', 'update_type' : 'c', 'repeat' : repeat}
+
+def test_save_load(tmp_path):
+    store = ScheduleStore(str(tmp_path / 'schedules.db'))
+    store.save(make_update('b', True), 200)
+    store.save(make_update('a'), 100)
+    assert store.load() == [(make_update('a'), 100), (make_update('b', True), 200)]
+    store.close()
+    # the updates are still saved when the database is opened again
+    assert ScheduleStore(str(tmp_path / 'schedules.db')).load() == [(make_update('a'), 100), (make_update('b', True), 200)]
+
+def test_save_replace(tmp_path):
+    store = ScheduleStore(str(tmp_path / 'schedules.db'))
+    store.save(make_update('a'), 100)
+    store.save(make_update('a', True), 300)
+    assert store.load() == [(make_update('a', True), 300)]
+
+def test_remove(tmp_path):
+    store = ScheduleStore(str(tmp_path / 'schedules.db'))
+    store.save(make_update('a'), 100)
+    store.remove('a')
+    store.remove('a')
+    assert store.load() == []
@@ -1,7 +1,27 @@
+import threading
+import time
+import pytest
+import scheduler
+from schedule_store import ScheduleStore
 from scheduler import update_news
 from scheduler import time_difference
 from scheduler import update_covid
 from scheduler import repeat_update
+from scheduler import schedule_news_updates
+from scheduler import stop_thread
+from scheduler import remove_sched
+from scheduler import SCHEDULER
+from scheduler import append_updates_list
+from scheduler import name_in_use
+from scheduler import remove_update
+import global_vars
+
+@pytest.fixture(autouse=True)
+def schedule_store(tmp_path, monkeypatch):
+    # the updates scheduled by the tests are saved in a temporary store, not the application's schedules.db
+    store = ScheduleStore(str(tmp_path / 'schedules.db'))
+    monkeypatch.setattr(scheduler, 'SCHEDULE_STORE', store)
+    return store
 
 def test_update_covid():
     update_covid()
@@ -12,3 +32,79 @@ def test_update_news():
 def test_time_difference():
     data = time_difference(14, 00, 00, 15, 00)
     assert data == 3600
+
+def test_stop_thread():
+    active_sched = schedule_news_updates(60, 'test_stop_thread', False, 'n', '00:00')[0]
+    stop_thread('test_stop_thread')
+    remove_sched('test_stop_thread')
+    assert active_sched['cancel_token'].is_set()
+    assert active_sched['sched'] not in SCHEDULER.queue
+
+def test_append_updates_list(schedule_store):
+    append_updates_list('cn', False, 'test_append', '00:00', 60)
+    assert name_in_use('test_append')
+    assert [saved['title'] for saved, next_run in schedule_store.load()] == ['test_append']
+    assert len(global_vars.retrieve_updates().scheds('test_append')) == 2
+    remove_update('test_append', global_vars.retrieve_updates())
+    assert not name_in_use('test_append')
+    assert global_vars.retrieve_updates().scheds('test_append') == []
+
+def test_remove_update_list():
+    updates = [{'title' : 'a', 'update_type' : 'c'}, {'title' : 'b', 'update_type' : 'n'}]
+    # a list of updates gets a list back, the global updates aren't changed
+    assert remove_update('a', updates) == [{'title' : 'b', 'update_type' : 'n'}]
+    assert type(remove_update('c', updates)) is list
+
+def test_finish_after_update(schedule_store, monkeypatch):
+    fetching = threading.Event()
+    fetched = threading.Event()
+    def slow_covid_data_collector():
+        fetching.set()
+        fetched.wait(5)
+        return ['Exeter', 'England', 10, 20, 'Hospital Cases: 30', 'Total Deaths: 40']
+    monkeypatch.setattr(scheduler, 'shared_covid_data_collector', slow_covid_data_collector)
+
+    append_updates_list('c', False, 'test_finish', '00:00', 0)
+    assert fetching.wait(5)
+    # the update isn't finished (and removed) while its data is being fetched, so it can still be cancelled
+    time.sleep(0.1)
+    assert name_in_use('test_finish')
+    assert len(global_vars.retrieve_updates().scheds('test_finish')) == 1
+    fetched.set()
+    for i in range(50):
+        if not name_in_use('test_finish'):
+            break
+        time.sleep(0.1)
+    assert not name_in_use('test_finish')
+    assert schedule_store.load() == []
+
+def test_restore_updates(schedule_store, monkeypatch):
+    store = schedule_store
+    caught_up = []
+    monkeypatch.setattr(scheduler, 'catch_up_update', caught_up.append)
+    global_vars.set_updates()
+
+    update = {'content' : '', 'update_time' : '10:00', 'update_type' : 'c'}
+    store.save(dict(update, title='future', repeat=False), time.time() + 3600)
+    store.save(dict(update, title='missed', repeat=False, update_type='n'), time.time() - 3600)
+    store.save(dict(update, title='missed_repeat', repeat=True), time.time() - 3600 * 50)
+    scheduler.restore_updates()
+
+    assert name_in_use('future')
+    assert not name_in_use('missed')
+    assert name_in_use('missed_repeat')
+    assert [saved['title'] for saved, next_run in store.load()] == ['future', 'missed_repeat']
+    # the missed runs are caught up with one update
+    assert len(caught_up) == 1
+    assert sorted(caught_up[0]) == ['c', 'n']
+
+    for update_name in ('future', 'missed_repeat'):
+        remove_update(update_name, global_vars.retrieve_updates())
+
+def test_schedule_store_is_lazy(tmp_path, monkeypatch):
+    monkeypatch.setattr(scheduler, 'SCHEDULE_STORE', None)
+    monkeypatch.setitem(scheduler.config, 'schedule_store', str(tmp_path / 'lazy.db'))
+    assert not (tmp_path / 'lazy.db').exists()
+    store = scheduler.schedule_store()
+    assert store.filename == str(tmp_path / 'lazy.db')
+    assert scheduler.schedule_store() is store
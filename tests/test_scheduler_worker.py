@@ -0,0 +1,48 @@
+import threading
+import time
+from scheduler_worker import SchedulerWorker
+
+def test_enter_order():
+    worker = SchedulerWorker(1)
+    ran = []
+    done = threading.Event()
+    run_time = time.time() + 0.1
+    worker.enterabs(run_time, 2, ran.append, ('second',))
+    worker.enterabs(run_time, 1, ran.append, ('first',))
+    worker.enterabs(run_time + 0.1, 1, done.set)
+    assert done.wait(5)
+    assert ran == ['first', 'second']
+    worker.shutdown()
+
+def test_insert_earlier_event():
+    worker = SchedulerWorker(1)
+    done = threading.Event()
+    worker.enter(60, 1, done.set)
+    # the worker is waiting for the first event, the new one should still run straight away
+    start = time.time()
+    worker.enter(0, 1, done.set)
+    assert done.wait(5)
+    assert time.time() - start < 5
+    worker.shutdown()
+
+def test_cancel():
+    worker = SchedulerWorker(1)
+    ran = []
+    done = threading.Event()
+    event = worker.enter(0.1, 1, ran.append, ('cancelled',))
+    worker.enter(0.2, 1, done.set)
+    worker.cancel(event)
+    assert len(worker.queue) == 1
+    assert done.wait(5)
+    assert ran == []
+    assert worker.empty()
+    worker.shutdown()
+
+def test_thread_count():
+    worker = SchedulerWorker(2)
+    worker.enter(60, 1, print)
+    threads = threading.active_count()
+    for i in range(50):
+        worker.enter(60, 1, print)
+    assert threading.active_count() == threads
+    worker.shutdown()
@@ -0,0 +1,72 @@
+import pytest
+from shared_map import CHUNK
+from shared_map import SharedMap
+from shared_map import SharedOrderedMap
+
+def test_shared_map():
+    shared = SharedMap({'a' : 1, 'b' : 2})
+    assert shared['a'] == 1
+    assert shared.get('c') is None
+    assert 'b' in shared
+    assert len(shared) == 2
+    shared['a'] = 3
+    assert shared.pop('a') == 3
+    assert shared.pop('a', 4) == 4
+    assert dict(shared.items()) == {'b' : 2}
+    assert len(shared) == 1
+
+def test_shared_map_copy():
+    shared = SharedMap({number : number for number in range(1000)})
+    copy = shared.copy()
+    copy[0] = 'changed'
+    copy.pop(1)
+    copy[1000] = 1000
+    # neither map changes the shards they share
+    shared[2] = 'changed'
+    assert shared[0] == 0 and shared[1] == 1 and 1000 not in shared
+    assert copy[2] == 2
+    assert len(shared) == 1000
+    assert len(copy) == 1000
+
+def test_shared_ordered_map():
+    shared = SharedOrderedMap()
+    for number in range(CHUNK * 3):
+        shared[number] = str(number)
+    shared[0] = 'changed'
+    assert list(shared.keys())[0:2] == [0, 1]
+    assert shared.get(0) == 'changed'
+    assert shared.pop(0) == 'changed'
+    assert shared.pop(0) is None
+    assert shared.first() == 1
+    assert list(shared)[-1] == CHUNK * 3 - 1
+    assert len(shared) == CHUNK * 3 - 1
+
+def test_shared_ordered_map_first():
+    shared = SharedOrderedMap()
+    with pytest.raises(KeyError):
+        shared.first()
+    for number in range(CHUNK * 2 + 1):
+        shared[number] = None
+    for number in range(CHUNK * 2):
+        assert shared.pop(shared.first(), 'missing') is None
+    assert shared.first() == CHUNK * 2
+    # the empty chunks are dropped
+    assert len(shared._chunks) == 1
+    shared[CHUNK * 2] = 1
+    shared['last'] = 2
+    assert list(shared.items()) == [(CHUNK * 2, 1), ('last', 2)]
+
+def test_shared_ordered_map_copy():
+    shared = SharedOrderedMap()
+    for number in range(1000):
+        shared[number] = number
+    copy = shared.copy()
+    copy[0] = 'changed'
+    copy.pop(1)
+    copy[1000] = 1000
+    shared[2] = 'changed'
+    assert list(shared.values())[0:3] == [0, 1, 'changed']
+    assert list(copy.values())[0:2] == ['changed', 2]
+    assert list(copy)[-1] == 1000
+    assert len(shared) == 1000
+    assert len(copy) == 1000
@@ -0,0 +1,53 @@
+import threading
+import pytest
+from single_flight import SingleFlight
+
+def test_do():
+    flight = SingleFlight()
+    assert flight.do('key', pow, 2, 3) == 8
+    assert flight.do('key', pow, 2, 4) == 16
+    assert flight.stats()['issued'] == 2
+    assert flight.stats()['coalesced'] == 0
+    assert flight.in_flight() == 0
+
+def test_do_coalesced():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow_request():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 'data'
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do('key', slow_request)))
+    leader.start()
+    assert started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(flight.do('key', slow_request))) for i in range(3)]
+    for follower in followers:
+        follower.start()
+    # waits for the followers to attach to the call in flight
+    while flight.stats()['coalesced'] < 3:
+        pass
+    release.set()
+    for thread in [leader] + followers:
+        thread.join()
+
+    assert results == ['data'] * 4
+    assert len(calls) == 1
+    assert flight.stats()['issued'] == 1
+    assert flight.stats()['coalesced'] == 3
+
+def test_do_error():
+    flight = SingleFlight()
+
+    def failing_request():
+        raise ConnectionError('failed')
+
+    with pytest.raises(ConnectionError):
+        flight.do('key', failing_request)
+    assert flight.in_flight() == 0
+    assert flight.do('key', pow, 2, 3) == 8
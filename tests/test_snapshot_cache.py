@@ -0,0 +1,55 @@
+import time
+from snapshot_cache import SnapshotCache
+
+def counting_loader():
+    counting_loader.calls = counting_loader.calls + 1
+    return counting_loader.calls
+counting_loader.calls = 0
+
+def test_get():
+    counting_loader.calls = 0
+    cache = SnapshotCache(counting_loader, 60)
+    assert cache.get() == 1
+    assert cache.get() == 1
+    assert cache.stats()['misses'] == 1
+    assert cache.stats()['hits'] == 1
+
+def test_get_stale():
+    counting_loader.calls = 0
+    cache = SnapshotCache(counting_loader, 0)
+    assert cache.get() == 1
+    # the stale snapshot is returned while it is refreshed in the background
+    assert cache.get() == 1
+    for i in range(100):
+        if cache.stats()['refreshes'] == 1:
+            break
+        time.sleep(0.01)
+    assert cache.stats()['stale_hits'] == 1
+    assert cache.get() == 2
+
+def test_put():
+    cache = SnapshotCache(counting_loader, 60)
+    cache.put('data')
+    assert cache.get() == 'data'
+    assert cache.stats()['misses'] == 0
+
+def test_failed_refresh():
+    def failing_loader():
+        raise ConnectionError()
+    cache = SnapshotCache(failing_loader, 0)
+    cache.put('last good')
+    assert cache.get() == 'last good'
+    for i in range(100):
+        if cache.stats()['errors'] == 1:
+            break
+        time.sleep(0.01)
+    assert cache.get() == 'last good'
+
+def test_version():
+    cache = SnapshotCache(lambda: 1, 60)
+    assert cache.version == 0
+    cache.get()
+    cache.get()
+    assert cache.version == 1
+    cache.put(2)
+    assert cache.version == 2
@@ -0,0 +1,42 @@
+import threading
+from state_store import StateStore
+
+def test_publish():
+    store = StateStore({'a' : [], 'b' : []})
+    snapshot = store.snapshot()
+    new_snapshot = store.publish('a', [1])
+    assert store.get('a') == [1]
+    assert new_snapshot.version == snapshot.version + 1
+    assert new_snapshot.versions['a'] == 1
+    assert new_snapshot.versions['b'] == 0
+    # the old snapshot is unchanged
+    assert snapshot.values['a'] == []
+
+def test_update_copy_on_write():
+    store = StateStore({'a' : [1]})
+    published = store.get('a')
+    assert store.update('a', lambda value: value.append(2)) is None
+    assert store.get('a') == [1, 2]
+    assert published == [1]
+
+def test_update_concurrent():
+    store = StateStore({'a' : []})
+
+    def append_numbers():
+        for number in range(200):
+            store.update('a', lambda value: value.append(number))
+
+    threads = [threading.Thread(target=append_numbers) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(store.get('a')) == 800
+    assert store.snapshot().versions['a'] == 800
+
+def test_wait_for_change():
+    store = StateStore({'a' : []})
+    versions = dict(store.snapshot().versions)
+    assert store.wait_for_change(versions, 0.01).versions == versions
+    threading.Timer(0.05, store.publish, ('a', [1])).start()
+    assert store.wait_for_change(versions, 5).versions['a'] == 1
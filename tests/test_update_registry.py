@@ -0,0 +1,47 @@
+from update_registry import UpdateRegistry
+
+def make_update(name:str) -> dict:
+    return {'title' : name, 'content' : '', 'update_time' : '00:00', 'update_type' : 'c', 'repeat' : False}
+
+def test_append():
+    registry = UpdateRegistry([make_update('a'), make_update('b')])
+    assert 'a' in registry
+    assert 'c' not in registry
+    assert registry.get('b') == make_update('b')
+    assert registry == [make_update('a'), make_update('b')]
+    assert len(registry) == 2
+
+def test_remove():
+    registry = UpdateRegistry([make_update('a'), make_update('b')])
+    registry.add_sched('a', {'sched_type' : 'covid'})
+    assert registry.remove('a') == make_update('a')
+    assert registry.remove('a') is None
+    assert registry.scheds('a') == []
+    assert registry == [make_update('b')]
+
+def test_remove_sched():
+    registry = UpdateRegistry([make_update('a')])
+    covid_sched = {'sched_type' : 'covid'}
+    news_sched = {'sched_type' : 'news'}
+    registry.add_sched('a', covid_sched)
+    registry.add_sched('a', news_sched)
+    assert registry.remove_sched('a', covid_sched) == 1
+    # a sched which has already been replaced isn't removed
+    assert registry.remove_sched('a', {'sched_type' : 'news'}) == 1
+    assert registry.scheds('a') == [news_sched]
+    assert registry.remove_sched('a') == 0
+
+def test_iterate_while_changing():
+    registry = UpdateRegistry([make_update(str(number)) for number in range(10)])
+    for update in registry:
+        registry.remove(update['title'])
+    assert len(registry) == 0
+
+def test_copy():
+    registry = UpdateRegistry([make_update('a')])
+    registry.add_sched('a', {'sched_type' : 'covid'})
+    copy = registry.copy()
+    copy.append(make_update('b'))
+    copy.remove_sched('a')
+    assert registry == [make_update('a')]
+    assert len(registry.scheds('a')) == 1
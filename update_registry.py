@@ -0,0 +1,196 @@
+"""Module containing the registry used for the global scheduled updates"""
+from shared_map import SharedMap, SharedOrderedMap
+
+
+class UpdateRegistry:
+    """
+    The scheduled updates keyed by their name (the 'title' key of the update dictionaries), along with the sched
+    events of each update keyed by the type of data they update ('covid' or 'news').
+
+    Looking up, adding and removing an update or its events doesn't scan the other updates. It can be iterated,
+    indexed and compared with a list of update dictionaries like the list it replaces.
+
+    The global registry is published in global_vars and never changed, changes are made to a copy (see global_vars.change_updates).
+    A copy shares everything which hasn't changed with the registry it was copied from (see shared_map).
+    """
+    def __init__(self, entries:list=None):
+        # update dictionaries keyed by name, in the order they were added
+        self._updates = SharedOrderedMap()
+        # active scheds keyed by name, then by sched type. The inner dictionaries may be shared with a copy,
+        # so they are replaced instead of changed
+        self._scheds = SharedMap()
+        if entries is not None:
+            for entry in entries:
+                self.append(entry)
+
+    def append(self, update:dict) -> None:
+        """
+        Description:
+
+            Function which adds an update dictionary to the registry, replacing any update with the same name
+
+        Arguments:
+
+            update {dict} : dictionary containing the 'title', 'content', 'update_time', 'update_type' and 'repeat' keys
+
+        Returns:
+
+            None
+        """
+        # entries which aren't update dictionaries can't be found by name, so they are given a key of their own
+        key = update.get('title') if isinstance(update, dict) else object()
+        self._updates.pop(key, None)
+        self._updates[key] = update
+
+    def get(self, update_name:str) -> dict:
+        """
+        Description:
+
+            Function which gets an update dictionary by its name
+
+        Arguments:
+
+            update_name {str} : string containing the name of the update
+
+        Returns:
+
+            {dict} : the update dictionary, None if there is no update with the name
+        """
+        return self._updates.get(update_name)
+
+    def remove(self, update_name:str) -> dict:
+        """
+        Description:
+
+            Function which removes an update and its active scheds from the registry
+
+        Arguments:
+
+            update_name {str} : string containing the name of the update
+
+        Returns:
+
+            {dict} : the update dictionary which was removed, None if there is no update with the name
+        """
+        self._scheds.pop(update_name, None)
+        return self._updates.pop(update_name, None)
+
+    def add_sched(self, update_name:str, active_sched:dict) -> None:
+        """
+        Description:
+
+            Function which stores the sched events of an update, replacing the events of the same type
+
+        Arguments:
+
+            update_name {str} : string containing the name of the update
+
+            active_sched {dict} : dictionary containing the 'sched_type', the sched events and the 'cancel_token' of the update
+
+        Returns:
+
+            None
+        """
+        scheds = dict(self._scheds.get(update_name, {}))
+        scheds[active_sched['sched_type']] = active_sched
+        self._scheds[update_name] = scheds
+
+    def remove_sched(self, update_name:str, active_sched:dict=None) -> int:
+        """
+        Description:
+
+            Function which forgets the sched events of an update once they have run or been cancelled
+
+        Arguments:
+
+            update_name {str} : string containing the name of the update
+
+            active_sched {dict} : the active sched to remove. All of the update's active scheds are removed if it is None
+
+        Returns:
+
+            {int} : the number of active scheds the update still has
+        """
+        scheds = dict(self._scheds.get(update_name, {}))
+        if active_sched is None:
+            scheds.clear()
+        elif scheds.get(active_sched['sched_type']) is active_sched:
+            del scheds[active_sched['sched_type']]
+
+        if len(scheds) > 0:
+            self._scheds[update_name] = scheds
+        elif update_name in self._scheds:
+            self._scheds.pop(update_name)
+        return len(scheds)
+
+    def scheds(self, update_name:str) -> list:
+        """
+        Description:
+
+            Function which gets the active scheds of an update
+
+        Arguments:
+
+            update_name {str} : string containing the name of the update
+
+        Returns:
+
+            {list} : list of the active sched dictionaries of the update
+        """
+        return list(self._scheds.get(update_name, {}).values())
+
+    def copy(self) -> 'UpdateRegistry':
+        """
+        Description:
+
+            Function which makes a copy of the registry which can be changed without changing this registry.
+            The copy shares the updates and scheds with this registry, and only copies the parts it changes
+
+        Arguments:
+
+            None
+
+        Returns:
+
+            {UpdateRegistry} : the copy
+        """
+        registry = UpdateRegistry()
+        registry._updates = self._updates.copy()
+        registry._scheds = self._scheds.copy()
+        return registry
+
+    def listing(self) -> list:
+        """
+        Description:
+
+            Function which gets the update dictionaries in the order they were added, used for the updates on the HTML page
+
+        Arguments:
+
+            None
+
+        Returns:
+
+            {list} : list of the update dictionaries
+        """
+        return list(self._updates.values())
+
+    def __contains__(self, update_name):
+        return update_name in self._updates
+
+    def __iter__(self):
+        return iter(self.listing())
+
+    def __len__(self):
+        return len(self._updates)
+
+    def __getitem__(self, index):
+        return self.listing()[index]
+
+    def __eq__(self, other):
+        if isinstance(other, UpdateRegistry):
+            return self.listing() == other.listing()
+        return self.listing() == other
+
+    def __repr__(self):
+        return 'UpdateRegistry('+repr(self.listing())+')'